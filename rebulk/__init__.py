@@ -3,10 +3,14 @@
 Define simple search patterns in bulk to perform advanced matching on any string.
 """
 
+from .calibration import calibrate_regex_backends
+from .columns import MatchColumns
+from .context import ContextCondition
+from .encoded import EncodedInput
 from .key import Key
 from .processors import POST_PROCESS, PRE_PROCESS, ConflictSolver, PrivateRemover
 from .rebulk import Rebulk
-from .remodule import REGEX_ENABLED
+from .remodule import REGEX_ENABLED, RegexProfile, clear_regex_cache, regex_cache_info
 from .rules import AppendMatch, AppendTags, CustomRule, RemoveMatch, RemoveTags, RenameMatch, Rule
 
 __all__ = [
@@ -16,12 +20,19 @@ __all__ = [
     "AppendMatch",
     "AppendTags",
     "ConflictSolver",
+    "ContextCondition",
     "CustomRule",
+    "EncodedInput",
     "Key",
+    "MatchColumns",
     "PrivateRemover",
     "Rebulk",
+    "RegexProfile",
     "RemoveMatch",
     "RemoveTags",
     "RenameMatch",
     "Rule",
+    "calibrate_regex_backends",
+    "clear_regex_cache",
+    "regex_cache_info",
 ]
@@ -302,6 +302,7 @@ class ChainBuilder(PatternFactory):
     def _add(self, pattern: Any) -> ChainPart:
         part = ChainPart(self, pattern)
         self._chain.parts.append(part)
+        self._chain._invalidate_fused()
         return part
 
     def regex(self, *pattern: Any, key: Key[Any] | Sequence[Key[Any]] | None = None, **kwargs: Any) -> ChainPart:
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Calibration of regular expression backends, to choose the fastest one for each pattern.
+"""
+
+from __future__ import annotations
+
+import logging
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from .chain import Chain
+from .pattern import RePattern
+from .rebulk import Rebulk
+from .remodule import BACKENDS, PORTABLE_FLAGS, RegexProfile, load_backend
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+    from .pattern import Pattern
+
+log = logging.getLogger(__name__).log
+
+
+def _regex_patterns(patterns: Iterable[Pattern | Rebulk]) -> Iterator[Any]:
+    """
+    Compiled regular expressions of given patterns, including regex patterns of chains and rebulk objects.
+
+    :param patterns:
+    :return:
+    """
+    for pattern in patterns:
+        if isinstance(pattern, Rebulk):
+            yield from _regex_patterns(pattern.effective_patterns())
+        elif isinstance(pattern, Chain):
+            yield from _regex_patterns(part.pattern for part in pattern.parts)
+        elif isinstance(pattern, RePattern):
+            yield from pattern.patterns
+
+
+def _time_pattern(compiled: Any, corpus: Sequence[str], repeat: int) -> float:
+    """
+    Best time of searching all matches of a compiled pattern in the corpus.
+
+    :param compiled:
+    :param corpus:
+    :param repeat:
+    :return:
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        for input_string in corpus:
+            for _match in compiled.finditer(input_string):
+                pass
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def calibrate_regex_backends(
+    patterns: Iterable[Pattern | Rebulk],
+    corpus: Iterable[str],
+    backends: Sequence[str] = BACKENDS,
+    repeat: int = 3,
+    profile: RegexProfile | None = None,
+) -> RegexProfile:
+    """
+    Time each regular expression of given patterns on a sample corpus with each backend, and record the fastest
+    backend of each pattern source in a profile.
+
+    The profile can be saved and given as ``backend`` option of regex patterns, so that each pattern is compiled with
+    its fastest backend. Backends that are not available, or that can't compile a pattern, are ignored.
+
+    :param patterns: patterns, chains or rebulk objects to calibrate.
+    :param corpus: sample input strings.
+    :param backends: names of backends to compare.
+    :param repeat: number of timings of each pattern, the best one is kept.
+    :param profile: existing profile to start from. It's not changed, as profiles are immutable.
+    :return: a new profile, with the backends of profile and the ones recorded for given patterns.
+    """
+    recorded: dict[str, str] = dict(profile.backends) if profile else {}
+    corpus = list(corpus)
+
+    modules: dict[str, Any] = {}
+    for backend in backends:
+        module = load_backend(backend)
+        if module is None:
+            log(logging.WARNING, "%s module is not available, it's ignored by calibration.", backend)
+        else:
+            modules[backend] = module
+
+    calibrated: set[str] = set()
+    for compiled in _regex_patterns(patterns):
+        source, flags = compiled.pattern, compiled.flags & PORTABLE_FLAGS
+        if not isinstance(source, str) or source in calibrated:
+            continue
+        calibrated.add(source)
+
+        timings: dict[str, float] = {}
+        for backend, module in modules.items():
+            try:
+                timings[backend] = _time_pattern(module.compile(source, flags), corpus, repeat)
+            except module.error:
+                log(logging.DEBUG, "%s can't be compiled with %s module.", source, backend)
+        if timings:
+            recorded[source] = min(timings, key=timings.__getitem__)
+    return RegexProfile(recorded, default=profile.default if profile else None)
@@ -5,13 +5,15 @@ Chain patterns and handle repetiting capture group
 
 from __future__ import annotations
 
+import functools
 import itertools
 from typing import TYPE_CHECKING, Any, Literal, cast, overload
 
+from .encoded import encoded_input, input_encoding
 from .loose import call
 from .match import Match, Matches
-from .pattern import BasePattern, Pattern, filter_match_kwargs
-from .remodule import re
+from .pattern import BasePattern, Pattern, RePattern, filter_match_kwargs
+from .remodule import backend_of, re
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterable, Iterator
@@ -19,6 +21,89 @@ if TYPE_CHECKING:
     from .builder import ChainBuilder
 
 
+_FUSED_REPEATER_MAX = 8
+
+# Constructs that can't be moved into a larger regex: group references, global or verbose flags, and zero width
+# assertions that may let a part match an empty string.
+_UNFUSIBLE_REGEX = re.compile(r"\(\?P[=>]|\(\?[&(R|]|\\[1-9gZz]|\(\?[aiLmsux]+\)|\(\?[=!]|\$")
+_NAMED_GROUP_REGEX = re.compile(r"(?<!\\)\(\?P?<(?![=!])[^>]*>")
+
+
+@functools.lru_cache(maxsize=64)
+def _fuse_regexes(parts: tuple[tuple[Any, int, int], ...]) -> tuple[Any, tuple[tuple[int, ...], ...]] | None:
+    """
+    Compile a regex matching the given (regex, repeater start, repeater end) chain parts at once.
+
+    Each repetition of a part is an atomic group matching like the part regex alone, and the repetitions of a part
+    are atomic too, so that the fused regex never backtracks into a previous part, like part by part matching.
+    :param parts:
+    :return: the fused regex with the group of each repetition of each part, or None if parts can't be fused.
+    """
+    flags = parts[0][0].flags
+    backend = backend_of(parts[0][0])
+    sources: list[str] = []
+    groups: list[tuple[int, ...]] = []
+    group = 1
+    for pattern, repeater_start, repeater_end in parts:
+        source = pattern.pattern
+        if (
+            pattern.flags != flags
+            or backend_of(pattern) is not backend
+            or flags & re.VERBOSE
+            or not isinstance(source, str)
+            or _UNFUSIBLE_REGEX.search(source)
+            or pattern.fullmatch("")
+        ):
+            return None
+        repetition = f"(?>({_NAMED_GROUP_REGEX.sub('(', source)}))"
+        optional_repetitions = ""
+        for _ in range(repeater_end - repeater_start):
+            optional_repetitions = f"(?:{repetition}{optional_repetitions})?"
+        sources.append(f"(?>{repetition * repeater_start}{optional_repetitions})")
+        groups.append(tuple(range(group, group + repeater_end * (pattern.groups + 1), pattern.groups + 1)))
+        group += repeater_end * (pattern.groups + 1)
+    try:
+        fused = backend.compile("".join(sources), flags)
+    except backend.error:
+        return None
+    if fused.groups != group - 1:
+        return None
+    return fused, tuple(groups)
+
+
+class _FusedPartMatch:
+    """
+    Match object of a chain part repetition, viewed from a fused chain regex match with groups numbered like in the
+    part regex.
+    """
+
+    __slots__ = ("_group", "_match_object")
+
+    def __init__(self, match_object: Any, group: int) -> None:
+        self._match_object = match_object
+        self._group = group
+
+    def start(self, group: int = 0) -> Any:
+        return self._match_object.start(self._group + group)
+
+    def end(self, group: int = 0) -> Any:
+        return self._match_object.end(self._group + group)
+
+    def span(self, group: int = 0) -> Any:
+        return self._match_object.span(self._group + group)
+
+    def spans(self, group: int = 0) -> Any:
+        return self._match_object.spans(self._group + group)
+
+
+class _ChainMatches(list[Match]):
+    """
+    Matches of the chain being matched, with the running state of its incremental chain breaker.
+    """
+
+    breaker_state: Any = None
+
+
 class _InvalidChainException(Exception):
     """
     Internal exception raised when a chain is not valid
@@ -37,8 +122,19 @@ class Chain(Pattern):
     def __init__(
         self,
         chain_breaker: Callable[[Matches], bool] | None = None,
+        incremental_chain_breaker: Callable[[Matches, Any], tuple[bool, Any]] | None = None,
         **kwargs: Any,
     ) -> None:
+        """
+        :param chain_breaker: function(matches) called with all matches of the chain when a group of matches is about
+        to be appended, including this group. If it returns True, the group is not appended to the chain.
+        :type chain_breaker: func
+        :param incremental_chain_breaker: function(group, state) called with the group of matches about to be
+        appended to the chain, and the state it returned for the previous group appended to this chain (None for
+        the first one). It returns a (break, state) tuple. If break is True, the group is not appended and state is
+        dropped. Unlike chain_breaker, it doesn't need to look at the whole chain again for each group.
+        :type incremental_chain_breaker: func
+        """
         call(Pattern.__init__, self, **kwargs)
         self._kwargs = kwargs
         self._match_kwargs = filter_match_kwargs(kwargs)
@@ -47,64 +143,178 @@ class Chain(Pattern):
             self.chain_breaker = chain_breaker
         else:
             self.chain_breaker = None
+        self.incremental_chain_breaker: Callable[[Matches, Any], tuple[bool, Any]] | None
+        if callable(incremental_chain_breaker):
+            self.incremental_chain_breaker = incremental_chain_breaker
+        else:
+            self.incremental_chain_breaker = None
         self.parts: list[ChainPart] = []
+        self._fused: tuple[Any, tuple[tuple[int, ...], ...]] | None = None
+        self._fused_stale = True
+
+    @property
+    def _anchorable(self) -> bool:
+        return False
 
     def _match(
         self,
         pattern: Any,
         input_string: str,
         context: dict[str, Any] | None = None,
+        pos: int = 0,
+        anchored: bool | None = None,
     ) -> Iterator[Match]:
         chain_matches: list[Match] = []
-        chain_input_string = input_string
-        offset = 0
+        encoding = input_encoding(input_string)
+        # Bytes-like input is matched part by part, with the encoded regular expressions of each part.
+        fused = self._fused_regex() if encoding is None else None
+        offset = pos
+        fused_match = None
         while offset < len(input_string):
-            chain_found = False
-            current_chain_matches: list[Match] = []
-            valid_chain = True
-            for chain_part in self.parts:
-                try:
-                    chain_part_matches, raw_chain_part_matches = chain_part.matches(
-                        chain_input_string, context, with_raw_matches=True
-                    )
-
-                    chain_found, chain_input_string, offset = self._to_next_chain_part(
-                        chain_part,
-                        chain_part_matches,
-                        raw_chain_part_matches,
-                        chain_found,
-                        input_string,
-                        chain_input_string,
-                        offset,
-                        current_chain_matches,
-                    )
-                except _InvalidChainException:
-                    valid_chain = False
-                    if current_chain_matches:
-                        offset = current_chain_matches[0].raw_end
-                    break
+            next_chain = None
+            if fused:
+                # A fused match found further than offset is still the next one, so it's searched again only once
+                # offset has passed its start.
+                if fused_match is None or fused_match.start() < offset:
+                    fused_match = fused[0].search(input_string, offset)
+                    if not fused_match:
+                        break
+                next_chain = self._fused_next_chain(fused_match, fused[1], input_string, offset)
+            if next_chain is None:
+                next_chain = self._next_chain(input_string, offset, context)
+            chain_found, offset, current_chain_matches = next_chain
             if not chain_found:
                 break
-            if current_chain_matches and valid_chain:
+            if current_chain_matches:
                 match = self._build_chain_match(current_chain_matches, input_string)
                 chain_matches.append(match)
 
         return chain_matches  # type: ignore[return-value]
 
+    def _next_chain(
+        self, input_string: str, offset: int, context: dict[str, Any] | None = None
+    ) -> tuple[bool, int, list[Match]]:
+        """
+        Match each chain part in turn, looking for the next chain from offset.
+        :param input_string:
+        :param offset:
+        :param context:
+        :return: if some chain part was found, the offset to look for the next chain, and the matches of this chain
+        (empty when the chain is invalid).
+        """
+        chain_found = False
+        current_chain_matches = _ChainMatches()
+        for chain_part in self.parts:
+            try:
+                chain_part_matches, raw_chain_part_matches = chain_part._matches_from(input_string, offset, context)
+
+                chain_found, offset = self._to_next_chain_part(
+                    chain_part,
+                    chain_part_matches,
+                    raw_chain_part_matches,
+                    chain_found,
+                    offset,
+                    current_chain_matches,
+                )
+            except _InvalidChainException:
+                if current_chain_matches:
+                    offset = current_chain_matches[0].raw_end
+                return chain_found, offset, []
+        return chain_found, offset, current_chain_matches
+
+    def _invalidate_fused(self) -> None:
+        """
+        Drop the fused regex of this chain, so it's built again from its parts on next match.
+
+        It's called by the builder each time a part is appended or its repeater is changed.
+        """
+        self._fused_stale = True
+
+    def _fused_regex(self) -> tuple[Any, tuple[tuple[int, ...], ...]] | None:
+        """
+        Fused regex matching all parts of this chain at once, with the group of each repetition of each part.
+
+        It's built once from the parts, and built again only after :meth:`_invalidate_fused`.
+        :return:
+        :rtype:
+        """
+        if self._fused_stale:
+            self._fused = self._fuse_parts()
+            self._fused_stale = False
+        return self._fused
+
+    def _fuse_parts(self) -> tuple[Any, tuple[tuple[int, ...], ...]] | None:
+        """
+        Build the fused regex of this chain parts.
+
+        It's available when all parts are position safe and anchorable regex patterns with bounded repeaters, and
+        the chain start is mandatory.
+        :return:
+        :rtype:
+        """
+        if len(self.parts) < 2 or self.parts[0].repeater_start < 1:
+            return None
+        signature: list[tuple[Any, int, int]] = []
+        for part in self.parts:
+            pattern = part.pattern
+            if (
+                not isinstance(pattern, RePattern)
+                or not pattern._anchorable
+                or not pattern._position_safe
+                or part.repeater_end is None
+                or not max(part.repeater_start, 1) <= part.repeater_end <= _FUSED_REPEATER_MAX
+            ):
+                return None
+            signature.append((pattern.patterns[0], part.repeater_start, part.repeater_end))
+        return _fuse_regexes(tuple(signature))
+
+    def _fused_next_chain(
+        self,
+        fused_match: Any,
+        groups: tuple[tuple[int, ...], ...],
+        input_string: str,
+        offset: int,
+    ) -> tuple[bool, int, list[Match]] | None:
+        """
+        Build the next chain from a fused regex match.
+
+        Part by part matching only looks for a chain where the chain start is first found, so None is returned
+        when the fused match starts elsewhere, or when chain parts processing doesn't give the same matches.
+        :param fused_match:
+        :param groups:
+        :param input_string:
+        :param offset:
+        :return:
+        """
+        first_match = self.parts[0].pattern.patterns[0].search(input_string, offset)
+        if first_match.start() != fused_match.start():
+            return None
+        chain_found = False
+        current_chain_matches = _ChainMatches()
+        for chain_part, part_groups in zip(self.parts, groups, strict=True):
+            match_objects = [
+                _FusedPartMatch(fused_match, group) for group in part_groups if fused_match.start(group) > -1
+            ]
+            try:
+                fused_part_matches = chain_part._fused_matches_from(input_string, offset, match_objects)
+            except _InvalidChainException:
+                return None
+            if fused_part_matches is None:
+                return None
+            chain_found, offset = self._to_next_chain_part(
+                chain_part, *fused_part_matches, chain_found, offset, current_chain_matches
+            )
+        return chain_found, offset, current_chain_matches
+
     def _to_next_chain_part(
         self,
         chain_part: ChainPart,
         chain_part_matches: list[Match],
         raw_chain_part_matches: list[Match],
         chain_found: bool,
-        input_string: str,
-        chain_input_string: str,
         offset: int,
-        current_chain_matches: list[Match],
-    ) -> tuple[bool, str, int]:
-        Chain._fix_matches_offset(chain_part_matches, input_string, offset)
-        Chain._fix_matches_offset(raw_chain_part_matches, input_string, offset)
-
+        current_chain_matches: _ChainMatches,
+    ) -> tuple[bool, int]:
         if raw_chain_part_matches:
             grouped_matches_dict = self._group_by_match_index(chain_part_matches)
             grouped_raw_matches_dict = self._group_by_match_index(raw_chain_part_matches)
@@ -112,13 +322,12 @@ class Chain(Pattern):
             for match_index, grouped_raw_matches in grouped_raw_matches_dict.items():
                 chain_found = True
                 offset = grouped_raw_matches[-1].raw_end
-                chain_input_string = input_string[offset:]
 
                 if not chain_part.is_hidden:
                     grouped_matches = grouped_matches_dict.get(match_index, [])
-                    if self._chain_breaker_eval(current_chain_matches + grouped_matches):
+                    if self._chain_breaker_eval(current_chain_matches, grouped_matches):
                         current_chain_matches.extend(grouped_matches)
-        return chain_found, chain_input_string, offset
+        return chain_found, offset
 
     def _process_match(self, match: Match, match_index: int, child: bool = False) -> bool:
         """
@@ -137,27 +346,83 @@ class Chain(Pattern):
             return True
 
         if match.children:
-            last_pattern = match.children[-1].pattern
-            last_pattern_groups = self._group_by_match_index(
-                [child_ for child_ in match.children if child_.pattern == last_pattern]
-            )
+            group_starts = self._last_pattern_group_starts(match.children)
+            if group_starts is None:
+                return self._process_match_removing_last_pattern_matches(match, match_index, child=child)
+
+            children = match.children
+            original_end = match.end
+            removed_groups: list[list[Match]] = []
+
+            for group_start in reversed(group_starts):
+                removed_groups.append(list(children[group_start:]))
+                del children[group_start:]
+                match.end = children[-1].end if children else match.start
+                ret = super()._process_match(match, match_index, child=child)
+                if ret:
+                    return True
+
+            for removed_group in reversed(removed_groups):
+                children.extend(removed_group)
+            match.end = original_end
 
-            if last_pattern_groups:
-                original_children = Matches(match.children)
-                original_end = match.end
+        return False
 
-                for index in reversed(list(last_pattern_groups)):
-                    last_matches = last_pattern_groups[index]
-                    for last_match in last_matches:
-                        match.children.remove(last_match)
-                    match.end = match.children[-1].end if match.children else match.start
-                    ret = super()._process_match(match, match_index, child=child)
-                    if ret:
-                        return True
+    @staticmethod
+    def _last_pattern_group_starts(children: Matches) -> list[int] | None:
+        """
+        Index of the first child of each match_index group of the last child pattern, when these children are at the
+        end of children and sorted by match_index, which is how chain matches are assembled.
 
-                match.children = original_children
-                match.end = original_end
+        :param children:
+        :return: group start indices, or None if children are not ordered this way.
+        """
+        last_pattern = children[-1].pattern
+        start = len(children)
+        while start and children[start - 1].pattern == last_pattern:
+            start -= 1
+        if any(child.pattern == last_pattern for child in children[:start]):
+            return None
+
+        group_starts: list[int] = []
+        previous_match_index: int | None = None
+        for index in range(start, len(children)):
+            match_index = children[index].match_index
+            if previous_match_index is not None and match_index < previous_match_index:
+                return None
+            if match_index != previous_match_index:
+                group_starts.append(index)
+                previous_match_index = match_index
+        return group_starts
+
+    def _process_match_removing_last_pattern_matches(self, match: Match, match_index: int, child: bool = False) -> bool:
+        """
+        Process a match again without each match_index group of the last child pattern, from the last one, until it's
+        valid.
 
+        :param match:
+        :param match_index:
+        :param child:
+        :return:
+        """
+        last_pattern = match.children[-1].pattern
+        last_pattern_groups = self._group_by_match_index(
+            [child_ for child_ in match.children if child_.pattern == last_pattern]
+        )
+
+        original_children = Matches(match.children)
+        original_end = match.end
+
+        for index in reversed(list(last_pattern_groups)):
+            last_matches = last_pattern_groups[index]
+            for last_match in last_matches:
+                match.children.remove(last_match)
+            match.end = match.children[-1].end if match.children else match.start
+            if super()._process_match(match, match_index, child=child):
+                return True
+
+        match.children = original_children
+        match.end = original_end
         return False
 
     def _build_chain_match(self, current_chain_matches: list[Match], input_string: str) -> Match:
@@ -178,8 +443,23 @@ class Chain(Pattern):
                 chain_match.parent = match
         return match
 
-    def _chain_breaker_eval(self, matches: list[Match]) -> bool:
-        return not self.chain_breaker or not self.chain_breaker(Matches(matches))
+    def _chain_breaker_eval(self, current_chain_matches: _ChainMatches, grouped_matches: list[Match]) -> bool:
+        """
+        Check if a group of matches can be appended to the chain, and keep the new incremental chain breaker state if
+        it can.
+        :param current_chain_matches:
+        :param grouped_matches:
+        :return:
+        """
+        breaker_state = current_chain_matches.breaker_state
+        if self.incremental_chain_breaker:
+            broken, breaker_state = self.incremental_chain_breaker(Matches(grouped_matches), breaker_state)
+            if broken:
+                return False
+        if self.chain_breaker and self.chain_breaker(Matches(current_chain_matches + grouped_matches)):
+            return False
+        current_chain_matches.breaker_state = breaker_state
+        return True
 
     @staticmethod
     def _fix_matches_offset(chain_part_matches: Iterable[Match], input_string: str, offset: int) -> None:
@@ -267,31 +547,114 @@ class ChainPart(BasePattern):
         context: dict[str, Any] | None = None,
         with_raw_matches: bool = False,
     ) -> list[Match] | tuple[list[Match], list[Match]]:
-        matches, raw_matches = self.pattern.matches(input_string, context=context, with_raw_matches=True)
-
-        matches = self._truncate_repeater(matches, input_string)
-        raw_matches = self._truncate_repeater(raw_matches, input_string)
-
-        self._validate_repeater(raw_matches)
+        matches, raw_matches = self._matches_from(input_string, 0, context)
 
         if with_raw_matches:
             return matches, raw_matches
 
         return matches
 
-    def _truncate_repeater(self, matches: list[Match], input_string: str) -> list[Match]:
+    def _matches_from(
+        self, input_string: str, offset: int, context: dict[str, Any] | None = None
+    ) -> tuple[list[Match], list[Match]]:
+        """
+        Computes matches and raw matches of this chain part, starting at offset of input_string.
+
+        Position safe patterns search the whole input from offset. Others still get the input sliced at offset, so
+        that validators and processors see the same surroundings, and their matches are moved back to input_string.
+        :param input_string:
+        :param offset:
+        :param context:
+        :return:
+        """
+        if not offset or self.pattern._position_safe:
+            matches, raw_matches = self._pattern_matches_from(input_string, offset, context)
+        else:
+            sliced = input_string[offset:]
+            encoding = input_encoding(input_string)
+            if encoding is not None:
+                sliced = encoded_input(sliced, encoding)
+            matches, raw_matches = self._pattern_matches_from(sliced, 0, context)
+            Chain._fix_matches_offset(matches, input_string, offset)
+            Chain._fix_matches_offset(raw_matches, input_string, offset)
+
+        return self._repeated_matches(matches, raw_matches, offset)
+
+    def _fused_matches_from(
+        self, input_string: str, offset: int, match_objects: list[Any]
+    ) -> tuple[list[Match], list[Match]] | None:
+        """
+        Computes matches and raw matches of this chain part from the match objects of its repetitions in a fused
+        chain regex match.
+
+        None is returned when the chain start can't be built from these repetitions only.
+        :param input_string:
+        :param offset:
+        :param match_objects:
+        :return:
+        """
+        pattern: RePattern = self.pattern
+        matches, raw_matches = pattern._process_raw_matches(
+            [pattern._build_matches(pattern.patterns[0], input_string, match_objects)]
+        )
+        if self._is_chain_start and raw_matches and (not matches or matches[0].initiator is not raw_matches[0]):
+            return None
+        return self._repeated_matches(matches, raw_matches, offset)
+
+    def _repeated_matches(
+        self, matches: list[Match], raw_matches: list[Match], offset: int
+    ) -> tuple[list[Match], list[Match]]:
+        """
+        Keep matches and raw matches of the repeater, and check that there are enough of them.
+        :param matches:
+        :param raw_matches:
+        :param offset:
+        :return:
+        """
+        matches = self._truncate_repeater(matches, offset)
+        raw_matches = self._truncate_repeater(raw_matches, offset)
+
+        self._validate_repeater(raw_matches)
+
+        return matches, raw_matches
+
+    def _pattern_matches_from(
+        self, input_string: str, pos: int, context: dict[str, Any] | None = None
+    ) -> tuple[list[Match], list[Match]]:
+        """
+        Computes matches and raw matches of the pattern from pos, searching only what this chain part can consume
+        when the pattern is anchorable.
+
+        A chain part keeps the leading run of matches without gap, which must start at pos unless it's the chain
+        start, and no more than repeater_end of them.
+        :param input_string:
+        :param pos:
+        :param context:
+        :return:
+        """
+        pattern: Pattern = self.pattern
+        if not pattern._anchorable:
+            return pattern._matches_from(input_string, pos, context)
+        if not self._is_chain_start:
+            return pattern._matches_from(input_string, pos, context, anchored=True, limit=self.repeater_end)
+        matches, raw_matches = pattern._matches_from(
+            input_string, pos, context, anchored=False, limit=self.repeater_end
+        )
+        if raw_matches and (not matches or matches[0].initiator is not raw_matches[0]):
+            # The first raw match doesn't produce any match, so the run of matches may start after a gap.
+            return pattern._matches_from(input_string, pos, context)
+        return matches, raw_matches
+
+    def _truncate_repeater(self, matches: list[Match], offset: int) -> list[Match]:
         if not matches:
             return matches
 
-        if not self._is_chain_start:
-            separator = input_string[0 : matches[0].initiator.raw_start]
-            if separator:
-                return []
+        if not self._is_chain_start and matches[0].initiator.raw_start > offset:
+            return []
 
         j = 1
         for i in range(len(matches) - 1):
-            separator = input_string[matches[i].initiator.raw_end : matches[i + 1].initiator.raw_start]
-            if separator:
+            if matches[i + 1].initiator.raw_start > matches[i].initiator.raw_end:
                 break
             j += 1
         truncated = matches[:j]
@@ -373,6 +736,7 @@ class ChainPart(BasePattern):
             value = int(value)
             self.repeater_start = value
             self.repeater_end = value
+            self._chain._invalidate_fused()
             return self
         except ValueError:
             pass
@@ -393,6 +757,7 @@ class ChainPart(BasePattern):
                 if start or end:
                     self.repeater_start = int(start) if start else 0
                     self.repeater_end = int(end) if end else None
+        self._chain._invalidate_fused()
         return self
 
     def __repr__(self) -> str:
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+"""
+Columnar export of matches, backed by arrays.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .match import Match
+
+# Number of tags in each word of tag bitsets.
+TAG_WORD_SIZE = 64
+_TAG_WORD_MASK = (1 << TAG_WORD_SIZE) - 1
+
+
+class MatchColumns:
+    """
+    Matches of one or many inputs, stored as columns with a row for each match.
+
+    Integer columns are ``array`` objects, much smaller than a Match object for each match, so results of many inputs
+    fit in memory. Names and tags are stored as ids in ``names`` and ``tag_names`` lists.
+
+    .. code-block:: python
+
+        >>> from rebulk import Rebulk
+        >>> bulk = Rebulk().regex(r'\\d+', name='number', tags='digits').string('fox')
+        >>> columns = MatchColumns.from_matches(bulk.matches(string) for string in ['1 fox', 'fox 23'])
+        >>> list(columns.input), list(columns.start), list(columns.end), columns.value
+        ([0, 0, 1, 1], [0, 2, 0, 4], [1, 5, 3, 6], ['1', 'fox', 'fox', '23'])
+        >>> [columns.names[name] for name in columns.name], [columns.tags_of(row) for row in range(len(columns))]
+        (['number', None, None, 'number'], [['digits'], [], [], ['digits']])
+    """
+
+    def __init__(self) -> None:
+        # Index of the input of each match.
+        self.input = array("q")
+        self.start = array("q")
+        self.end = array("q")
+        # Index in names of the name of each match.
+        self.name = array("l")
+        self.value: list[Any] = []
+        # Tag bitsets, as a column for each word of TAG_WORD_SIZE tags: bit i of word w is tag_names[w * 64 + i].
+        self.tags: list[array[int]] = []
+        self.names: list[str | None] = []
+        self.tag_names: list[str] = []
+        # Number of inputs, including inputs without matches.
+        self.inputs = 0
+        self._name_ids: dict[str | None, int] = {}
+        self._tag_ids: dict[str, int] = {}
+
+    @classmethod
+    def from_matches(cls, matches_list: Iterable[Iterable[Match]]) -> MatchColumns:
+        """
+        Build columns from matches of many inputs.
+
+        Give a generator to avoid keeping all Matches objects in memory.
+
+        :param matches_list: matches of each input.
+        :type matches_list: Iterable[Matches]
+        :return:
+        :rtype: MatchColumns
+        """
+        columns = cls()
+        for matches in matches_list:
+            columns.append(matches)
+        return columns
+
+    def append(self, matches: Iterable[Match]) -> int:
+        """
+        Add matches of a new input, sorted by position.
+
+        :param matches:
+        :type matches: Matches
+        :return: index of the input
+        :rtype: int
+        """
+        input_index = self.inputs
+        self.inputs += 1
+        for match in sorted(matches):
+            bits = 0
+            for tag in match.tags:
+                bits |= 1 << self._tag_id(tag)
+            for word in self.tags:
+                word.append(bits & _TAG_WORD_MASK)
+                bits >>= TAG_WORD_SIZE
+            self.input.append(input_index)
+            self.start.append(match.start)
+            self.end.append(match.end)
+            self.name.append(self._name_id(match.name))
+            self.value.append(match.value)
+        return input_index
+
+    def _name_id(self, name: str | None) -> int:
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def _tag_id(self, tag: str) -> int:
+        tag_id = self._tag_ids.get(tag)
+        if tag_id is None:
+            tag_id = self._tag_ids[tag] = len(self.tag_names)
+            self.tag_names.append(tag)
+            if tag_id >= len(self.tags) * TAG_WORD_SIZE:
+                # Previous rows don't have this tag.
+                self.tags.append(array("Q", bytes(8 * len(self.value))))
+        return tag_id
+
+    def tags_of(self, row: int) -> list[str]:
+        """
+        Tags of a match.
+
+        :param row: index of the match.
+        :type row: int
+        :return:
+        :rtype: list[str]
+        """
+        tags = []
+        for word_index, word in enumerate(self.tags):
+            bits = word[row]
+            while bits:
+                bit = bits & -bits
+                tags.append(self.tag_names[word_index * TAG_WORD_SIZE + bit.bit_length() - 1])
+                bits ^= bit
+        return tags
+
+    def to_numpy(self) -> dict[str, Any]:
+        """
+        Copy columns to NumPy arrays. It requires numpy to be installed.
+
+        ``tags`` is a 2D array of uint64 words, with a row for each match.
+
+        :return: dict (column name, array)
+        :rtype: dict[str, numpy.ndarray]
+        """
+        try:
+            import numpy as np
+        except ImportError as error:
+            raise ImportError("numpy is required to export columns to NumPy arrays: pip install numpy") from error
+
+        tags = np.zeros((len(self), len(self.tags)), dtype=np.uint64)
+        for word_index, word in enumerate(self.tags):
+            tags[:, word_index] = np.frombuffer(word, dtype=np.uint64)
+        value = np.empty(len(self), dtype=object)
+        value[:] = self.value
+        return {
+            "input": np.frombuffer(self.input, dtype=np.int64).copy(),
+            "start": np.frombuffer(self.start, dtype=np.int64).copy(),
+            "end": np.frombuffer(self.end, dtype=np.int64).copy(),
+            "name": np.array(self.name, dtype=np.int64),
+            "value": value,
+            "tags": tags,
+        }
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __repr__(self) -> str:
+        return f"<MatchColumns:inputs={self.inputs}+rows={len(self)}>"
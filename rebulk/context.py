@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""
+Declarative conditions on context, used to enable or disable patterns, rebulk objects and rules.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+# Maximum number of distinct context values remembered by a ConditionsCache.
+CONDITIONS_CACHE_SIZE = 256
+
+_MISSING = object()
+
+
+class ContextCondition:
+    """
+    Condition that is True when ``context[key]`` is one of ``values``.
+
+    Unlike an arbitrary ``function(context)``, its result only depends on the context values of its ``keys``, so
+    the engine evaluates it once for each distinct value and caches the result.
+
+    .. code-block:: python
+
+        >>> condition = ContextCondition('mode', ('fast', 'lite'))
+        >>> condition({'mode': 'fast'}), condition({'mode': 'full'}), condition(None)
+        (True, False, False)
+        >>> (~condition)({'mode': 'full'})
+        True
+    """
+
+    def __init__(self, key: str, values: Any = True, default: Any = None, negate: bool = False) -> None:
+        """
+        :param key: context key to check.
+        :type key: str
+        :param values: accepted value, or a list, tuple, set or frozenset of accepted values.
+        :type values: object
+        :param default: value to use when key is missing from context.
+        :type default: object
+        :param negate: if True, condition is True when ``context[key]`` is not one of ``values``.
+        :type negate: bool
+        """
+        self.key = key
+        self.values = frozenset(values) if isinstance(values, (list, tuple, set, frozenset)) else frozenset((values,))
+        self.default = default
+        self.negate = negate
+
+    @property
+    def keys(self) -> tuple[str, ...]:
+        """
+        Context keys this condition depends on.
+        :return:
+        :rtype: tuple[str]
+        """
+        return (self.key,)
+
+    def __call__(self, context: dict[str, Any] | None) -> bool:
+        value = context.get(self.key, self.default) if context else self.default
+        try:
+            return (value in self.values) is not self.negate
+        except TypeError:  # unhashable value
+            return self.negate
+
+    def __invert__(self) -> ContextCondition:
+        return ContextCondition(self.key, self.values, self.default, not self.negate)
+
+    def __repr__(self) -> str:
+        return f"<ContextCondition:{self.key}{' not' if self.negate else ''} in {sorted(self.values, key=repr)}>"
+
+
+class _ConstantCondition:
+    """
+    Condition with a constant result, not depending on context.
+    """
+
+    def __init__(self, value: bool) -> None:
+        self.value = value
+
+    @property
+    def keys(self) -> tuple[str, ...]:
+        return ()
+
+    def __call__(self, context: dict[str, Any] | None) -> bool:
+        return self.value
+
+    def __invert__(self) -> _ConstantCondition:
+        return _ConstantCondition(not self.value)
+
+    def __repr__(self) -> str:
+        return f"<ContextCondition:{self.value}>"
+
+
+# Conditions whose result only depends on context values of their keys.
+_DECLARATIVE = (ContextCondition, _ConstantCondition)
+
+
+def ensure_condition(
+    condition: bool | Callable[[dict[str, Any] | None], bool],
+) -> Callable[[dict[str, Any] | None], bool]:
+    """
+    Convert a boolean to a constant condition. Functions and ContextCondition are returned as is.
+
+    :param condition:
+    :type condition: bool|function
+    :return:
+    :rtype: function
+    """
+    if callable(condition):
+        return condition
+    return _ConstantCondition(bool(condition))
+
+
+class ConditionsCache:
+    """
+    Results of a sequence of conditions for a context.
+
+    ContextCondition results are evaluated once for each distinct value of context keys they depend on, and cached.
+    Other conditions are functions that may depend on anything, so they have to be called for each context.
+    """
+
+    def __init__(self, conditions: Sequence[Callable[[dict[str, Any] | None], bool]]) -> None:
+        """
+        :param conditions: conditions to evaluate.
+        :type conditions: list[function]
+        """
+        self.conditions = conditions
+        keys: dict[str, None] = {}
+        for condition in conditions:
+            if isinstance(condition, _DECLARATIVE):
+                keys.update(dict.fromkeys(condition.keys))
+        self.keys = tuple(keys)
+        self._results: dict[tuple[Any, ...], tuple[bool | None, ...]] = {}
+
+    def cached(self, context: dict[str, Any] | None) -> tuple[bool | None, ...]:
+        """
+        Results of ContextCondition for given context, or None for conditions that must be called.
+
+        :param context:
+        :type context: dict
+        :return:
+        :rtype: tuple[bool|None]
+        """
+        signature = tuple(context.get(key, _MISSING) for key in self.keys) if context else ()
+        try:
+            results = self._results.get(signature)
+        except TypeError:  # unhashable context value
+            return self._evaluate(context)
+        if results is None:
+            results = self._evaluate(context)
+            if len(self._results) < CONDITIONS_CACHE_SIZE:
+                self._results[signature] = results
+        return results
+
+    def _evaluate(self, context: dict[str, Any] | None) -> tuple[bool | None, ...]:
+        return tuple(
+            bool(condition(context)) if isinstance(condition, _DECLARATIVE) else None for condition in self.conditions
+        )
+
+    def __call__(self, context: dict[str, Any] | None) -> list[bool]:
+        """
+        Results of all conditions for given context.
+
+        :param context:
+        :type context: dict
+        :return:
+        :rtype: list[bool]
+        """
+        return [
+            result if result is not None else bool(condition(context))
+            for condition, result in zip(self.conditions, self.cached(context), strict=True)
+        ]
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+"""
+Bytes-like inputs with a declared encoding, searched without decoding them.
+"""
+
+from __future__ import annotations
+
+import functools
+import mmap
+import re
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import os
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+DEFAULT_ENCODING = "utf-8"
+
+Buffer = bytes | bytearray | memoryview | mmap.mmap
+
+
+class EncodedInput:
+    """
+    Bytes-like input with a declared encoding.
+
+    The buffer is wrapped, not copied, so large bytes objects and memory-mapped files are searched in place. Patterns
+    search ``data``, and only slices of matches are decoded.
+
+    .. code-block:: python
+
+        >>> data = EncodedInput('Café'.encode('latin-1'), 'latin-1')
+        >>> data.encoding, len(data), data[:3]
+        ('latin-1', 4, b'Caf')
+    """
+
+    __slots__ = ("data", "encoding")
+
+    def __init__(self, data: Buffer, encoding: str = DEFAULT_ENCODING) -> None:
+        """
+        :param data: bytes, bytearray, memoryview or mmap.
+        :type data: bytes|mmap.mmap
+        :param encoding: encoding of data.
+        :type encoding: str
+        """
+        if isinstance(data, memoryview) and data.format != "B":
+            data = data.cast("B")
+        self.data = data
+        self.encoding = encoding
+
+    @classmethod
+    def open(cls, path: str | os.PathLike[str], encoding: str = DEFAULT_ENCODING) -> EncodedInput:
+        """
+        Map a file in memory, read-only, so that large files are searched without reading them.
+
+        :param path: path of the file. It must not be empty.
+        :param encoding: encoding of the file.
+        :return:
+        """
+        with open(path, "rb") as file:
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ), encoding)
+
+    def close(self) -> None:
+        """
+        Close the memory-mapped file, if data is one.
+        """
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index: Any) -> Any:
+        return self.data[index]
+
+    def find(self, sub: bytes, start: int = 0, end: int | None = None) -> int:
+        """
+        Lowest index of sub in data[start:end], or -1 if it's not found.
+
+        :param sub:
+        :param start:
+        :param end:
+        :return:
+        """
+        if end is None:
+            end = len(self.data)
+        if isinstance(self.data, memoryview):
+            match = re.compile(re.escape(sub)).search(self.data, start, end)
+            return match.start() if match else -1
+        return self.data.find(sub, start, end)
+
+    def __repr__(self) -> str:
+        return f"<EncodedInput:{type(self.data).__name__}+encoding={self.encoding}>"
+
+
+def input_encoding(input_string: Any) -> str | None:
+    """
+    Get the encoding of an input.
+
+    :param input_string:
+    :return: None for str input, the declared encoding of EncodedInput, or DEFAULT_ENCODING for other bytes-like input.
+    """
+    if isinstance(input_string, str):
+        return None
+    if isinstance(input_string, EncodedInput):
+        return input_string.encoding
+    return DEFAULT_ENCODING
+
+
+def input_buffer(input_string: Any) -> Any:
+    """
+    Get the object to search with regular expressions for an input.
+
+    :param input_string:
+    :return: data of EncodedInput, input_string itself otherwise.
+    """
+    return input_string.data if isinstance(input_string, EncodedInput) else input_string
+
+
+def encoded_input(data: Any, encoding: str | None = None) -> Any:
+    """
+    Declare the encoding of a bytes-like input, without copying it.
+
+    :param data: str, bytes, bytearray, memoryview, mmap or EncodedInput. str is returned as is.
+    :param encoding: encoding of data. If None, the declared encoding of EncodedInput, or DEFAULT_ENCODING, is used.
+    :return: EncodedInput, or str.
+    """
+    if isinstance(data, str):
+        return data
+    if isinstance(data, EncodedInput):
+        if encoding is None or encoding == data.encoding:
+            return data
+        return EncodedInput(data.data, encoding)
+    return EncodedInput(data, encoding or DEFAULT_ENCODING)
+
+
+@functools.lru_cache(maxsize=64)
+def _encode_chars(chars: Any, encoding: str) -> tuple[bytes, ...]:
+    return tuple(char.encode(encoding) for char in chars if char)
+
+
+def encode_chars(chars: Any, encoding: str) -> tuple[bytes, ...]:
+    """
+    Encode each character of a string, or each string of an iterable, so that they can be compared with slices of
+    bytes-like input. Results are cached for hashable chars.
+
+    :param chars: str, or iterable of str.
+    :param encoding:
+    :return:
+    """
+    try:
+        return _encode_chars(chars, encoding)
+    except TypeError:  # unhashable chars
+        return tuple(char.encode(encoding) for char in chars if char)
+
+
+def decode(raw: Any, input_string: Any) -> str:
+    """
+    Decode a slice of a bytes-like input.
+
+    A match may start or end inside an encoded character, as ``.`` matches a single byte in encoded regular
+    expressions. Bytes of such partial characters are decoded as U+FFFD replacement characters.
+
+    :param raw: slice of input_string.
+    :param input_string:
+    :return:
+    """
+    if isinstance(raw, str):
+        return raw
+    return str(raw, input_encoding(input_string) or DEFAULT_ENCODING, errors="replace")
@@ -5,10 +5,12 @@ Classes and functions related to matches
 
 from __future__ import annotations
 
+import bisect
 import copy
 import dataclasses
 import itertools
-from collections import OrderedDict, defaultdict
+import threading
+from collections import Counter, OrderedDict, defaultdict
 from collections.abc import Callable, Iterable, KeysView, MutableSequence
 from types import UnionType
 from typing import (
@@ -25,9 +27,12 @@ from typing import (
     overload,
 )
 
+from .columns import MatchColumns
 from .debug import defined_at
+from .encoded import decode, encode_chars, input_buffer, input_encoding
 from .key import Key
 from .loose import ensure_list, filter_index
+from .remodule import re
 from .utils import is_iterable
 
 if TYPE_CHECKING:
@@ -78,6 +83,107 @@ def _contradicts(hint: Any, declared: type) -> bool:
     return not (issubclass(element, declared) or issubclass(declared, element))
 
 
+def _merge_spans(spans: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """
+    Merge (start, end) spans into a sorted list of disjoint covered spans. Empty spans cover nothing and are dropped.
+    """
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(span for span in spans if span[0] < span[1]):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _trim(values: list[Match], removed: set[int], count: int) -> None:
+    """
+    Remove from values the count matches whose id is in removed, searching them from the end of values.
+    """
+    index = len(values)
+    while count:
+        index -= 1
+        if id(values[index]) in removed:
+            del values[index]
+            count -= 1
+
+
+# Guards lazy materialisation of Match.children, see Match._materialize_children.
+_CHILDREN_LOCK = threading.Lock()
+
+
+class SeparatorTable:
+    """
+    Separator runs of an input string, for a given set of separator characters.
+
+    ``mask[i]`` is 1 when ``input_string[i]`` is a separator, and ``runs`` holds the sorted ``(start, end)`` spans of
+    consecutive separators, so walks over the input can jump from a separator run to the next non-separator index
+    instead of testing characters one by one. Runs can be limited to the ``[start, end)`` range of the input.
+    """
+
+    def __init__(self, input_string: Any, seps: str, start: int = 0, end: int | None = None) -> None:
+        self.seps = seps
+        self.runs: list[tuple[int, int]] = []
+        self._length = len(input_string)
+        if seps:
+            encoding = input_encoding(input_string)
+            pattern: Any = (
+                f"[{re.escape(seps)}]+"
+                if encoding is None
+                # separators may be encoded on several bytes.
+                else b"(?:%s)+" % b"|".join(re.escape(sep) for sep in encode_chars(seps, encoding))
+            )
+            end = self._length if end is None else end
+            self.runs = [match.span() for match in re.compile(pattern).finditer(input_buffer(input_string), start, end)]
+        self._run_ends = [end for _, end in self.runs]
+        self._mask: bytearray | None = None
+
+    @property
+    def mask(self) -> bytearray:
+        """
+        Separator mask of the input string, built on first access.
+        """
+        if self._mask is None:
+            mask = bytearray(self._length)
+            for start, end in self.runs:
+                mask[start:end] = b"\x01" * (end - start)
+            self._mask = mask
+        return self._mask
+
+    def _run_at(self, index: int) -> tuple[int, int] | None:
+        """
+        Retrieves the separator run containing index, if any.
+        """
+        position = bisect.bisect_right(self._run_ends, index)
+        if position < len(self.runs) and self.runs[position][0] <= index:
+            return self.runs[position]
+        return None
+
+    def next_separator(self, index: int) -> int:
+        """
+        Retrieves the first separator index at or after index, or the input length if there is none.
+        """
+        position = bisect.bisect_right(self._run_ends, index)
+        if position < len(self.runs):
+            return max(self.runs[position][0], index)
+        return self._length
+
+    def next_non_separator(self, index: int) -> int:
+        """
+        Retrieves the first non-separator index at or after index.
+        """
+        run = self._run_at(index)
+        return run[1] if run else index
+
+    def previous_non_separator(self, index: int) -> int:
+        """
+        Retrieves the last non-separator index at or before index, or -1 if there is none.
+        """
+        run = self._run_at(index)
+        return run[0] - 1 if run else index
+
+
 class MatchesDict(OrderedDict[str | None, _V]):
     """
     A custom dict with matches property.
@@ -97,12 +203,17 @@ class MatchesDict(OrderedDict[str | None, _V]):
 class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
     """
     A custom list[Match] that automatically maintains name, tag, start and end lookup structures.
+
+    Lookup structures are built lazily, and only set once fully built, so that matches can be read from several
+    threads while they are not modified.
     """
 
     _base = list
     _base_add = _base.append
     _base_remove = _base.remove
     _base_extend = _base.extend
+    # Set on snapshots, see Matches.snapshot.
+    _read_only = False
 
     def __init__(self, matches: Iterable[Match] | None = None, input_string: str | None = None) -> None:
         self.input_string = input_string
@@ -114,56 +225,98 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
         self.__start_dict: dict[int, list[Match]] | None = None
         self.__end_dict: dict[int, list[Match]] | None = None
         self.__index_dict: dict[int, list[Match]] | None = None
+        self.__covered_spans: list[tuple[int, int]] | None = None
+        self.__start_keys: list[int] | None = None
+        self.__end_keys: list[int] | None = None
+        self.__separator_tables: tuple[Any, dict[str, SeparatorTable]] | None = None
         if matches:
             self.extend(matches)
 
     @property
     def _name_dict(self) -> dict[str | None, list[Match]]:
         if self.__name_dict is None:
-            self.__name_dict = defaultdict(_BaseMatches._base)
+            name_dict: dict[str | None, list[Match]] = defaultdict(_BaseMatches._base)
             for name, values in itertools.groupby([m for m in self._delegate if m.name], lambda item: item.name):
-                _BaseMatches._base_extend(self.__name_dict[name], values)
+                _BaseMatches._base_extend(name_dict[name], values)
+            self.__name_dict = name_dict
 
         return self.__name_dict
 
     @property
     def _start_dict(self) -> dict[int, list[Match]]:
         if self.__start_dict is None:
-            self.__start_dict = defaultdict(_BaseMatches._base)
+            start_dict: dict[int, list[Match]] = defaultdict(_BaseMatches._base)
             for start, values in itertools.groupby(list(self._delegate), lambda item: item.start):
-                _BaseMatches._base_extend(self.__start_dict[start], values)
+                _BaseMatches._base_extend(start_dict[start], values)
+            self.__start_dict = start_dict
 
         return self.__start_dict
 
     @property
     def _end_dict(self) -> dict[int, list[Match]]:
         if self.__end_dict is None:
-            self.__end_dict = defaultdict(_BaseMatches._base)
-            for start, values in itertools.groupby(list(self._delegate), lambda item: item.end):
-                _BaseMatches._base_extend(self.__end_dict[start], values)
+            end_dict: dict[int, list[Match]] = defaultdict(_BaseMatches._base)
+            for end, values in itertools.groupby(list(self._delegate), lambda item: item.end):
+                _BaseMatches._base_extend(end_dict[end], values)
+            self.__end_dict = end_dict
 
         return self.__end_dict
 
     @property
     def _tag_dict(self) -> dict[str, list[Match]]:
         if self.__tag_dict is None:
-            self.__tag_dict = defaultdict(_BaseMatches._base)
+            tag_dict: dict[str, list[Match]] = defaultdict(_BaseMatches._base)
             for match in self._delegate:
                 for tag in match.tags:
-                    _BaseMatches._base_add(self.__tag_dict[tag], match)
+                    _BaseMatches._base_add(tag_dict[tag], match)
+            self.__tag_dict = tag_dict
 
         return self.__tag_dict
 
     @property
     def _index_dict(self) -> dict[int, list[Match]]:
         if self.__index_dict is None:
-            self.__index_dict = defaultdict(_BaseMatches._base)
+            index_dict: dict[int, list[Match]] = defaultdict(_BaseMatches._base)
             for match in self._delegate:
                 for index in range(*match.span):
-                    _BaseMatches._base_add(self.__index_dict[index], match)
+                    _BaseMatches._base_add(index_dict[index], match)
+            self.__index_dict = index_dict
 
         return self.__index_dict
 
+    @property
+    def _start_keys(self) -> list[int]:
+        if self.__start_keys is None:
+            self.__start_keys = sorted(start for start, values in self._start_dict.items() if values)
+
+        return self.__start_keys
+
+    @property
+    def _end_keys(self) -> list[int]:
+        if self.__end_keys is None:
+            self.__end_keys = sorted(end for end, values in self._end_dict.items() if values)
+
+        return self.__end_keys
+
+    @property
+    def _covered_spans(self) -> list[tuple[int, int]]:
+        if self.__covered_spans is None:
+            self.__covered_spans = _merge_spans(match.span for match in self._delegate)
+
+        return self.__covered_spans
+
+    def _separator_table(self, seps: str) -> SeparatorTable:
+        """
+        Retrieves the separator table of input_string for seps characters, built once per input string.
+        """
+        tables = self.__separator_tables
+        if tables is None or tables[0] is not self.input_string:
+            tables = self.__separator_tables = (self.input_string, {})
+        table = tables[1].get(seps)
+        if table is None:
+            table = tables[1][seps] = SeparatorTable(self.input_string, seps)
+        return table
+
     def _add_match(self, match: Match) -> None:
         """
         Add a match
@@ -176,12 +329,19 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
             for tag in match.tags:
                 _BaseMatches._base_add(self._tag_dict[tag], match)
         if self.__start_dict is not None:
-            _BaseMatches._base_add(self._start_dict[match.start], match)
+            starting = self._start_dict[match.start]
+            if not starting and self.__start_keys is not None:
+                bisect.insort(self.__start_keys, match.start)
+            _BaseMatches._base_add(starting, match)
         if self.__end_dict is not None:
-            _BaseMatches._base_add(self._end_dict[match.end], match)
+            ending = self._end_dict[match.end]
+            if not ending and self.__end_keys is not None:
+                bisect.insort(self.__end_keys, match.end)
+            _BaseMatches._base_add(ending, match)
         if self.__index_dict is not None:
             for index in range(*match.span):
                 _BaseMatches._base_add(self._index_dict[index], match)
+        self.__covered_spans = None
         self._max_end = max(self._max_end, match.end)
 
     def _remove_match(self, match: Match) -> None:
@@ -196,14 +356,56 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
             for tag in match.tags:
                 _BaseMatches._base_remove(self._tag_dict[tag], match)
         if self.__start_dict is not None:
-            _BaseMatches._base_remove(self._start_dict[match.start], match)
+            starting = self._start_dict[match.start]
+            _BaseMatches._base_remove(starting, match)
+            if not starting and self.__start_keys is not None:
+                del self.__start_keys[bisect.bisect_left(self.__start_keys, match.start)]
         if self.__end_dict is not None:
-            _BaseMatches._base_remove(self._end_dict[match.end], match)
+            ending = self._end_dict[match.end]
+            _BaseMatches._base_remove(ending, match)
+            if not ending and self.__end_keys is not None:
+                del self.__end_keys[bisect.bisect_left(self.__end_keys, match.end)]
         if self.__index_dict is not None:
             for index in range(*match.span):
                 _BaseMatches._base_remove(self._index_dict[index], match)
+        self.__covered_spans = None
         if match.end >= self._max_end and not self._end_dict[match.end]:
-            self._max_end = max(self._end_dict.keys())
+            self._max_end = self._end_keys[-1] if self._end_keys else 0
+
+    def _remove_matches(self, matches: list[Match]) -> None:
+        """
+        Remove several matches already removed from the delegate, updating each built lookup structure once.
+
+        Matches are removed from lookup lists starting from their end, where the last added matches are, so that
+        truncating the last matches costs the number of removed matches.
+        :param matches:
+        :type matches: list[Match]
+        """
+        removed = {id(match) for match in matches}
+        if self.__name_dict is not None:
+            for name, count in Counter(match.name for match in matches if match.name).items():
+                _trim(self._name_dict[name], removed, count)
+        if self.__tag_dict is not None:
+            for tag, count in Counter(tag for match in matches for tag in match.tags).items():
+                _trim(self._tag_dict[tag], removed, count)
+        if self.__start_dict is not None:
+            for start, count in Counter(match.start for match in matches).items():
+                starting = self._start_dict[start]
+                _trim(starting, removed, count)
+                if not starting and self.__start_keys is not None:
+                    del self.__start_keys[bisect.bisect_left(self.__start_keys, start)]
+        if self.__end_dict is not None:
+            for end, count in Counter(match.end for match in matches).items():
+                ending = self._end_dict[end]
+                _trim(ending, removed, count)
+                if not ending and self.__end_keys is not None:
+                    del self.__end_keys[bisect.bisect_left(self.__end_keys, end)]
+        if self.__index_dict is not None:
+            for index, count in Counter(index for match in matches for index in range(*match.span)).items():
+                _trim(self._index_dict[index], removed, count)
+        self.__covered_spans = None
+        if any(match.end >= self._max_end for match in matches):
+            self._max_end = self._end_keys[-1] if self._end_keys else 0
 
     @overload
     def previous(self, match: Match, predicate: int) -> Match | None: ...
@@ -227,12 +429,10 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
         :return:
         :rtype:
         """
-        current = match.start
-        while current > -1:
-            previous_matches = self.ending(current)
-            if previous_matches:
-                return filter_index(previous_matches, predicate, index)
-            current -= 1
+        end_keys = self._end_keys
+        position = bisect.bisect_right(end_keys, match.start)
+        if position and end_keys[position - 1] > -1:
+            return self.ending(end_keys[position - 1], predicate, index)  # type: ignore[arg-type]
         return filter_index(_BaseMatches._base(), predicate, index)
 
     @overload
@@ -257,12 +457,10 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
         :return:
         :rtype:
         """
-        current = match.start + 1
-        while current <= self._max_end:
-            next_matches = self.starting(current)
-            if next_matches:
-                return filter_index(next_matches, predicate, index)
-            current += 1
+        start_keys = self._start_keys
+        position = bisect.bisect_right(start_keys, match.start)
+        if position < len(start_keys) and start_keys[position] <= self._max_end:
+            return self.starting(start_keys[position], predicate, index)  # type: ignore[arg-type]
         return filter_index(_BaseMatches._base(), predicate, index)
 
     @overload
@@ -308,7 +506,7 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
             index = extras[1]
         collection: list[Match] = []
         for name in dict.fromkeys(name_list):
-            collection.extend(self._name_dict[name])
+            collection.extend(self._name_dict.get(name, ()))
         return filter_index(collection, predicate, index)
 
     @overload
@@ -331,7 +529,7 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
         :return: set of matches
         :rtype: set[Match]
         """
-        return filter_index(_BaseMatches._base(self._tag_dict[tag]), predicate, index)
+        return filter_index(_BaseMatches._base(self._tag_dict.get(tag, ())), predicate, index)
 
     @overload
     def starting(self, start: int, predicate: int) -> Match | None: ...
@@ -355,7 +553,7 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
         :return: set of matches
         :rtype: set[Match]
         """
-        return filter_index(_BaseMatches._base(self._start_dict[start]), predicate, index)
+        return filter_index(_BaseMatches._base(self._start_dict.get(start, ())), predicate, index)
 
     @overload
     def ending(self, end: int, predicate: int) -> Match | None: ...
@@ -375,7 +573,7 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
         :return: set of matches
         :rtype: set[Match]
         """
-        return filter_index(_BaseMatches._base(self._end_dict[end]), predicate, index)
+        return filter_index(_BaseMatches._base(self._end_dict.get(end, ())), predicate, index)
 
     @overload
     def range(self, start: int, end: int | None, predicate: int) -> Match | None: ...
@@ -466,16 +664,29 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
 
         chain = _BaseMatches._base()
         position = min(self.max_end, position)
-
-        for i in reversed(range(start, position)):
-            index_matches = self.at_index(i)
-            filtered_matches = [index_match for index_match in index_matches if not predicate or predicate(index_match)]
+        separators = self._separator_table(seps) if self.input_string else None
+        end_keys = self._end_keys
+
+        i = position - 1
+        while i >= start:
+            filtered_matches = [
+                index_match for index_match in self.at_index(i) if not predicate or predicate(index_match)
+            ]
             if filtered_matches:
                 for chain_match in filtered_matches:
                     if chain_match not in chain:
                         chain.append(chain_match)
-            elif self.input_string[i] not in seps:  # type: ignore[index]
+                # Positions down to the latest filtered start are covered by all of them.
+                next_index = max(chain_match.start for chain_match in filtered_matches) - 1
+            elif separators and separators.mask[i]:
+                next_index = separators.previous_non_separator(i)
+            else:
                 break
+            # A match not covering i first appears at its last index, so stop there too.
+            end_position = bisect.bisect_right(end_keys, i) - 1
+            if end_position >= 0:
+                next_index = max(next_index, end_keys[end_position] - 1)
+            i = min(next_index, i - 1)
 
         return filter_index(chain, predicate, index)
 
@@ -522,16 +733,29 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
         chain = _BaseMatches._base()
 
         end = self.max_end if end is None else min(self.max_end, end)
-
-        for i in range(position, end):
-            index_matches = self.at_index(i)
-            filtered_matches = [index_match for index_match in index_matches if not predicate or predicate(index_match)]
+        separators = self._separator_table(seps) if self.input_string else None
+        start_keys = self._start_keys
+
+        i = position
+        while i < end:
+            filtered_matches = [
+                index_match for index_match in self.at_index(i) if not predicate or predicate(index_match)
+            ]
             if filtered_matches:
                 for chain_match in filtered_matches:
                     if chain_match not in chain:
                         chain.append(chain_match)
-            elif self.input_string[i] not in seps:  # type: ignore[index]
+                # Positions up to the earliest filtered end are covered by all of them.
+                next_index = min(chain_match.end for chain_match in filtered_matches)
+            elif separators and separators.mask[i]:
+                next_index = separators.next_non_separator(i)
+            else:
                 break
+            # A match not covering i first appears at its start, so stop there too.
+            start_position = bisect.bisect_right(start_keys, i)
+            if start_position < len(start_keys):
+                next_index = min(next_index, start_keys[start_position])
+            i = max(next_index, i + 1)
 
         return filter_index(chain, predicate, index)
 
@@ -543,37 +767,32 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
         """
         return max(len(self.input_string), self._max_end) if self.input_string else self._max_end
 
-    def _hole_start(self, position: int, ignore: Callable[[Match], Any] | None = None) -> int:
+    def _append_holes(self, ret: list[Match], start: int, end: int, formatter: Any, seps: str | None) -> None:
         """
-        Retrieves the start of hole index from position.
-        :param position:
-        :type position:
-        :param ignore:
-        :type ignore:
-        :return:
-        :rtype:
-        """
-        for lindex in reversed(range(position)):
-            for starting in self.starting(lindex):
-                if not ignore or not ignore(starting):
-                    return lindex
-        return 0
-
-    def _hole_end(self, position: int, ignore: Callable[[Match], Any] | None = None) -> int:
-        """
-        Retrieves the end of hole index from position.
-        :param position:
-        :type position:
-        :param ignore:
-        :type ignore:
+        Append hole matches for the uncovered range [start, end), splitting it on separators when seps is given.
+        :param ret:
+        :type ret:
+        :param start:
+        :type start:
+        :param end:
+        :type end:
+        :param formatter:
+        :type formatter:
+        :param seps:
+        :type seps:
         :return:
         :rtype:
         """
-        for rindex in range(position, self.max_end):
-            for starting in self.starting(rindex):
-                if not ignore or not ignore(starting):
-                    return rindex
-        return self.max_end
+        if not seps or not self.input_string:
+            ret.append(Match(start, end, input_string=self.input_string, formatter=formatter))
+            return
+        separators = self._separator_table(seps)
+        hole_start = start
+        while hole_start < end:
+            # A hole opens on any character, and is closed by the next separator.
+            hole_end = min(separators.next_separator(hole_start + 1), end)
+            ret.append(Match(hole_start, hole_end, input_string=self.input_string, formatter=formatter))
+            hole_start = hole_end + 1
 
     @overload
     def holes(
@@ -628,36 +847,26 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
         """
         assert self.input_string if seps else True, "input_string must be defined when using seps parameter"
         end = self.max_end if end is None else min(self.max_end, end)
-        ret: list[Match] = _BaseMatches._base()
-        hole = False
-        rindex = start
-
-        loop_start = self._hole_start(start, ignore)
-
-        for rindex in range(loop_start, end):
-            current = []
-            for at_index in self.at_index(rindex):
-                if not ignore or not ignore(at_index):
-                    current.append(at_index)
+        if ignore:
+            covered_spans = _merge_spans(match.span for match in self._delegate if not ignore(match))
+        else:
+            covered_spans = self._covered_spans
 
-            if seps and hole and self.input_string and self.input_string[rindex] in seps:
-                hole = False
-                ret[-1].end = rindex
-            else:
-                if not current and not hole:
-                    # Open a new hole match
-                    hole = True
-                    ret.append(
-                        Match(max(rindex, start), None, input_string=self.input_string, formatter=formatter)  # type: ignore[arg-type]
-                    )
-                elif current and hole:
-                    # Close current hole match
-                    hole = False
-                    ret[-1].end = rindex
-
-        if ret and hole:
-            # go the the next starting element ...
-            ret[-1].end = min(self._hole_end(rindex, ignore), end)
+        ret: list[Match] = _BaseMatches._base()
+        cursor = start
+        # covered spans are disjoint and sorted, so their ends are sorted too.
+        first = bisect.bisect_right(covered_spans, start, key=lambda span: span[1])
+        for covered_start, covered_end in itertools.islice(covered_spans, first, None):
+            if covered_start >= end:
+                break
+            if covered_start > cursor:
+                self._append_holes(ret, cursor, covered_start, formatter, seps)
+            cursor = max(cursor, covered_end)
+        if cursor < end:
+            self._append_holes(ret, cursor, end, formatter, seps)
+            # Zero-length matches cover nothing, but one starting at the last index still ends the last hole there.
+            if ret[-1].end == end and any(not ignore or not ignore(match) for match in self.starting(end - 1)):
+                ret[-1].end = end - 1
         return filter_index(ret, predicate, index)
 
     @overload
@@ -732,8 +941,8 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
         """
         Retrieves a list of matches from given (start, end) tuple.
         """
-        starting = self._index_dict[span[0]]
-        ending = self._index_dict[span[1] - 1]
+        starting = self._index_dict.get(span[0], ())
+        ending = self._index_dict.get(span[1] - 1, ())
 
         merged = list(starting)
         for marker in ending:
@@ -756,7 +965,7 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
         """
         Retrieves a list of matches from given position
         """
-        return filter_index(self._index_dict[pos], predicate, index)
+        return filter_index(_BaseMatches._base(self._index_dict.get(pos, ())), predicate, index)
 
     @property
     def names(self) -> KeysView[str | None]:
@@ -774,6 +983,21 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
         """
         return self._tag_dict.keys()
 
+    def has_any(self, names: Iterable[str | None] = (), tags: Iterable[str] = ()) -> bool:
+        """
+        Check if a match has any of the given names or tags, without retrieving matches.
+
+        :param names:
+        :param tags:
+        :return: True if a match has any of the names or tags
+        :rtype: bool
+        """
+        name_dict = self._name_dict
+        if any(name_dict.get(name) for name in names):
+            return True
+        tag_dict = self._tag_dict
+        return any(tag_dict.get(tag) for tag in tags)
+
     @overload
     def to_dict(
         self, details: bool = ..., first_value: bool = ..., *, enforce_list: Literal[True]
@@ -817,6 +1041,17 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
                     ret[match.name] = value
         return ret
 
+    def to_columns(self) -> MatchColumns:
+        """
+        Converts matches to compact columns, sorted by position.
+        Use MatchColumns.from_matches to convert matches of many inputs.
+        :return:
+        :rtype: MatchColumns
+        """
+        columns = MatchColumns()
+        columns.append(self)
+        return columns
+
     def __len__(self) -> int:
         return len(self._delegate)
 
@@ -831,7 +1066,7 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
 
     def __getitem__(self, index: int | slice | Key[Any]) -> Any:
         if isinstance(index, Key):
-            named = self._name_dict[index.name]
+            named = self._name_dict.get(index.name)
             return named[0].value if named else None
         ret = self._delegate[index]
         if isinstance(ret, list):
@@ -842,7 +1077,7 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
         """
         Retrieve all values for the given typed key, in match order.
         """
-        return [match.value for match in self._name_dict[key.name]]
+        return [match.value for match in self._name_dict.get(key.name, ())]
 
     def to(self, model: type[M]) -> M:
         """
@@ -903,7 +1138,7 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
                     f"{model.__name__} field {name!r} typed {hint!r} contradicts "
                     f"declared key {name!r} of value_type {declared.value_type!r}"
                 )
-            values = [match.value for match in self._name_dict[name]]
+            values = [match.value for match in self._name_dict.get(name, ())]
             if get_origin(hint) is list:
                 kwargs[name] = values
             elif values:
@@ -949,6 +1184,10 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
                 f"does not match declared key {key.name!r} value_type {key.value_type!r}"
             )
 
+    def _check_writable(self) -> None:
+        if self._read_only:
+            raise TypeError(f"{type(self).__name__} snapshot is read-only")
+
     @overload
     def __setitem__(self, index: int, match: Match) -> None: ...
 
@@ -956,6 +1195,7 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
     def __setitem__(self, index: slice, match: Iterable[Match]) -> None: ...
 
     def __setitem__(self, index: int | slice, match: Match | Iterable[Match]) -> None:
+        self._check_writable()
         self._delegate[index] = match  # type: ignore[index,assignment]
         if isinstance(index, slice):
             for match_item in match:  # type: ignore[union-attr]
@@ -964,19 +1204,21 @@ class _BaseMatches(MutableSequence):  # type: ignore[type-arg]
         self._add_match(match)  # type: ignore[arg-type]
 
     def __delitem__(self, index: int | slice) -> None:
+        self._check_writable()
+        if isinstance(index, slice):
+            removed = self._delegate[index]
+            del self._delegate[index]
+            self._remove_matches(removed)
+            return
         match = self._delegate[index]
         del self._delegate[index]
-        if isinstance(match, list):
-            # if index is a slice, we has a match list
-            for match_item in match:
-                self._remove_match(match_item)
-        else:
-            self._remove_match(match)
+        self._remove_match(match)
 
     def __repr__(self) -> str:
         return self._delegate.__repr__()
 
     def insert(self, index: int, value: Match) -> None:
+        self._check_writable()
         self._delegate.insert(index, value)
         self._add_match(value)
 
@@ -994,6 +1236,20 @@ class Matches(_BaseMatches):
         assert not match.marker, "A marker match should not be added to <Matches> object"
         super()._add_match(match)
 
+    def snapshot(self) -> Matches:
+        """
+        Read-only copy of matches and markers, holding the same Match objects.
+
+        It can be read from several threads while this object is modified.
+        :return:
+        :rtype: Matches
+        """
+        snapshot = Matches(self._delegate, self.input_string)
+        snapshot.markers.extend(self.markers)
+        snapshot.declared_keys = dict(self.declared_keys)
+        snapshot._read_only = snapshot.markers._read_only = True
+        return snapshot
+
 
 class Markers(_BaseMatches):
     """
@@ -1042,8 +1298,12 @@ class Match:
         self.private = private
         self.conflict_solver = conflict_solver
         self._children: Matches | None = None
+        # (input_string, [(start, end, name), ...]) of children not materialised yet, see ``children``.
+        self._pending_children: tuple[str | None, list[tuple[int, int, str | None]]] | None = None
         self._raw_start: int | None = None
         self._raw_end: int | None = None
+        # Position of input_string in the whole input, when it holds only a part of it (see Rebulk.stream_matches).
+        self.input_offset = 0
         # Set by Pattern processing for matches produced by repeated/multi patterns.
         self.match_index: int = 0
         self.defined_at: Frame | None = pattern.defined_at if pattern else defined_at()
@@ -1060,14 +1320,34 @@ class Match:
         """
         Children matches.
         """
-        if self._children is None:
-            self._children = Matches(None, self.input_string)
-        return self._children
+        children = self._children
+        if children is None:
+            with _CHILDREN_LOCK:
+                children = self._children
+                if children is None:
+                    children = self._materialize_children()
+        return children
 
     @children.setter
     def children(self, value: Matches) -> None:
+        self._pending_children = None
         self._children = value
 
+    def _materialize_children(self) -> Matches:
+        """
+        Build pending children in a new Matches, and set it as children only once complete, so that concurrent readers
+        never see partial children.
+        :return:
+        :rtype: Matches
+        """
+        children = Matches(None, self.input_string)
+        if self._pending_children is not None:
+            input_string, child_spans = self._pending_children
+            self.pattern._materialize_children(self, children, input_string, child_spans)
+        self._children = children
+        self._pending_children = None
+        return children
+
     @property
     def value(self) -> Any:
         """
@@ -1166,7 +1446,11 @@ class Match:
         :rtype:
         """
         if self.input_string:
-            return self.input_string[self.raw_start : self.raw_end]
+            # Bytes-like input is decoded lazily, for this match only.
+            return decode(
+                self.input_string[self.raw_start - self.input_offset : self.raw_end - self.input_offset],
+                self.input_string,
+            )
         return None
 
     @property
@@ -1253,22 +1537,21 @@ class Match:
         :return: list of new Match objects
         :rtype: list
         """
-        current_match: Match = copy.deepcopy(self)
-        split_match: Match | None = current_match
         ret: list[Match] = []
-
-        for i, char in enumerate(self.raw):  # type: ignore[arg-type]
-            if char in seps:
-                if not split_match:
-                    split_match = copy.deepcopy(current_match)
-                    current_match.end = self.start + i
-
-            else:
-                if split_match:
-                    split_match.start = self.start + i
-                    current_match = split_match
-                    ret.append(split_match)
-                    split_match = None
+        # input_string may hold only a part of the input, starting at input_offset.
+        raw_start = self.raw_start - self.input_offset
+        raw_end = self.raw_end - self.input_offset
+        separators = SeparatorTable(self.input_string, seps, raw_start, raw_end)
+
+        cursor = separators.next_non_separator(raw_start)
+        while cursor < raw_end:
+            next_separator = separators.next_separator(cursor)
+            split_match = copy.deepcopy(self)
+            split_match.start = self.start + cursor - raw_start
+            if next_separator < raw_end:
+                split_match.end = self.start + next_separator - raw_start
+            ret.append(split_match)
+            cursor = separators.next_non_separator(next_separator)
 
         return filter_index(ret, predicate, index)
 
@@ -6,18 +6,20 @@ Abstract pattern class definition along with various implementations (regexp, st
 from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
-from typing import TYPE_CHECKING, Any, Literal, overload
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, overload
 
 from . import debug
+from .context import ensure_condition
+from .encoded import input_buffer, input_encoding
 from .formatters import default_formatter
 from .loose import call, ensure_dict, ensure_list
-from .match import Match
-from .remodule import REGEX_ENABLED, re
-from .utils import find_all, get_first_defined, is_iterable
+from .match import Match, Matches
+from .remodule import backend_of, compile_regex, is_regex_module, re, regex_backend
+from .utils import find_all_spans, get_first_defined, is_iterable
 from .validators import allways_true
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterator, Sequence
+    from collections.abc import Callable, Iterable, Iterator, Sequence
 
 
 def _callable_or_none(value: Any) -> Callable[..., Any] | None:
@@ -25,6 +27,87 @@ def _callable_or_none(value: Any) -> Callable[..., Any] | None:
     return value if callable(value) else None
 
 
+_UNSET: Any = object()
+
+# Anchors, word boundaries and lookbehinds look at characters before the search position.
+_CONTEXT_SENSITIVE_REGEX = re.compile(r"\^|\\[AbBGmM]|\(\?<[=!]")
+
+
+class _MatchConfig(NamedTuple):
+    """
+    Processing configuration resolved for a given (match name, child) pair of a pattern.
+
+    ``formatter`` is ``_UNSET`` when the match formatter must be left untouched, and ``validator`` is ``None`` when
+    the match doesn't need to be validated.
+    """
+
+    private: bool
+    value: Any
+    formatter: Any
+    validator: Callable[..., Any] | None
+
+
+def _find_run(input_string: str, sub: str, pos: int, anchored: bool) -> Iterator[int]:
+    """
+    Yield the leading run of find_all(input_string, sub, pos) indices following each other without gap.
+
+    :param anchored: if True, the run must start at pos.
+    """
+    index = pos if anchored else input_string.find(sub, pos)
+    while index > -1 and input_string.find(sub, index, index + len(sub)) == index:
+        yield index
+        index += len(sub)
+
+
+def _finditer_run(pattern: Any, input_string: str, pos: int, anchored: bool) -> Iterator[Any]:
+    """
+    Yield pattern.finditer(input_string, pos) matches up to the end of the leading run of non empty matches following
+    each other without gap.
+
+    Once the run has started, each match is matched at the end of the previous one, so nothing beyond the run is
+    scanned.
+    :param anchored: if True, the run must start at pos.
+    """
+    run_end = pos
+    if not anchored:
+        for match_object in pattern.finditer(input_string, pos):
+            yield match_object
+            if match_object.end() > match_object.start():
+                run_end = match_object.end()
+                break
+        else:
+            return
+    while True:
+        match_object = pattern.match(input_string, run_end)
+        if match_object is None:
+            return
+        if match_object.end() > run_end:
+            yield match_object
+            run_end = match_object.end()
+            continue
+        # After an empty match, finditer may still find a non empty one at the same position.
+        for match_object in pattern.finditer(input_string, run_end):
+            if match_object.start() > run_end:
+                return
+            yield match_object
+            if match_object.end() > run_end:
+                run_end = match_object.end()
+                break
+        else:
+            return
+
+
+def _encoded_regex(pattern: Any, encoding: str) -> Any:
+    """
+    Compile a regular expression to search bytes-like input with given encoding.
+
+    Its source is encoded, so character classes like ``\\w`` only match ASCII characters, and ``.`` matches a single
+    byte.
+    """
+    module = backend_of(pattern)
+    return compile_regex(module, pattern.pattern.encode(encoding), pattern.flags & ~module.UNICODE)
+
+
 class BasePattern(metaclass=ABCMeta):
     """
     Base class for Pattern like objects
@@ -61,6 +144,7 @@ class Pattern(BasePattern, metaclass=ABCMeta):
         formatter: Callable[..., Any] | dict[str | None, Callable[..., Any]] | None = None,
         value: Any = None,
         validator: Callable[..., Any] | dict[str | None, Callable[..., Any]] | None = None,
+        span_validator: Callable[[str, int, int], bool] | None = None,
         children: bool = False,
         every: bool = False,
         private_parent: bool = False,
@@ -71,7 +155,7 @@ class Pattern(BasePattern, metaclass=ABCMeta):
         marker: bool = False,
         format_all: bool = False,
         validate_all: bool = False,
-        disabled: bool | Callable[[dict[str, Any] | None], bool] = lambda context: False,
+        disabled: bool | Callable[[dict[str, Any] | None], bool] = False,
         log_level: int | None = None,
         properties: dict[str, Any] | None = None,
         post_processor: Callable[..., Any] | None = None,
@@ -95,6 +179,9 @@ class Pattern(BasePattern, metaclass=ABCMeta):
         :param validator: dict (name, func) of validator to use with this pattern. name is the match name to support,
         and func a function(match) that returns the a boolean. A single validator function can also be
         passed as a shortcut for {None: validator}. If return value is False, match will be ignored.
+        :param span_validator: function(input_string, start, end) that returns a boolean, called on each raw span found
+        before any Match object is built. If return value is False, the span is skipped.
+        :type span_validator: func
         :param children: generates children instead of parent
         :type children: bool
         :param every: generates both parent and children.
@@ -115,7 +202,8 @@ class Pattern(BasePattern, metaclass=ABCMeta):
         :type format_all: bool
         :param validate_all if True, pattern will validate every match in the hierarchy (even match not yield).
         :type validate_all: bool
-        :param disabled: if True, this pattern is disabled. Can also be a function(context).
+        :param disabled: if True, this pattern is disabled. Can also be a function(context), or a ContextCondition
+        which is evaluated once for each distinct context value.
         :type disabled: bool|function
         :param log_lvl: Log level associated to this pattern
         :type log_lvl: int
@@ -126,11 +214,13 @@ class Pattern(BasePattern, metaclass=ABCMeta):
         :param post_match_processor: Post match processing function
         :type post_match_processor: func
         """
+        self._match_configs: dict[tuple[str | None, bool], _MatchConfig] = {}
         self.name = name
         self.tags: list[str] = ensure_list(tags)
         self.formatters, self._default_formatter = ensure_dict(formatter, default_formatter)
         self.values, self._default_value = ensure_dict(value, None)
         self.validators, self._default_validator = ensure_dict(validator, allways_true)
+        self.span_validator = _callable_or_none(span_validator)
         self.every = every
         self.children = children
         self.private = private
@@ -141,11 +231,7 @@ class Pattern(BasePattern, metaclass=ABCMeta):
         self.marker = marker
         self.format_all = format_all
         self.validate_all = validate_all
-        self.disabled: Callable[[dict[str, Any] | None], bool]
-        if not callable(disabled):
-            self.disabled = lambda context: disabled
-        else:
-            self.disabled = disabled
+        self.disabled = ensure_condition(disabled)
         self._log_level = log_level
         self._properties = properties
         self.defined_at = debug.defined_at()
@@ -153,6 +239,48 @@ class Pattern(BasePattern, metaclass=ABCMeta):
         self.pre_match_processor = _callable_or_none(pre_match_processor)
         self.post_match_processor = _callable_or_none(post_match_processor)
 
+    @property
+    def formatters(self) -> dict[Any, Callable[..., Any]]:
+        """
+        Formatters of this pattern, by match name.
+        :return:
+        :rtype:
+        """
+        return self._formatters
+
+    @formatters.setter
+    def formatters(self, value: dict[Any, Callable[..., Any]]) -> None:
+        self._formatters = value
+        self._match_configs.clear()
+
+    @property
+    def values(self) -> dict[Any, Any]:
+        """
+        Hardcoded values of this pattern, by match name.
+        :return:
+        :rtype:
+        """
+        return self._values
+
+    @values.setter
+    def values(self, value: dict[Any, Any]) -> None:
+        self._values = value
+        self._match_configs.clear()
+
+    @property
+    def validators(self) -> dict[Any, Callable[..., Any]]:
+        """
+        Validators of this pattern, by match name.
+        :return:
+        :rtype:
+        """
+        return self._validators
+
+    @validators.setter
+    def validators(self, value: dict[Any, Callable[..., Any]]) -> None:
+        self._validators = value
+        self._match_configs.clear()
+
     @property
     def log_level(self) -> int:
         """
@@ -193,19 +321,109 @@ class Pattern(BasePattern, metaclass=ABCMeta):
         :rtype: iterator[Match]
         """
 
+        matches, raw_matches = self._matches_from(input_string, 0, context)
+
+        if with_raw_matches:
+            return matches, raw_matches
+        return matches
+
+    def _matches_from(
+        self,
+        input_string: str,
+        pos: int,
+        context: dict[str, Any] | None = None,
+        anchored: bool | None = None,
+        limit: int | None = None,
+    ) -> tuple[list[Match], list[Match]]:
+        """
+        Computes all matches and raw matches for a given input, starting the search at pos.
+
+        pos must be 0 unless this pattern is position safe, and anchored must be None unless this pattern is
+        anchorable.
+        :param input_string: the string to parse
+        :type input_string: str
+        :param pos: index of input_string where the search starts
+        :type pos: int
+        :param context: the context
+        :type context: dict
+        :param anchored: if not None, only the leading run of raw matches following each other without gap is
+        searched. If True, this run must also start at pos.
+        :type anchored: bool
+        :param limit: maximum number of raw matches to search for each pattern
+        :type limit: int
+        :return: matches and raw matches based on input_string for this pattern
+        :rtype: tuple[list[Match], list[Match]]
+        """
+        patterns_matches = (
+            self._match(pattern, input_string, context, pos, anchored)
+            if pos or anchored is not None
+            else self._match(pattern, input_string, context)
+            for pattern in self.patterns
+        )
+        return self._process_raw_matches(patterns_matches, limit)
+
+    def _process_raw_matches(
+        self, patterns_matches: Iterable[Iterable[Match]], limit: int | None = None
+    ) -> tuple[list[Match], list[Match]]:
+        """
+        Process raw matches found by each pattern of this pattern.
+
+        :param patterns_matches: raw matches of each pattern
+        :type patterns_matches: iterable[iterable[Match]]
+        :param limit: maximum number of raw matches to process for each pattern
+        :type limit: int
+        :return: matches and raw matches
+        :rtype: tuple[list[Match], list[Match]]
+        """
         matches: list[Match] = []
         raw_matches: list[Match] = []
 
-        for pattern in self.patterns:
-            for match_index, match in enumerate(self._match(pattern, input_string, context)):
+        for pattern_matches in patterns_matches:
+            for match_index, match in enumerate(pattern_matches):
+                if limit is not None and match_index >= limit:
+                    break
                 raw_matches.append(match)
                 matches.extend(self._process_matches(match, match_index))
 
         matches = self._post_process_matches(matches)
 
-        if with_raw_matches:
-            return matches, raw_matches
-        return matches
+        return matches, raw_matches
+
+    @property
+    def _position_safe(self) -> bool:
+        """
+        Check if matching from a position of the whole input gives the same matches as matching the input sliced at
+        this position, so that callers can avoid the slice.
+
+        Custom validators and processors may look at characters around the match, so they are never position safe.
+        :return:
+        :rtype:
+        """
+        return (
+            self._default_validator is allways_true
+            and all(validator is allways_true for validator in self.validators.values())
+            and not self.span_validator
+            and not self.post_processor
+            and not self.pre_match_processor
+            and not self.post_match_processor
+        )
+
+    @property
+    def _anchorable(self) -> bool:
+        """
+        Check if this pattern can search only the leading run of raw matches following each other without gap.
+
+        This requires a single pattern, so that raw matches come in input order, and no processor, so that each
+        raw match is processed on its own.
+        :return:
+        :rtype:
+        """
+        return (
+            len(self.patterns) == 1
+            and not self.post_processor
+            and not self.pre_match_processor
+            and not self.post_match_processor
+        )
 
     @property
     def _should_include_children(self) -> bool:
@@ -230,15 +448,49 @@ class Pattern(BasePattern, metaclass=ABCMeta):
         return not self.children or self.every
 
     @staticmethod
-    def _match_config_property_keys(match: Match, child: bool = False) -> Iterator[str | None]:
-        if match.name:
-            yield match.name
+    def _match_config_property_keys(name: str | None, child: bool = False) -> Iterator[str | None]:
+        if name:
+            yield name
         if child:
             yield "__children__"
         else:
             yield "__parent__"
         yield None
 
+    def _match_config(self, name: str | None, child: bool = False) -> _MatchConfig:
+        """
+        Resolve the processing configuration for matches with given name, computed once per (name, child) pair.
+
+        :param name:
+        :param child:
+        :return:
+        """
+        key = (name, child)
+        config = self._match_configs.get(key)
+        if config is None:
+            keys = list(self._match_config_property_keys(name, child=child))
+            included = self._should_include_children if child else self._should_include_parent
+            config = _MatchConfig(
+                private=bool(
+                    (name and name in self.private_names)
+                    or (not child and self.private_parent)
+                    or (child and self.private_children)
+                ),
+                value=get_first_defined(self.values, keys, self._default_value),
+                formatter=(
+                    get_first_defined(self.formatters, keys, self._default_formatter)
+                    if included or self.format_all
+                    else _UNSET
+                ),
+                validator=(
+                    get_first_defined(self.validators, keys, self._default_validator)
+                    if included or self.validate_all
+                    else None
+                ),
+            )
+            self._match_configs[key] = config
+        return config
+
     @staticmethod
     def _process_match_index(match: Match, match_index: int) -> None:
         """
@@ -257,12 +509,7 @@ class Pattern(BasePattern, metaclass=ABCMeta):
         :param child:
         :return:
         """
-
-        if (
-            (match.name and match.name in self.private_names)
-            or (not child and self.private_parent)
-            or (child and self.private_children)
-        ):
+        if self._match_config(match.name, child).private:
             match.private = True
 
     def _process_match_value(self, match: Match, child: bool = False) -> None:
@@ -271,8 +518,7 @@ class Pattern(BasePattern, metaclass=ABCMeta):
         :param match:
         :return:
         """
-        keys = self._match_config_property_keys(match, child=child)
-        pattern_value = get_first_defined(self.values, keys, self._default_value)
+        pattern_value = self._match_config(match.name, child).value
         if pattern_value:
             match.value = pattern_value
 
@@ -283,10 +529,9 @@ class Pattern(BasePattern, metaclass=ABCMeta):
         :param match:
         :return:
         """
-        included = self._should_include_children if child else self._should_include_parent
-        if included or self.format_all:
-            keys = self._match_config_property_keys(match, child=child)
-            match.formatter = get_first_defined(self.formatters, keys, self._default_formatter)
+        formatter = self._match_config(match.name, child).formatter
+        if formatter is not _UNSET:
+            match.formatter = formatter
 
     def _process_match_validator(self, match: Match, child: bool = False) -> bool:
         """
@@ -295,13 +540,8 @@ class Pattern(BasePattern, metaclass=ABCMeta):
         :param match:
         :return: True if match is validated by the configured validator, False otherwise.
         """
-        included = self._should_include_children if child else self._should_include_parent
-        if included or self.validate_all:
-            keys = self._match_config_property_keys(match, child=child)
-            validator = get_first_defined(self.validators, keys, self._default_validator)
-            if validator and not validator(match):
-                return False
-        return True
+        validator = self._match_config(match.name, child).validator
+        return not validator or bool(validator(match))
 
     def _process_match(self, match: Match, match_index: int, child: bool = False) -> bool:
         """
@@ -313,11 +553,15 @@ class Pattern(BasePattern, metaclass=ABCMeta):
         :return: True if match is validated by the configured validator, False otherwise.
         :rtype:
         """
-        self._process_match_index(match, match_index)
-        self._process_match_private(match, child)
-        self._process_match_value(match, child)
-        self._process_match_formatter(match, child)
-        return self._process_match_validator(match, child)
+        config = self._match_config(match.name, child)
+        match.match_index = match_index
+        if config.private:
+            match.private = True
+        if config.value:
+            match.value = config.value
+        if config.formatter is not _UNSET:
+            match.formatter = config.formatter
+        return not config.validator or bool(config.validator(match))
 
     @staticmethod
     def _process_match_processor(match: Match, processor: Callable[..., Any] | None) -> Match:
@@ -341,9 +585,10 @@ class Pattern(BasePattern, metaclass=ABCMeta):
         if not self._process_match(match, match_index):
             return
 
-        for child in match.children:
-            if not self._process_match(child, match_index, child=True):
-                return
+        if match._pending_children is None:
+            for child in match.children:
+                if not self._process_match(child, match_index, child=True):
+                    return
 
         match = self._process_match_processor(match, self.post_match_processor)
         if not match:
@@ -405,6 +650,8 @@ class Pattern(BasePattern, metaclass=ABCMeta):
         pattern: Any,
         input_string: str,
         context: dict[str, Any] | None = None,
+        pos: int = 0,
+        anchored: bool | None = None,
     ) -> Iterator[Match]:  # pragma: no cover
         """
         Computes all unprocess matches for a given pattern and input.
@@ -414,6 +661,11 @@ class Pattern(BasePattern, metaclass=ABCMeta):
         :type input_string: str
         :param context: the context
         :type context: dict
+        :param pos: index of input_string where the search starts. Only given to position safe patterns.
+        :type pos: int
+        :param anchored: search only the leading run of matches without gap, starting at pos if True. Only given to
+        anchorable patterns.
+        :type anchored: bool
         :return: matches based on input_string for this pattern
         :rtype: iterator[Match]
         """
@@ -448,9 +700,39 @@ class StringPattern(Pattern):
     def match_options(self) -> dict[str, Any]:
         return self._match_kwargs
 
-    def _match(self, pattern: Any, input_string: str, context: dict[str, Any] | None = None) -> Iterator[Match]:
-        for index in find_all(input_string, pattern, **self._kwargs):
-            match = Match(index, index + len(pattern), pattern=self, input_string=input_string, **self._match_kwargs)
+    @property
+    def _position_safe(self) -> bool:
+        return super()._position_safe and "start" not in self._kwargs and "end" not in self._kwargs
+
+    @property
+    def _anchorable(self) -> bool:
+        return (
+            super()._anchorable
+            and bool(self.patterns[0])
+            and not any(key in self._kwargs for key in ("start", "end", "ignore_case"))
+        )
+
+    def _match(
+        self,
+        pattern: Any,
+        input_string: str,
+        context: dict[str, Any] | None = None,
+        pos: int = 0,
+        anchored: bool | None = None,
+    ) -> Iterator[Match]:
+        span_validator = self.span_validator
+        encoding = input_encoding(input_string)
+        if encoding is not None:
+            pattern = pattern.encode(encoding)
+        if anchored is None:
+            kwargs = {**self._kwargs, "start": pos} if pos else self._kwargs
+            spans: Iterable[tuple[int, int]] = find_all_spans(input_string, pattern, **kwargs)
+        else:
+            spans = ((index, index + len(pattern)) for index in _find_run(input_string, pattern, pos, anchored))
+        for start, end in spans:
+            if span_validator and not span_validator(input_string, start, end):
+                continue
+            match = Match(start, end, pattern=self, input_string=input_string, **self._match_kwargs)
             if match:
                 yield match
 
@@ -462,12 +744,8 @@ class RePattern(Pattern):
 
     def __init__(self, *patterns: Any, **kwargs: Any) -> None:
         super().__init__(**kwargs)
-        self.repeated_captures: bool = REGEX_ENABLED
-        if "repeated_captures" in kwargs:
-            self.repeated_captures = bool(kwargs.get("repeated_captures"))
-        if self.repeated_captures and not REGEX_ENABLED:  # pragma: no cover
-            raise NotImplementedError("repeated_capture is available only with regex module.")
         self.abbreviations = kwargs.get("abbreviations", [])
+        self.backend = kwargs.get("backend")
         self._kwargs = kwargs
         self._match_kwargs = filter_match_kwargs(kwargs)
         self._children_match_kwargs = filter_match_kwargs(kwargs, children=True)
@@ -477,15 +755,28 @@ class RePattern(Pattern):
                 if self.abbreviations and pattern:
                     for key, replacement in self.abbreviations:
                         pattern = pattern.replace(key, replacement)
-                pattern = call(re.compile, pattern, **self._kwargs)
+                pattern = compile_regex(regex_backend(self.backend, pattern), pattern, **self._kwargs)
             elif isinstance(pattern, dict):
                 if self.abbreviations and "pattern" in pattern:
                     for key, replacement in self.abbreviations:
                         pattern["pattern"] = pattern["pattern"].replace(key, replacement)
-                pattern = re.compile(**pattern)
+                pattern = compile_regex(regex_backend(self.backend, pattern.get("pattern")), **pattern)
             elif hasattr(pattern, "__iter__"):
-                pattern = re.compile(*pattern)
+                pattern = list(pattern)
+                pattern = compile_regex(regex_backend(self.backend, pattern[0] if pattern else None), *pattern)
             self._patterns.append(pattern)
+        regex_patterns = bool(self._patterns) and all(
+            is_regex_module(backend_of(pattern)) for pattern in self._patterns
+        )
+        self.repeated_captures: bool = regex_patterns
+        if "repeated_captures" in kwargs:
+            self.repeated_captures = bool(kwargs.get("repeated_captures"))
+        if self.repeated_captures and not regex_patterns:  # pragma: no cover
+            raise NotImplementedError("repeated_capture is available only with regex module.")
+        self._context_sensitive = any(
+            not isinstance(pattern.pattern, str) or _CONTEXT_SENSITIVE_REGEX.search(pattern.pattern)
+            for pattern in self._patterns
+        )
 
     @property
     def patterns(self) -> Sequence[Any]:
@@ -499,14 +790,47 @@ class RePattern(Pattern):
     def match_options(self) -> dict[str, Any]:
         return self._match_kwargs
 
-    def _match(self, pattern: Any, input_string: str, context: dict[str, Any] | None = None) -> Iterator[Match]:
+    @property
+    def _position_safe(self) -> bool:
+        return not self._context_sensitive and super()._position_safe
+
+    def _match(
+        self,
+        pattern: Any,
+        input_string: str,
+        context: dict[str, Any] | None = None,
+        pos: int = 0,
+        anchored: bool | None = None,
+    ) -> Iterator[Match]:
+        encoding = input_encoding(input_string)
+        if encoding is not None:
+            pattern = _encoded_regex(pattern, encoding)
+        buffer = input_buffer(input_string)
+        match_objects = (
+            pattern.finditer(buffer, pos) if anchored is None else _finditer_run(pattern, buffer, pos, anchored)
+        )
+        return self._build_matches(pattern, input_string, match_objects)
+
+    def _build_matches(self, pattern: Any, input_string: str, match_objects: Iterable[Any]) -> Iterator[Match]:
+        """
+        Build unprocessed matches from match objects of the given compiled pattern.
+        :param pattern:
+        :param input_string:
+        :param match_objects:
+        :return:
+        """
         names = {v: k for k, v in pattern.groupindex.items()}
-        for match_object in pattern.finditer(input_string):
+        span_validator = self.span_validator
+        lazy_children = self._lazy_children
+        for match_object in match_objects:
             start = match_object.start()
             end = match_object.end()
+            if span_validator and not span_validator(input_string, start, end):
+                continue
             main_match = Match(start, end, pattern=self, input_string=input_string, **self._match_kwargs)
 
             if pattern.groups:
+                child_spans: list[tuple[int, int, str | None]] = []
                 for i in range(1, pattern.groups + 1):
                     name = names.get(i, main_match.name)
                     if self.repeated_captures:
@@ -515,21 +839,74 @@ class RePattern(Pattern):
                         span = match_object.span(i)
                         spans = [span] if span[0] > -1 and span[1] > -1 else []
                     for child_start, child_end in spans:
-                        child_match = Match(
-                            child_start,
-                            child_end,
-                            name=name,
-                            parent=main_match,
-                            pattern=self,
-                            input_string=input_string,
-                            **self._children_match_kwargs,
-                        )
-                        if child_match:
-                            main_match.children.append(child_match)
+                        if child_end > child_start:
+                            child_spans.append((child_start, child_end, name))
+                if lazy_children:
+                    if child_spans:
+                        main_match._pending_children = (input_string, child_spans)
+                else:
+                    self._build_children(main_match, main_match.children, input_string, child_spans)
 
             if main_match:
                 yield main_match
 
+    @property
+    def _lazy_children(self) -> bool:
+        """
+        Check if children matches can be materialised lazily, because they are neither returned nor able to
+        invalidate their parent.
+        :return:
+        :rtype:
+        """
+        return not (self._should_include_children or self.private_children or self.validate_all)
+
+    def _build_children(
+        self,
+        match: Match,
+        children: Matches,
+        input_string: str | None,
+        child_spans: list[tuple[int, int, str | None]],
+    ) -> None:
+        """
+        Build children matches of given match from (start, end, name) spans.
+        :param match:
+        :param children: children of match to fill.
+        :param input_string:
+        :param child_spans:
+        :return:
+        """
+        for child_start, child_end, name in child_spans:
+            children.append(
+                Match(
+                    child_start,
+                    child_end,
+                    name=name,
+                    parent=match,
+                    pattern=self,
+                    input_string=input_string,
+                    **self._children_match_kwargs,
+                )
+            )
+
+    def _materialize_children(
+        self,
+        match: Match,
+        children: Matches,
+        input_string: str | None,
+        child_spans: list[tuple[int, int, str | None]],
+    ) -> None:
+        """
+        Build and process lazy children matches of given match, when they are read for the first time.
+        :param match:
+        :param children: children of match to fill.
+        :param input_string:
+        :param child_spans:
+        :return:
+        """
+        self._build_children(match, children, input_string, child_spans)
+        for child in children:
+            self._process_match(child, match.match_index, child=True)
+
 
 class FunctionalPattern(Pattern):
     """
@@ -550,7 +927,22 @@ class FunctionalPattern(Pattern):
     def match_options(self) -> dict[str, Any]:
         return self._match_kwargs
 
-    def _match(self, pattern: Any, input_string: str, context: dict[str, Any] | None = None) -> Iterator[Match]:
+    @property
+    def _position_safe(self) -> bool:
+        return False
+
+    @property
+    def _anchorable(self) -> bool:
+        return False
+
+    def _match(
+        self,
+        pattern: Any,
+        input_string: str,
+        context: dict[str, Any] | None = None,
+        pos: int = 0,
+        anchored: bool | None = None,
+    ) -> Iterator[Match]:
         ret = call(pattern, input_string, context, **self._kwargs)
         if ret:
             args_iterable: Any
@@ -596,7 +988,7 @@ def filter_match_kwargs(kwargs: dict[str, Any], children: bool = False) -> dict[
     :rtype: dict
     """
     kwargs = kwargs.copy()
-    for key in ("pattern", "start", "end", "parent", "formatter", "value"):
+    for key in ("pattern", "start", "end", "parent", "formatter", "value", "span_validator"):
         if key in kwargs:
             del kwargs[key]
     if children:
@@ -5,23 +5,31 @@ Entry point functions and classes for Rebulk
 
 from __future__ import annotations
 
+import asyncio
+import functools
+from collections import Counter, deque
+from collections.abc import AsyncIterable
 from logging import getLogger
-from typing import TYPE_CHECKING, Any, cast
+from typing import IO, TYPE_CHECKING, Any, cast
 
 from . import debug
 from .builder import Builder
 from .chain import Chain
-from .match import Matches
+from .context import ConditionsCache, ensure_condition
+from .encoded import encoded_input
+from .match import Match, Matches
 from .pattern import Pattern, RePattern
 from .processors import ConflictSolver, PrivateRemover
 from .rules import CustomRule, Rules
-from .utils import extend_safe
+from .utils import casefold_scope, extend_safe
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable
+    from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+    from concurrent.futures import Executor
 
     from typing_extensions import Self
 
+    from .encoded import Buffer, EncodedInput
     from .key import Key
 
 log = getLogger(__name__).log
@@ -50,6 +58,64 @@ def _producible_names(pattern: Pattern) -> set[str]:
     return names
 
 
+def _read_chunks(stream: IO[str] | Iterable[str], chunk_size: int) -> Iterator[str]:
+    """
+    Read strings from a file-like object or an iterable of strings.
+    :param stream:
+    :param chunk_size:
+    :return:
+    """
+    if hasattr(stream, "read"):
+        while chunk := stream.read(chunk_size):
+            yield chunk
+    else:
+        yield from stream
+
+
+def _match_tree(match: Match) -> Iterator[Match]:
+    yield match
+    for child in match.children:
+        yield from _match_tree(child)
+
+
+def _relocate_match(match: Match, input_string: str, offset: int) -> None:
+    """
+    Move a match and its children found in a part of the input, starting at offset, to their position in the whole
+    input. They keep their own text only.
+    :param match:
+    :param input_string: part of the input
+    :param offset:
+    :return:
+    """
+    tree = list(_match_tree(match))
+    start = min(node.raw_start for node in tree)
+    text = input_string[start : max(node.raw_end for node in tree)]
+    for node in tree:
+        node.start += offset
+        node.end += offset
+        if node._raw_start is not None:
+            node._raw_start += offset
+        if node._raw_end is not None:
+            node._raw_end += offset
+        node.input_string = text
+        node.input_offset = offset + start
+        node.children.input_string = None
+
+
+async def _aiter(strings: AsyncIterable[str] | Iterable[str]) -> AsyncIterator[str]:
+    """
+    Iterate a sync or async iterable asynchronously.
+    :param strings:
+    :return:
+    """
+    if isinstance(strings, AsyncIterable):
+        async for string in strings:
+            yield string
+    else:
+        for string in strings:
+            yield string
+
+
 class Rebulk(Builder):
     r"""
     Regular expression, string and function based patterns are declared in a ``Rebulk`` object. It use a fluent API to
@@ -79,29 +145,38 @@ class Rebulk(Builder):
 
     def __init__(
         self,
-        disabled: bool | Callable[[dict[str, Any] | None], bool] = lambda context: False,
+        disabled: bool | Callable[[dict[str, Any] | None], bool] = False,
         default_rules: bool = True,
+        rules_executor: Executor | None = None,
     ) -> None:
         """
         Creates a new Rebulk object.
-        :param disabled: if True, this pattern is disabled. Can also be a function(context).
+        :param disabled: if True, this pattern is disabled. Can also be a function(context), or a ContextCondition
+        which is evaluated once for each distinct context value.
         :type disabled: bool|function
         :param default_rules: use default rules
         :type default_rules:
+        :param rules_executor: executor evaluating concurrently when conditions of independent rules, see
+        Rules.execute_all_rules.
+        :type rules_executor: concurrent.futures.Executor
         :return:
         :rtype:
         """
         super().__init__()
-        self.disabled: Callable[[dict[str, Any] | None], bool]
-        if not callable(disabled):
-            self.disabled = lambda context: disabled
-        else:
-            self.disabled = disabled
+        self.disabled = ensure_condition(disabled)
         self._patterns: list[Pattern] = []
         self._rules = Rules()
         if default_rules:
             self.rules(ConflictSolver, PrivateRemover)
         self._rebulks: list[Rebulk] = []
+        self.rules_executor = rules_executor
+        # (enabled children) -> (rules versions, effective rules), see _execute_rules.
+        self._effective_rules_cache: dict[tuple[bool, ...], tuple[tuple[int, ...], Rules]] = {}
+        # Disabled conditions of children, and (enabled children) -> disabled conditions of effective patterns, see
+        # _enabled_children and _effective_patterns_conditions.
+        self._children_conditions: ConditionsCache | None = None
+        self._patterns_conditions: dict[tuple[bool, ...], ConditionsCache] = {}
+        self._skipped_rules: Counter[CustomRule] = Counter()
 
     def pattern(self, *pattern: Pattern) -> Self:
         """
@@ -135,24 +210,134 @@ class Rebulk(Builder):
         self._rebulks.extend(rebulks)
         return self
 
-    def matches(self, string: str, context: dict[str, Any] | None = None) -> Matches:
+    def matches(
+        self,
+        string: str | Buffer | EncodedInput,
+        context: dict[str, Any] | None = None,
+        encoding: str | None = None,
+    ) -> Matches:
         """
         Search for all matches with current configuration against input_string
+        :param string: string to search into. It can also be a bytes-like object, like a memory-mapped file, which is
+        searched without decoding it: string and regex patterns are encoded, match positions are byte offsets, and
+        only raw values of matches are decoded.
+        :type string: str|bytes|mmap.mmap|EncodedInput
+        :param context: context to use
+        :type context: dict
+        :param encoding: encoding of a bytes-like string. If None, the encoding of EncodedInput or utf-8 is used.
+        :type encoding: str
+        :return: A custom list of matches
+        :rtype: Matches
+        """
+        matches, context = self._new_matches(string, context, encoding)
+        with casefold_scope():
+            for _ in self._matches_steps(matches, context):
+                pass
+        return matches
+
+    async def amatches(
+        self,
+        string: str | Buffer | EncodedInput,
+        context: dict[str, Any] | None = None,
+        encoding: str | None = None,
+        executor: Executor | None = None,
+    ) -> Matches:
+        """
+        Search for all matches like ``matches``, without blocking the event loop.
+
+        By default, control is given back to the event loop after each pattern and each group of rules. If an
+        executor is given, the whole search runs in this executor instead.
         :param string: string to search into
-        :type string: str
+        :type string: str|bytes|mmap.mmap|EncodedInput
         :param context: context to use
         :type context: dict
+        :param encoding: encoding of a bytes-like string.
+        :type encoding: str
+        :param executor: executor to run the search in.
+        :type executor: concurrent.futures.Executor
         :return: A custom list of matches
         :rtype: Matches
         """
-        matches = Matches(input_string=string)
-        if context is None:
-            context = {}
+        if executor is not None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, functools.partial(self.matches, string, context, encoding))
+        matches, context = self._new_matches(string, context, encoding)
+        with casefold_scope():
+            for _ in self._matches_steps(matches, context):
+                await asyncio.sleep(0)
+        return matches
+
+    async def amatches_many(
+        self,
+        strings: AsyncIterable[str] | Iterable[str],
+        context: dict[str, Any] | None = None,
+        encoding: str | None = None,
+        executor: Executor | None = None,
+        max_pending: int = 1,
+    ) -> AsyncIterator[Matches]:
+        """
+        Search for all matches in each string of a sync or async iterable, with ``amatches``.
+
+        Strings are read only when the consumer asks for results, and at most ``max_pending`` of them are searched at
+        once, so that a slow consumer slows down reading. Results are yielded in input order.
+        :param strings: strings to search into
+        :type strings: AsyncIterable[str]|Iterable[str]
+        :param context: context to use
+        :type context: dict
+        :param encoding: encoding of bytes-like strings.
+        :type encoding: str
+        :param executor: executor to run each search in. With max_pending > 1, searches run concurrently in it.
+        :type executor: concurrent.futures.Executor
+        :param max_pending: maximum number of strings searched at once.
+        :type max_pending: int
+        :return: matches of each string
+        :rtype: AsyncIterator[Matches]
+        """
+        if max_pending < 1:
+            raise ValueError("max_pending must be positive.")
+        pending: deque[asyncio.Future[Matches]] = deque()
+        try:
+            async for string in _aiter(strings):
+                pending.append(asyncio.ensure_future(self.amatches(string, context, encoding, executor)))
+                if len(pending) >= max_pending:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _new_matches(
+        self,
+        string: str | Buffer | EncodedInput,
+        context: dict[str, Any] | None,
+        encoding: str | None,
+    ) -> tuple[Matches, dict[str, Any]]:
+        """
+        Create the matches list to fill for an input.
+        :param string:
+        :param context:
+        :param encoding:
+        :return: matches and context
+        """
+        # Bytes-like input goes through the same code, only patterns and Match.raw check its encoding.
+        string = cast("str", encoded_input(string, encoding))
+        return Matches(input_string=string), {} if context is None else context
 
+    def _matches_steps(self, matches: Matches, context: dict[str, Any]) -> Iterator[None]:
+        """
+        Search for all matches, yielding after each pattern and each group of rules so that amatches can give
+        control back to the event loop.
+        :param matches:
+        :type matches: Matches
+        :param context:
+        :type context: dict
+        :return:
+        """
         if not self.disabled(context):
             matches.declared_keys = self.effective_keys(context)
 
-        self._matches_patterns(matches, context)
+        yield from self._matches_patterns(matches, context)
 
         # Validate formatter output against declared Key.value_type *before* rules
         # run: the contract is about the value a pattern's formatter produced, not
@@ -160,9 +345,95 @@ class Rebulk(Builder):
         if debug.CHECK_DECLARED_KEYS:
             matches.check_declared_keys()
 
-        self._execute_rules(matches, context)
+        yield from self._execute_rules(matches, context)
 
-        return matches
+    def stream_matches(
+        self,
+        stream: IO[str] | Iterable[str],
+        context: dict[str, Any] | None = None,
+        chunk_size: int = 65536,
+        overlap: int = 1024,
+    ) -> Iterator[Match]:
+        """
+        Search for all matches in a text stream too large to be searched at once, like a log file.
+
+        The stream is read in chunks, and each chunk is searched in a window with the ``2 * overlap`` characters
+        preceding it. Matches ending at least ``overlap`` characters before the window end can't be affected by
+        later text: they are yielded with offsets in the whole input, window after window. ``overlap`` must be
+        larger than the length of matches, including the text that patterns and rules check around them, or
+        results may differ from ``matches`` near window bounds.
+
+        Yielded matches hold their own text only, in ``input_string`` at ``input_offset``, so that memory usage is
+        bounded by the window size.
+        :param stream: file-like object in text mode, or iterable of strings.
+        :type stream: io.TextIOBase|Iterable[str]
+        :param context: context to use
+        :type context: dict
+        :param chunk_size: number of characters read for each window.
+        :type chunk_size: int
+        :param overlap: number of characters needed around matches to find them.
+        :type overlap: int
+        :return: matches
+        :rtype: Iterator[Match]
+        """
+        if chunk_size <= 0 or overlap < 0:
+            raise ValueError("chunk_size must be positive and overlap must not be negative.")
+        if context is None:
+            context = {}
+
+        window, window_start, decided = "", 0, -1
+        chunks: list[str] = []
+        size = 0
+        for chunk in _read_chunks(stream, chunk_size):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size < chunk_size:
+                continue
+            window += "".join(chunks)
+            chunks, size = [], 0
+            boundary = window_start + len(window) - overlap
+            yield from self._window_matches(window, window_start, decided, boundary, context)
+            decided = max(decided, boundary)
+            kept = max(decided - overlap - window_start, 0)
+            window, window_start = window[kept:], window_start + kept
+        window += "".join(chunks)
+        yield from self._window_matches(window, window_start, decided, None, context)
+
+    def _window_matches(
+        self, window: str, window_start: int, decided: int, boundary: int | None, context: dict[str, Any]
+    ) -> list[Match]:
+        """
+        Matches of a window of the input, ending after decided and up to boundary, moved to their position in the
+        whole input.
+        :param window:
+        :param window_start: position of the window in the whole input.
+        :param decided: end of matches already yielded.
+        :param boundary: end of matches that can't be affected by later text, or None at the end of input.
+        :param context:
+        :return:
+        """
+        window_matches = [
+            match
+            for match in self.matches(window, context)
+            if decided < window_start + match.end and (boundary is None or window_start + match.end <= boundary)
+        ]
+        relocated: set[int] = set()
+        for match in window_matches:
+            initiator = match.initiator
+            if id(initiator) not in relocated:
+                relocated.add(id(initiator))
+                _relocate_match(initiator, window, window_start)
+        return window_matches
+
+    @property
+    def skipped_rules(self) -> Counter[CustomRule]:
+        """
+        Number of executions skipped for each rule by matches() calls, as matches didn't contain its
+        ``trigger_names`` or ``trigger_tags``.
+        :return:
+        :rtype: Counter
+        """
+        return self._skipped_rules
 
     def effective_rules(self, context: dict[str, Any] | None = None) -> Rules:
         """
@@ -174,8 +445,8 @@ class Rebulk(Builder):
         """
         rules = Rules()
         rules.extend(self._rules)
-        for rebulk in self._rebulks:
-            if not rebulk.disabled(context):
+        for rebulk, enabled in zip(self._rebulks, self._enabled_children(context), strict=True):
+            if enabled:
                 extend_safe(rules, rebulk._rules)
         return rules
 
@@ -191,8 +462,8 @@ class Rebulk(Builder):
         :rtype:
         """
         keys: dict[str, Key[Any]] = dict(self._keys)
-        for rebulk in self._rebulks:
-            if not rebulk.disabled(context):
+        for rebulk, enabled in zip(self._rebulks, self._enabled_children(context), strict=True):
+            if enabled:
                 for name, key in rebulk._keys.items():
                     keys.setdefault(name, key)
         return keys
@@ -235,9 +506,9 @@ class Rebulk(Builder):
         allowed = {allowed_unused} if isinstance(allowed_unused, str) else set(allowed_unused)
         return sorted(name for name in declared if name not in produced and name not in allowed)
 
-    def _execute_rules(self, matches: Matches, context: dict[str, Any]) -> None:
+    def _execute_rules(self, matches: Matches, context: dict[str, Any]) -> Iterator[None]:
         """
-        Execute rules for this rebulk and children.
+        Execute rules for this rebulk and children, yielding after each group of rules.
         :param matches:
         :type matches:
         :param context:
@@ -246,8 +517,16 @@ class Rebulk(Builder):
         :rtype:
         """
         if not self.disabled(context):
-            rules = self.effective_rules(context)
-            rules.execute_all_rules(matches, context)
+            # Effective rules are reused while rules of this rebulk object and its children are unchanged, so that
+            # their execution schedule is computed once.
+            enabled = self._enabled_children(context)
+            versions = (self._rules.version, *(rebulk._rules.version for rebulk in self._rebulks))
+            cached = self._effective_rules_cache.get(enabled)
+            if cached is None or cached[0] != versions:
+                cached = versions, self.effective_rules(context)
+                cached[1].skipped = self._skipped_rules
+                self._effective_rules_cache[enabled] = cached
+            yield from cached[1].execute_all_rules_steps([], matches, context, self.rules_executor)
 
     def effective_patterns(self, context: dict[str, Any] | None = None) -> list[Pattern]:
         """
@@ -258,14 +537,49 @@ class Rebulk(Builder):
         :rtype:
         """
         patterns = list(self._patterns)
-        for rebulk in self._rebulks:
-            if not rebulk.disabled(context):
+        for rebulk, enabled in zip(self._rebulks, self._enabled_children(context), strict=True):
+            if enabled:
                 extend_safe(patterns, rebulk._patterns)
         return patterns
 
-    def _matches_patterns(self, matches: Matches, context: dict[str, Any]) -> None:
+    def _enabled_children(self, context: dict[str, Any] | None) -> tuple[bool, ...]:
+        """
+        Check which children rebulk objects are enabled.
+        :param context:
+        :type context:
+        :return:
+        :rtype:
+        """
+        conditions = [rebulk.disabled for rebulk in self._rebulks]
+        if self._children_conditions is None or self._children_conditions.conditions != conditions:
+            self._children_conditions = ConditionsCache(conditions)
+        return tuple(not disabled for disabled in self._children_conditions(context))
+
+    def _effective_patterns_conditions(self, context: dict[str, Any] | None) -> tuple[list[Pattern], ConditionsCache]:
+        """
+        Get effective patterns for this rebulk object and its children, with their disabled conditions.
+
+        Conditions are reused while disabled conditions of patterns are the same objects, so that declarative
+        conditions are evaluated once for each distinct context value.
+        :param context:
+        :type context:
+        :return:
+        :rtype:
+        """
+        enabled = self._enabled_children(context)
+        patterns = list(self._patterns)
+        for rebulk, rebulk_enabled in zip(self._rebulks, enabled, strict=True):
+            if rebulk_enabled:
+                extend_safe(patterns, rebulk._patterns)
+        conditions = [pattern.disabled for pattern in patterns]
+        cached = self._patterns_conditions.get(enabled)
+        if cached is None or cached.conditions != conditions:
+            cached = self._patterns_conditions[enabled] = ConditionsCache(conditions)
+        return patterns, cached
+
+    def _matches_patterns(self, matches: Matches, context: dict[str, Any]) -> Iterator[None]:
         """
-        Search for all matches with current paterns agains input_string
+        Search for all matches with current paterns agains input_string, yielding after each pattern
         :param matches: matches list
         :type matches: Matches
         :param context: context to use
@@ -274,9 +588,9 @@ class Rebulk(Builder):
         :rtype:
         """
         if not self.disabled(context):
-            patterns = self.effective_patterns(context)
-            for pattern in patterns:
-                if not pattern.disabled(context):
+            patterns, conditions = self._effective_patterns_conditions(context)
+            for pattern, disabled in zip(patterns, conditions(context), strict=True):
+                if not disabled:
                     pattern_matches = pattern.matches(cast("str", matches.input_string), context)
                     if pattern_matches:
                         log(pattern.log_level, "Pattern has %s match(es). (%s)", len(pattern_matches), pattern)
@@ -287,5 +601,6 @@ class Rebulk(Builder):
                         else:
                             log(pattern.log_level, "Match found. (%s)", match)
                             matches.append(match)
+                    yield
                 else:
                     log(pattern.log_level, "Pattern is disabled. (%s)", pattern)
@@ -5,15 +5,248 @@ Uniform re module
 
 from __future__ import annotations
 
+import functools
+import json
 import logging
 import os
 import re as _stdlib_re
-from typing import Any
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["REGEX_ENABLED", "re"]
+from .loose import call
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+__all__ = [
+    "BACKENDS",
+    "REGEX_ENABLED",
+    "RegexProfile",
+    "backend_of",
+    "is_regex_module",
+    "load_backend",
+    "re",
+    "regex_backend",
+]
 
 log = logging.getLogger(__name__).log
 
+# Names of supported regular expression backends: ``re`` from standard library, and third-party ``regex`` module.
+BACKENDS = ("re", "regex")
+
+# Flags having the same meaning and value in ``re`` and ``regex`` modules.
+PORTABLE_FLAGS = (
+    _stdlib_re.IGNORECASE
+    | _stdlib_re.LOCALE
+    | _stdlib_re.MULTILINE
+    | _stdlib_re.DOTALL
+    | _stdlib_re.UNICODE
+    | _stdlib_re.VERBOSE
+    | _stdlib_re.ASCII
+)
+
+
+# Maximum number of compiled regular expressions shared by all patterns, see compile_regex.
+REGEX_CACHE_SIZE = 4096
+
+
+@functools.cache
+def load_backend(name: str) -> Any:
+    """
+    Import a regular expression backend module.
+
+    :param name: backend name, from BACKENDS.
+    :return: the backend module, or None if it's not available.
+    """
+    if name == "re":
+        return _stdlib_re
+    if name == "regex":
+        try:
+            import regex as _regex
+        except ImportError:
+            return None
+        return _regex
+    raise ValueError(f"Unknown regex backend: {name!r}. Available backends are {BACKENDS}.")
+
+
+@functools.cache
+def _warn_unavailable(name: str) -> None:
+    log(logging.WARNING, "%s module is not available. Standard library re module is used instead.", name)
+
+
+def regex_backend(backend: str | RegexProfile | None = None, source: str | None = None) -> Any:
+    """
+    Get the regular expression module to use.
+
+    :param backend: backend name, from BACKENDS, or a RegexProfile giving the backend of each pattern source. If None,
+    the module selected by REBULK_REGEX_ENABLED environment variable is used.
+    :param source: pattern source, used to get the backend from a RegexProfile.
+    :return: the backend module. Standard library re module is used when backend is not available.
+    """
+    if isinstance(backend, RegexProfile):
+        backend = backend.backend(source)
+    if backend is None:
+        return re
+    module = load_backend(backend)
+    if module is None:
+        _warn_unavailable(backend)
+        return _stdlib_re
+    return module
+
+
+def backend_of(compiled: Any) -> Any:
+    """
+    Get the regular expression module of a compiled pattern.
+
+    :param compiled:
+    :return:
+    """
+    if isinstance(compiled, _stdlib_re.Pattern):
+        return _stdlib_re
+    regex_module = load_backend("regex")
+    if regex_module is not None and isinstance(compiled, regex_module.Pattern):
+        return regex_module
+    return re
+
+
+def is_regex_module(module: Any) -> bool:
+    """
+    Check if given regular expression module is the third-party regex module.
+
+    :param module:
+    :return:
+    """
+    return getattr(module, "__name__", None) == "regex"
+
+
+@functools.lru_cache(maxsize=REGEX_CACHE_SIZE)
+def _compile_cached(module: Any, source: str | bytes, flags: int) -> Any:
+    return module.compile(source, flags)
+
+
+def compile_regex(module: Any, pattern: Any, flags: int = 0, **kwargs: Any) -> Any:
+    """
+    Compile a regular expression with given backend module.
+
+    Compiled expressions are shared by all patterns in a cache keyed by (backend, source, flags), as the own cache of
+    re module is small and gets thrashed by large rule sets. Other keyword arguments are ignored, unless the
+    expression uses named lists of regex module, which are compiled without cache.
+
+    :param module: backend module.
+    :param pattern: source of the expression.
+    :param flags:
+    :param kwargs:
+    :return: the compiled expression
+    """
+    if not isinstance(pattern, (str, bytes)) or (is_regex_module(module) and _has_named_list(pattern)):
+        return call(module.compile, pattern, flags=flags, **kwargs)
+    return _compile_cached(module, pattern, flags)
+
+
+def _has_named_list(pattern: str | bytes) -> bool:
+    if isinstance(pattern, str):
+        return r"\L<" in pattern
+    return rb"\L<" in pattern
+
+
+def regex_cache_info() -> Any:
+    """
+    Statistics of the compiled expressions cache, with hits, misses, maxsize and currsize attributes.
+
+    :return:
+    """
+    return _compile_cached.cache_info()
+
+
+def clear_regex_cache() -> None:
+    """
+    Clear the compiled expressions cache.
+
+    :return:
+    """
+    _compile_cached.cache_clear()
+
+
+@dataclass(frozen=True, repr=False)
+class RegexProfile:
+    """
+    Regular expression backend to use for each pattern source, as recorded by
+    :func:`rebulk.calibration.calibrate_regex_backends`.
+
+    It can be given as ``backend`` option of regex patterns, for instance with ``Rebulk.regex_defaults``. A profile
+    can't be changed once built, so it can be used as a dict key.
+
+    ``backends`` is a mapping (pattern source, backend name). ``default`` is the backend name for pattern sources
+    missing from the profile. If None, the module selected by REBULK_REGEX_ENABLED environment variable is used.
+    """
+
+    backends: Mapping[str, str] = field(default_factory=dict)
+    default: str | None = None
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "backends", MappingProxyType(dict(self.backends or {})))
+
+    def backend(self, source: str | None) -> str | None:
+        """
+        Get the backend name to use for a pattern source.
+
+        :param source:
+        :return:
+        """
+        if source is None:
+            return self.default
+        return self.backends.get(source, self.default)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Serializable representation of this profile.
+
+        :return:
+        """
+        return {"default": self.default, "backends": dict(self.backends)}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> RegexProfile:
+        """
+        Build a profile from its serializable representation.
+
+        :param data:
+        :return:
+        """
+        return cls(data.get("backends"), default=data.get("default"))
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """
+        Write this profile to a JSON file.
+
+        :param path:
+        :return:
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=2, sort_keys=True)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> RegexProfile:
+        """
+        Read a profile from a JSON file.
+
+        :param path:
+        :return:
+        """
+        with open(path, encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
+
+    def __hash__(self) -> int:
+        return hash((frozenset(self.backends.items()), self.default))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return RegexProfile, (dict(self.backends), self.default)
+
+    def __repr__(self) -> str:
+        return f"<RegexProfile:default={self.default}+backends={dict(self.backends)}>"
+
+
 # Default to the standard library `re`; switch to the third-party `regex` module
 # when REBULK_REGEX_ENABLED is set and `regex` is importable.
 re: Any = _stdlib_re
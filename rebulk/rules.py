@@ -7,18 +7,25 @@ from __future__ import annotations
 
 import inspect
 from abc import ABCMeta, abstractmethod
-from itertools import groupby
+from collections import Counter
+from functools import partial
+from itertools import groupby, islice
 from logging import getLogger
-from typing import TYPE_CHECKING, Any, ClassVar, cast
+from typing import TYPE_CHECKING, Any, ClassVar, SupportsIndex, cast
 
 from . import debug
+from .context import ConditionsCache, ContextCondition, ensure_condition
+from .match import Match
 from .toposort import toposort
 from .utils import is_iterable
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterable, Iterator
+    from concurrent.futures import Executor
     from types import ModuleType
 
+    from typing_extensions import Self
+
     from .match import Matches
 
 log = getLogger(__name__).log
@@ -73,6 +80,13 @@ class CustomRule(Condition, Consequence, metaclass=ABCMeta):
     name: ClassVar[str | None] = None
     dependency: ClassVar[Any] = None
     properties: ClassVar[dict[str, Any]] = {}
+    # Names and tags of matches read by the rule. If any is defined, the rule is skipped when no match has one of them.
+    trigger_names: ClassVar[Iterable[str] | None] = None
+    trigger_tags: ClassVar[Iterable[str] | None] = None
+    # If True, or if a ContextCondition that is True for the context, the rule is disabled. It's used by the default
+    # enabled implementation, and evaluated once for each distinct context value. It's underscored so that it doesn't
+    # collide with attributes or methods that subclasses may already define.
+    _disabled_by_default: ClassVar[bool | ContextCondition] = False
 
     def __init__(self, log_level: int | None = None) -> None:
         self.defined_at = debug.defined_at()
@@ -89,7 +103,25 @@ class CustomRule(Condition, Consequence, metaclass=ABCMeta):
         :return: True if rule is enabled, False if disabled
         :rtype: bool
         """
-        return True
+        disabled = self._disabled_by_default
+        return not (disabled(context) if callable(disabled) else disabled)
+
+    def triggered(self, matches: Matches) -> bool:
+        """
+        Check if matches contain any of trigger_names or trigger_tags of this rule.
+
+        :param matches:
+        :type matches: rebulk.match.Matches
+        :return: True if the rule should be executed, False if it can be skipped.
+        :rtype: bool
+        """
+        trigger_names, trigger_tags = self.trigger_names, self.trigger_tags
+        if trigger_names is None and trigger_tags is None:
+            return True
+        return matches.has_any(
+            (trigger_names,) if isinstance(trigger_names, str) else trigger_names or (),
+            (trigger_tags,) if isinstance(trigger_tags, str) else trigger_tags or (),
+        )
 
     def __lt__(self, other: CustomRule) -> bool:
         return self.priority > other.priority
@@ -113,22 +145,45 @@ class Rule(CustomRule):
     """
 
     consequence: ClassVar[Any] = None
+    # (consequence, is iterable, then methods) resolved on first use, see _resolve_consequence.
+    _resolved_consequence: tuple[Any, bool, list[Callable[..., Any]]] | None = None
+
+    def _resolve_consequence(self) -> tuple[Any, bool, list[Callable[..., Any]]]:
+        """
+        Resolve consequence once for this rule: then methods of consequences are kept, and built-in consequence
+        classes, which keep no state, are instantiated once. Other consequence classes may keep state on their
+        instance, so they are instantiated for each call.
+
+        It's resolved again if consequence is replaced.
+        :return: (consequence, is iterable, then methods)
+        :rtype: tuple
+        """
+        consequence = self.consequence
+        resolved = self._resolved_consequence
+        if resolved is None or resolved[0] is not consequence:
+            iterable = is_iterable(consequence)
+            thens: list[Callable[..., Any]] = []
+            for cons in consequence if iterable else [consequence]:
+                if not inspect.isclass(cons):
+                    thens.append(cons.then)
+                elif cons in _STATELESS_CONSEQUENCES:
+                    thens.append(cons().then)
+                else:
+                    thens.append(partial(_new_consequence_then, cons))
+            resolved = self._resolved_consequence = consequence, iterable, thens
+        return resolved
 
     def then(self, matches: Matches, when_response: Any, context: dict[str, Any] | None) -> Any:
         assert self.consequence
-        if is_iterable(self.consequence):
+        _, iterable, thens = self._resolve_consequence()
+        if iterable:
             if not is_iterable(when_response):
                 when_response = [when_response]
             iterator = iter(when_response)
-            for cons in self.consequence:
-                if inspect.isclass(cons):
-                    cons = cons()
-                cons.then(matches, next(iterator), context)
+            for then in thens:
+                then(matches, next(iterator), context)
         else:
-            cons = self.consequence
-            if inspect.isclass(cons):
-                cons = cons()
-            cons.then(matches, when_response, context)
+            thens[0](matches, when_response, context)
 
 
 class RemoveMatch(Consequence):
@@ -248,15 +303,94 @@ class RemoveTags(Consequence):
             self.append.then(matches, removed, context)
 
 
+# Built-in consequence classes, which keep no state on their instance.
+_STATELESS_CONSEQUENCES = frozenset((RemoveMatch, AppendMatch, RenameMatch, AppendTags, RemoveTags))
+
+
+def _new_consequence_then(
+    consequence: type[Consequence], matches: Matches, when_response: Any, context: dict[str, Any] | None
+) -> Any:
+    """
+    Apply a consequence class with a new instance of it.
+    """
+    return consequence().then(matches, when_response, context)
+
+
 class Rules(list[CustomRule]):
     """
     list of rules ready to execute.
+
+    The execution schedule of rules is computed on first execution, and kept until the list is modified.
     """
 
     def __init__(self, *rules: CustomRule | type[CustomRule] | ModuleType) -> None:
         super().__init__()
+        # Number of executions skipped for each rule, as matches didn't contain its triggers.
+        self.skipped: Counter[CustomRule] = Counter()
+        self._version = 0
+        self._schedule: list[tuple[int, list[CustomRule], int]] | None = None
+        self._conditions: ConditionsCache | None = None
+        self._conditions_disabled: list[bool | ContextCondition | None] = []
         self.load(*rules)
 
+    @property
+    def version(self) -> int:
+        """
+        Number of modifications of this list.
+        """
+        return self._version
+
+    def _invalidate(self) -> None:
+        self._version += 1
+        self._schedule = None
+        self._conditions = None
+
+    def append(self, rule: CustomRule) -> None:
+        super().append(rule)
+        self._invalidate()
+
+    def extend(self, rules: Iterable[CustomRule]) -> None:
+        super().extend(rules)
+        self._invalidate()
+
+    def insert(self, index: SupportsIndex, rule: CustomRule) -> None:
+        super().insert(index, rule)
+        self._invalidate()
+
+    def remove(self, rule: CustomRule) -> None:
+        super().remove(rule)
+        self._invalidate()
+
+    def pop(self, index: SupportsIndex = -1) -> CustomRule:
+        rule = super().pop(index)
+        self._invalidate()
+        return rule
+
+    def clear(self) -> None:
+        super().clear()
+        self._invalidate()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        super().sort(*args, **kwargs)
+        self._invalidate()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._invalidate()
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        super().__setitem__(index, value)
+        self._invalidate()
+
+    def __delitem__(self, index: SupportsIndex | slice) -> None:
+        super().__delitem__(index)
+        self._invalidate()
+
+    def __iadd__(self, rules: Iterable[CustomRule]) -> Self:  # type: ignore[override,misc]
+        super().__iadd__(rules)
+        self._invalidate()
+        return self
+
     def load(self, *rules: CustomRule | type[CustomRule] | ModuleType) -> None:
         """
         Load rules from a Rule module, class or instance
@@ -301,7 +435,55 @@ class Rules(list[CustomRule]):
         """
         self.append(class_())
 
-    def execute_all_rules(self, matches: Matches, context: dict[str, Any] | None) -> list[tuple[CustomRule, Any]]:
+    @property
+    def schedule(self) -> list[tuple[int, list[CustomRule], int]]:
+        """
+        Execution schedule of rules, as (priority, rules, log level) groups of independent rules.
+
+        Rules are grouped by priority, then by dependency graph toposort, and each group is sorted based on initial
+        ordering.
+        :return:
+        :rtype:
+        """
+        if self._schedule is None:
+            positions: dict[CustomRule, int] = {}
+            for position, rule in enumerate(self):
+                positions.setdefault(rule, position)
+            schedule: list[tuple[int, list[CustomRule], int]] = []
+            for priority, priority_rules in groupby(sorted(self), lambda rule: rule.priority):
+                for rules_group in toposort_rules(list(priority_rules)):
+                    sorted_group = sorted(rules_group, key=positions.__getitem__)
+                    schedule.append((priority, sorted_group, max(rule.log_level for rule in sorted_group)))
+            self._schedule = schedule
+        return self._schedule
+
+    @property
+    def _disabled_conditions(self) -> ConditionsCache:
+        """
+        Disabled conditions of rules, in schedule order.
+
+        Conditions of rules using the default enabled implementation are declarative, so they are evaluated once for
+        each distinct context value. Others have to call enabled for each context.
+        :return:
+        :rtype:
+        """
+        rules = [rule for _, rules_group, _ in self.schedule for rule in rules_group]
+        # _disabled_by_default attribute of rules using the default enabled implementation, so that reassigning it is
+        # seen.
+        disabled = [rule._disabled_by_default if type(rule).enabled is CustomRule.enabled else None for rule in rules]
+        if self._conditions is None or self._conditions_disabled != disabled:
+            self._conditions = ConditionsCache(
+                [
+                    partial(_rule_disabled, rule) if rule_disabled is None else ensure_condition(rule_disabled)
+                    for rule, rule_disabled in zip(rules, disabled, strict=True)
+                ]
+            )
+            self._conditions_disabled = disabled
+        return self._conditions
+
+    def execute_all_rules(
+        self, matches: Matches, context: dict[str, Any] | None, executor: Executor | None = None
+    ) -> list[tuple[CustomRule, Any]]:
         """
         Execute all rules from this rules list. All when condition with same priority will be performed before
         calling then actions.
@@ -310,52 +492,232 @@ class Rules(list[CustomRule]):
         :type matches:
         :param context:
         :type context:
+        :param executor: if defined, when conditions of each group of independent rules are evaluated concurrently
+        with this executor against matches as they are before the group, and then consequences are applied in rules
+        order. when conditions read a read-only snapshot of matches, and rules of a group must not give overlapping
+        matches to their consequences, or ConflictingRules is raised.
+        :type executor: concurrent.futures.Executor
         :return:
         :rtype:
         """
         ret: list[tuple[CustomRule, Any]] = []
-        for priority, priority_rules in groupby(sorted(self), lambda rule: rule.priority):
-            sorted_rules = toposort_rules(list(priority_rules))  # Group by dependency graph toposort
-            for rules_group in sorted_rules:
-                sorted_group = sorted(rules_group, key=self.index)  # Sort rules group based on initial ordering.
-                group_log_level: int | None = None
-                for rule in sorted_group:
-                    if group_log_level is None or group_log_level < rule.log_level:
-                        group_log_level = rule.log_level
-                log(cast("int", group_log_level), "%s independent rule(s) at priority %s.", len(sorted_group), priority)
-                for rule in sorted_group:
-                    when_response = execute_rule(rule, matches, context)
+        for _ in self.execute_all_rules_steps(ret, matches, context, executor):
+            pass
+        return ret
+
+    def execute_all_rules_steps(
+        self,
+        ret: list[tuple[CustomRule, Any]],
+        matches: Matches,
+        context: dict[str, Any] | None,
+        executor: Executor | None = None,
+    ) -> Iterator[None]:
+        """
+        Execute all rules like execute_all_rules, yielding after each group of independent rules.
+
+        :param ret: list to fill with (rule, when response) of triggered rules.
+        :type ret: list
+        :param matches:
+        :type matches:
+        :param context:
+        :type context:
+        :param executor:
+        :type executor: concurrent.futures.Executor
+        :return:
+        :rtype:
+        """
+        disabled = iter(self._disabled_conditions.cached(context))
+        for priority, rules_group, group_log_level in self.schedule:
+            log(group_log_level, "%s independent rule(s) at priority %s.", len(rules_group), priority)
+            enabled = [
+                None if rule_disabled is None else not rule_disabled
+                for rule_disabled in islice(disabled, len(rules_group))
+            ]
+            if executor is not None and len(rules_group) > 1:
+                ret.extend(self._execute_rules_group(rules_group, enabled, matches, context, executor))
+            else:
+                for rule, rule_enabled in zip(rules_group, enabled, strict=True):
+                    if not self._triggered(rule, matches):
+                        continue
+                    when_response = execute_rule(rule, matches, context, rule_enabled)
                     if when_response is not None:
                         ret.append((rule, when_response))
+            yield
 
-        return ret
+    def _triggered(self, rule: CustomRule, matches: Matches) -> bool:
+        """
+        Check if the rule is triggered by matches, and count it as skipped if it's not.
+        :param rule:
+        :param matches:
+        :return:
+        """
+        if rule.triggered(matches):
+            return True
+        log(rule.log_level, "Rule is skipped, as its triggers are absent: %s", rule)
+        self.skipped[rule] += 1
+        return False
+
+    def _execute_rules_group(
+        self,
+        rules: list[CustomRule],
+        enabled: list[bool | None],
+        matches: Matches,
+        context: dict[str, Any] | None,
+        executor: Executor,
+    ) -> list[tuple[CustomRule, Any]]:
+        """
+        Evaluate when conditions of independent rules concurrently, then apply their consequences in rules order.
+        :param rules:
+        :param enabled: cached enabled state of each rule, or None if it has to be checked.
+        :param matches:
+        :param context:
+        :param executor:
+        :return:
+        """
+        rules_enabled = [
+            (rule, rule_enabled)
+            for rule, rule_enabled in zip(rules, enabled, strict=True)
+            if self._triggered(rule, matches)
+        ]
+        rules = [rule for rule, _ in rules_enabled]
+        snapshot = matches.snapshot()
+        futures = [
+            executor.submit(check_rule, rule, snapshot, context, rule_enabled) for rule, rule_enabled in rules_enabled
+        ]
+        triggered: list[tuple[CustomRule, Any]] = []
+        for rule, future in zip(rules, futures, strict=True):
+            when_response = future.result()
+            if when_response:
+                triggered.append((rule, when_response))
+
+        conflicts = _conflicts(triggered)
+        if conflicts:
+            raise ConflictingRules(conflicts)
+
+        for rule, when_response in triggered:
+            log(rule.log_level, "Running rule consequence: %s %s", rule, when_response)
+            rule.then(matches, when_response, context)
+        return triggered
 
 
-def execute_rule(rule: CustomRule, matches: Matches, context: dict[str, Any] | None) -> Any:
+class ConflictingRules(ValueError):
     """
-    Execute the given rule.
+    Raised when independent rules evaluated concurrently give overlapping matches to their consequences.
+    """
+
+    def __init__(self, conflicts: list[tuple[CustomRule, Match, CustomRule, Match]]) -> None:
+        """
+        :param conflicts: (rule, match, other rule, other match) for each pair of overlapping matches.
+        :type conflicts: list[tuple]
+        """
+        super().__init__(
+            "Rules give overlapping matches to their consequences: "
+            + ", ".join(
+                f"{match} ({rule}) and {other_match} ({other})" for rule, match, other, other_match in conflicts
+            )
+        )
+        self.conflicts = conflicts
+
+
+def _conflicts(triggered: list[tuple[CustomRule, Any]]) -> list[tuple[CustomRule, Match, CustomRule, Match]]:
+    """
+    Find matches of when responses from distinct rules that overlap, or have the same span.
+    :param triggered: (rule, when response) of triggered rules, in rules order.
+    :return: (rule, match, other rule, other match) for each pair of overlapping matches.
+    """
+    responses = sorted(
+        (
+            (match, index, rule)
+            for index, (rule, when_response) in enumerate(triggered)
+            for match in _response_matches(when_response)
+        ),
+        key=lambda response: (response[0].start, response[1]),
+    )
+    conflicts: list[tuple[CustomRule, Match, CustomRule, Match]] = []
+    # responses starting before the current one, that may still overlap it or the next ones.
+    active: list[tuple[Match, int, CustomRule]] = []
+    for match, index, rule in responses:
+        active = [other for other in active if other[0].end > match.start or other[0].start == match.start]
+        for other_match, other_index, other_rule in active:
+            if other_index != index and (
+                other_match.span == match.span or (other_match.start < match.end and match.start < other_match.end)
+            ):
+                if other_index < index:
+                    conflicts.append((other_rule, other_match, rule, match))
+                else:
+                    conflicts.append((rule, match, other_rule, other_match))
+        active.append((match, index, rule))
+    return conflicts
+
+
+def _rule_disabled(rule: CustomRule, context: dict[str, Any] | None) -> bool:
+    return not rule.enabled(context)
+
+
+def _response_matches(when_response: Any) -> Iterator[Match]:
+    """
+    Matches contained in a when response, with nested iterables.
+    :param when_response:
+    :return:
+    """
+    if isinstance(when_response, Match):
+        yield when_response
+    elif is_iterable(when_response) and not isinstance(when_response, (str, bytes, dict)):
+        for item in when_response:
+            yield from _response_matches(item)
+
+
+def check_rule(rule: CustomRule, matches: Matches, context: dict[str, Any] | None, enabled: bool | None = None) -> Any:
+    """
+    Evaluate the condition of the given rule.
     :param rule:
     :type rule:
     :param matches:
     :type matches:
     :param context:
     :type context:
-    :return:
+    :param enabled: enabled state of the rule, if already known. rule.enabled is called if None.
+    :type enabled: bool
+    :return: when response if the rule is enabled and triggered, None otherwise.
     :rtype:
     """
-    if rule.enabled(context):
+    if enabled is None:
+        enabled = rule.enabled(context)
+    if enabled:
         log(rule.log_level, "Checking rule condition: %s", rule)
         when_response = rule.when(matches, context)
         if when_response:
             log(rule.log_level, "Rule was triggered: %s", when_response)
-            log(rule.log_level, "Running rule consequence: %s %s", rule, when_response)
-            rule.then(matches, when_response, context)
             return when_response
     else:
         log(rule.log_level, "Rule is disabled: %s", rule)
     return None
 
 
+def execute_rule(
+    rule: CustomRule, matches: Matches, context: dict[str, Any] | None, enabled: bool | None = None
+) -> Any:
+    """
+    Execute the given rule.
+    :param rule:
+    :type rule:
+    :param matches:
+    :type matches:
+    :param context:
+    :type context:
+    :param enabled: enabled state of the rule, if already known. rule.enabled is called if None.
+    :type enabled: bool
+    :return:
+    :rtype:
+    """
+    when_response = check_rule(rule, matches, context, enabled)
+    if when_response:
+        log(rule.log_level, "Running rule consequence: %s %s", rule, when_response)
+        rule.then(matches, when_response, context)
+        return when_response
+    return None
+
+
 def toposort_rules(rules: list[CustomRule]) -> Iterator[set[CustomRule]]:
     """
     Sort given rules using toposort with dependency parameter.
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+
+from __future__ import annotations
+
+import copy
+import pickle
+import re
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from .. import remodule
+from ..calibration import calibrate_regex_backends
+from ..pattern import RePattern
+from ..rebulk import Rebulk
+from ..remodule import RegexProfile
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+class _InstantPattern:
+    def __init__(self, pattern: str, flags: int) -> None:
+        self.pattern = pattern
+        self.flags = flags
+
+    def finditer(self, *args: Any) -> Iterator[Any]:
+        return iter(())
+
+
+class FastBackend:
+    """
+    Fake regex backend compiling like re module, or compiling patterns that find nothing instantly.
+    """
+
+    __name__ = "fast"
+    Pattern = re.Pattern
+    error = re.error
+
+    def __init__(self) -> None:
+        self.compiled: list[str] = []
+        self.instant = False
+
+    def compile(self, pattern: str, flags: int = 0) -> Any:
+        self.compiled.append(pattern)
+        if self.instant:
+            return _InstantPattern(pattern, flags)
+        return re.compile(pattern, flags)
+
+
+@pytest.fixture
+def fast_backend(monkeypatch: pytest.MonkeyPatch) -> FastBackend:
+    backend = FastBackend()
+    real_load_backend = remodule.load_backend
+
+    def load_backend(name: str) -> Any:
+        return backend if name == "regex" else real_load_backend(name)
+
+    monkeypatch.setattr(remodule, "load_backend", load_backend)
+    monkeypatch.setattr("rebulk.calibration.load_backend", load_backend)
+    return backend
+
+
+def test_backend_option() -> None:
+    pattern = RePattern(r"\d+", backend="re")
+    assert [m.value for m in pattern.matches("a12b3")] == ["12", "3"]
+    assert not pattern.repeated_captures
+
+    with pytest.raises(ValueError, match="Unknown regex backend"):
+        RePattern(r"\d+", backend="unknown")
+
+
+def test_backend_option_per_source(fast_backend: FastBackend) -> None:
+    profile = RegexProfile({r"\d+": "regex"}, default="re")
+    bulk = Rebulk().regex_defaults(backend=profile).regex(r"\d+").regex(r"[a-z]+")
+
+    assert [m.value for m in bulk.matches("a12b3")] == ["12", "3", "a", "b"]
+    assert fast_backend.compiled == [r"\d+"]
+
+
+def test_calibrate(fast_backend: FastBackend) -> None:
+    bulk = Rebulk().regex(r"\d+", r"[a-z]+")
+    bulk.chain().regex(r"(?P<season>\d+)x").regex(r"(?P<episode>\d+)")
+
+    fast_backend.instant = True
+    profile = calibrate_regex_backends([bulk], ["abc 123 1x02 " * 1000], repeat=1)
+    assert profile.backends == {
+        r"\d+": "regex",
+        r"[a-z]+": "regex",
+        r"(?P<season>\d+)x": "regex",
+        r"(?P<episode>\d+)": "regex",
+    }
+
+    updated = calibrate_regex_backends([bulk], ["abc 123 1x02"], backends=("re",), profile=profile)
+    assert set(updated.backends.values()) == {"re"}
+    # the given profile is left unchanged.
+    assert set(profile.backends.values()) == {"regex"}
+
+
+def test_calibrate_without_regex_module(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("rebulk.calibration.load_backend", lambda name: None if name == "regex" else re)
+
+    profile = calibrate_regex_backends([RePattern(r"\d+")], ["123"])
+    assert profile.backends == {r"\d+": "re"}
+
+
+def test_profile_save_load(tmp_path: Path) -> None:
+    profile = RegexProfile({r"\d+": "regex", r"[a-z]+": "re"}, default="re")
+    profile.save(tmp_path / "profile.json")
+
+    loaded = RegexProfile.load(tmp_path / "profile.json")
+    assert loaded == profile
+    assert loaded.backend(r"\d+") == "regex"
+    assert loaded.backend(r"\w+") == "re"
+
+
+def test_profile_hash() -> None:
+    profile = RegexProfile({r"\d+": "regex", r"[a-z]+": "re"}, default="re")
+    same = RegexProfile({r"[a-z]+": "re", r"\d+": "regex"}, default="re")
+
+    assert hash(profile) == hash(same)
+    assert {profile: 1}[same] == 1
+    assert profile != RegexProfile({r"\d+": "regex"}, default="re")
+
+    backends = {r"\d+": "regex"}
+    profile = RegexProfile(backends)
+    backends[r"\d+"] = "re"
+    assert profile.backend(r"\d+") == "regex"
+    with pytest.raises(TypeError):
+        profile.backends[r"\d+"] = "re"  # type: ignore[index]
+    with pytest.raises(AttributeError):
+        profile.default = "re"  # type: ignore[misc]
+    assert copy.deepcopy(profile) == pickle.loads(pickle.dumps(profile)) == profile
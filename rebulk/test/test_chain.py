@@ -2,18 +2,24 @@
 from __future__ import annotations
 
 import re
+import sys
 from functools import partial
-from typing import TYPE_CHECKING, Any
+from typing import Any
 
-from rebulk.pattern import FunctionalPattern, RePattern, StringPattern
+import pytest
+
+from rebulk.pattern import FunctionalPattern, Pattern, RePattern, StringPattern
 
 from ..chain import Chain
-from ..match import Match
+from ..match import Match, Matches
 from ..rebulk import Rebulk
+from ..remodule import REGEX_ENABLED
 from ..validators import chars_surround
 
-if TYPE_CHECKING:
-    from ..match import Matches
+# Fused chain regexes use atomic groups, which standard library re supports from python 3.11 only.
+requires_fusion = pytest.mark.skipif(
+    sys.version_info < (3, 11) and not REGEX_ENABLED, reason="atomic groups are not supported by re module"
+)
 
 
 def test_chain_close() -> None:
@@ -523,3 +529,273 @@ def test_nested_chain() -> None:
 
     assert [m.value for m in matches.named("a")] == ["a"]
     assert [m.value for m in matches.named("b")] == ["b"]
+
+
+def test_chain_parts_match_without_slicing(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Regex and string parts search the whole input from the chain offset, so no slice has to be moved back.
+    fixed_offsets: list[int] = []
+    fix_matches_offset = Chain._fix_matches_offset
+
+    def tracking_fix_matches_offset(matches: Any, input_string: str, offset: int) -> None:
+        fixed_offsets.append(offset)
+        fix_matches_offset(matches, input_string, offset)
+
+    monkeypatch.setattr(Chain, "_fix_matches_offset", staticmethod(tracking_fix_matches_offset))
+
+    rebulk = Rebulk()
+    rebulk.chain(children=True).regex(r"S(?P<season>\d+)").string("E", private=True).regex(r"(?P<episode>\d+)")
+
+    input_string = " ".join("S01E02" for _ in range(200))
+    matches = rebulk.matches(input_string)
+
+    assert not fixed_offsets
+    assert len(matches.named("season")) == 200
+    assert matches.named("episode")[-1].span == (len(input_string) - 2, len(input_string))
+    assert all(match.input_string is input_string for match in matches)
+
+
+def test_chain_parts_with_context_are_sliced() -> None:
+    # A part with a validator or a lookbehind still sees the input sliced at the chain offset.
+    rebulk = Rebulk()
+    rebulk.chain(children=True).regex(r"S(?P<season>\d\d)").regex(r"(?<!\d)(?P<episode>\d\d)")
+
+    matches = rebulk.matches("S0102 S03")
+
+    assert [m.value for m in matches.named("season")] == ["01"]
+    assert [m.value for m in matches.named("episode")] == ["02"]
+
+
+def test_invalid_chain_restarts_from_first_match() -> None:
+    # When a chain is invalid, matching restarts after the first match of that chain on the original input.
+    rebulk = Rebulk()
+    rebulk.chain(children=True).string("a", name="a").repeater("{1,2}").string("b", name="b")
+
+    matches = rebulk.matches("ba-aa- aab")
+
+    assert [(m.name, m.span) for m in matches] == [("a", (7, 8)), ("a", (8, 9)), ("b", (9, 10))]
+
+
+def test_chain_parts_match_anchored(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Chain parts only search the run of matches they can consume, instead of every match up to the end of input.
+    processed: list[Match] = []
+    process_matches = Pattern._process_matches
+
+    def tracking_process_matches(self: Pattern, match: Match, match_index: int) -> Any:
+        processed.append(match)
+        return process_matches(self, match, match_index)
+
+    monkeypatch.setattr(Pattern, "_process_matches", tracking_process_matches)
+
+    rebulk = Rebulk()
+    rebulk.chain(children=True).regex(r"S(?P<season>\d+)").string("E").regex(r"(?P<episode>\d)").repeater("+")
+
+    input_string = " ".join("S01E02" for _ in range(500))
+    matches = rebulk.matches(input_string)
+
+    assert [m.value for m in matches.named("episode")] == ["0", "2"] * 500
+    # per chain: one season, one E, two episode digits and the chain match itself.
+    assert len(processed) == 5 * 500
+
+
+def test_chain_parts_match_anchored_empty_matches() -> None:
+    # Patterns matching empty strings still give the same matches as an unanchored search.
+    rebulk = Rebulk()
+    rebulk.chain(children=True).regex(r"(?P<a>a)?b?", name="ab").repeater("+").regex(r"\d?", name="digit")
+
+    matches = rebulk.matches("-b1-ba-11-")
+
+    assert [(m.name, m.span) for m in matches] == [("ab", (1, 2)), ("digit", (2, 3))]
+
+
+@requires_fusion
+def test_fused_chain(monkeypatch: pytest.MonkeyPatch) -> None:
+    # A chain of bounded regex parts is matched by a single fused regex.
+    def fail_next_chain(*args: Any, **kwargs: Any) -> Any:  # pragma: no cover
+        raise AssertionError("chain should be matched by the fused regex")
+
+    monkeypatch.setattr(Chain, "_next_chain", fail_next_chain)
+
+    rebulk = Rebulk()
+    chain = rebulk.chain(children=True)
+    chain.regex(r"S(?P<season>\d+)").regex(r"[ex](?P<episode>\d+)").repeater("{1,3}").regex(r"-").hidden()
+    chain.regex(r"v(?P<version>\d)").repeater("?")
+
+    matches = rebulk.matches("S01e02x03- S04e05- S06x07-v2")
+
+    assert [(m.name, m.value, m.match_index) for m in matches if m.name] == [
+        ("season", "01", 0),
+        ("episode", "02", 0),
+        ("episode", "03", 0),
+        ("season", "04", 1),
+        ("episode", "05", 1),
+        ("season", "06", 2),
+        ("episode", "07", 2),
+        ("version", "2", 2),
+    ]
+
+
+@requires_fusion
+def test_fused_chain_does_not_backtrack() -> None:
+    # Like part by part matching, the fused regex neither backtracks into a previous part nor starts a chain where
+    # the chain start isn't first found.
+    rebulk = Rebulk()
+    chain = rebulk.chain()
+    chain.regex(r"abc|b").regex(r"c")
+
+    assert chain._chain._fused_regex() is not None
+    assert not rebulk.matches("abc")
+    assert [m.span for m in rebulk.matches("abcbc")] == [(3, 5)]
+
+
+@requires_fusion
+def test_unfusible_chains() -> None:
+    def fused_regex(chain: Any) -> Any:
+        return Chain._fused_regex(chain._chain)
+
+    assert fused_regex(Rebulk().chain().regex("a").regex("b").repeater("{1,2}"))
+    assert fused_regex(Rebulk().chain().regex("a").regex("b").repeater("+")) is None
+    assert fused_regex(Rebulk().chain().regex("a").repeater("?").regex("b")) is None
+    assert fused_regex(Rebulk().chain().regex("a").regex("b", validator=lambda match: True)) is None
+    assert fused_regex(Rebulk().chain().regex("a").regex("b").repeater("+").string("c")) is None
+    assert fused_regex(Rebulk().chain().regex("a").regex("b?")) is None
+    assert fused_regex(Rebulk().chain().regex("a").regex(r"(?P<b>b)(?P=b)")) is None
+
+
+@requires_fusion
+def test_fused_chain_searches_once_until_its_start(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Chain starts found before the next fused match are matched part by part, without searching the fused regex
+    # again, as it would scan the input up to the same fused match.
+    searches: list[int] = []
+    fused_regex = Chain._fused_regex
+
+    class CountingRegex:
+        def __init__(self, regex: Any) -> None:
+            self.regex = regex
+
+        def search(self, input_string: str, pos: int) -> Any:
+            searches.append(pos)
+            return self.regex.search(input_string, pos)
+
+    def counting_fused_regex(self: Chain) -> Any:
+        fused = fused_regex(self)
+        return (CountingRegex(fused[0]), fused[1]) if fused else None
+
+    monkeypatch.setattr(Chain, "_fused_regex", counting_fused_regex)
+
+    rebulk = Rebulk()
+    rebulk.chain().regex(r"S\d\d").regex(r"E\d\d")
+
+    input_string = "S01 " * 2000 + "S01E02"
+    matches = rebulk.matches(input_string)
+
+    assert [m.span for m in matches] == [(8000, 8006)]
+    assert searches == [0]
+
+
+@requires_fusion
+def test_fused_regex_built_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    fused: list[Any] = []
+    fuse_parts = Chain._fuse_parts
+
+    def counting_fuse_parts(self: Chain) -> Any:
+        fused.append(fuse_parts(self))
+        return fused[-1]
+
+    monkeypatch.setattr(Chain, "_fuse_parts", counting_fuse_parts)
+
+    rebulk = Rebulk()
+    chain = rebulk.chain().regex(r"S(?P<season>\d+)").regex(r"E(?P<episode>\d+)")
+
+    for _ in range(3):
+        assert [m.value for m in rebulk.matches("S01E02 S03E04")] == ["S01E02", "S03E04"]
+    assert len(fused) == 1
+
+    chain.repeater("{1,2}")
+    assert [m.value for m in rebulk.matches("S01E02E03")] == ["S01E02E03"]
+    assert len(fused) == 2
+
+    chain.regex(r"x").repeater("+")
+    assert not rebulk.matches("S01E02")
+    assert [m.value for m in rebulk.matches("S01E02xx")] == ["S01E02xx"]
+    assert len(fused) == 3
+    assert fused[-1] is None
+
+
+def test_incremental_chain_breaker() -> None:
+    breaker_calls: list[tuple[list[int], Any]] = []
+
+    def incremental_chain_breaker(group: Matches, last_season: Any) -> tuple[bool, Any]:
+        season = group.named("season", index=0)
+        breaker_calls.append(([m.value for m in group.named("season")], last_season))
+        if season is None:
+            return False, last_season
+        return last_season is not None and season.value - last_season > 10, season.value
+
+    seps_surround = partial(chars_surround, " .-/")
+    rebulk = Rebulk()
+    rebulk.regex_defaults(flags=re.IGNORECASE)
+    rebulk.defaults(children=True, private_parent=True, formatter={"season": int})
+
+    chain: Any = rebulk.chain(incremental_chain_breaker=incremental_chain_breaker)
+    chain.regex(r"S(?P<season>\d+)", validate_all=True, validator={"__parent__": seps_surround}).regex(
+        r"[ -](?P<season>\d+)", validator=seps_surround
+    ).repeater("*")
+
+    matches = rebulk.matches("Some S01-02-03-50-51")
+    assert [m.value for m in matches] == [1, 2, 3]
+    # each group is given once, with the state returned for the last group appended.
+    assert breaker_calls == [([1], None), ([2], 1), ([3], 2), ([50], 3), ([51], 3)]
+
+
+def test_incremental_chain_breaker_with_chain_breaker() -> None:
+    # A group is appended only if both breakers accept it, and the incremental state is kept only in this case.
+    states: list[Any] = []
+
+    def incremental_chain_breaker(group: Matches, count: Any) -> tuple[bool, Any]:
+        states.append(count)
+        return False, (count or 0) + 1
+
+    def chain_breaker(matches: Matches) -> bool:
+        return len(matches) > 2
+
+    rebulk = Rebulk()
+    rebulk.chain(incremental_chain_breaker=incremental_chain_breaker, chain_breaker=chain_breaker).regex(
+        r"(?P<digit>\d)"
+    ).repeater("+")
+
+    matches = rebulk.matches("12345")
+    assert [m.value for m in matches] == ["12"]
+    assert states == [None, 1, 2, 2, 2]
+
+
+def test_chain_validation_retries_without_last_groups(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fallback(*args: Any, **kwargs: Any) -> bool:
+        raise AssertionError("children should be truncated by group")
+
+    monkeypatch.setattr(Chain, "_process_match_removing_last_pattern_matches", fallback)
+    removed: list[Match] = []
+    remove_match = Matches._remove_match
+
+    def tracking_remove_match(self: Matches, match: Match) -> None:
+        removed.append(match)
+        remove_match(self, match)
+
+    monkeypatch.setattr(Matches, "_remove_match", tracking_remove_match)
+
+    rebulk = Rebulk()
+    rebulk.defaults(children=True, private_parent=True)
+    rebulk.chain(
+        validate_all=True, validator={"__parent__": lambda match: len(match.children.named("digit")) <= 2}
+    ).regex(r"(?P<first>[a-z])").regex(r"(?P<digit>\d)").repeater("+")
+
+    matches = rebulk.matches("a" + "1" * 200)
+    assert [(m.name, m.value) for m in matches] == [("first", "a"), ("digit", "1"), ("digit", "1")]
+    assert matches[-1].end == 3
+    # groups of children are removed at once, so only the matches removed by rules are removed one by one.
+    removed_by_rules = len(removed)
+    removed.clear()
+    assert len(rebulk.matches("a" + "1" * 400)) == 3
+    assert len(removed) == removed_by_rules
+
+    matches = rebulk.matches("a1")
+    assert [(m.name, m.value) for m in matches] == [("first", "a"), ("digit", "1")]
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import pytest
+
+from ..columns import TAG_WORD_SIZE, MatchColumns
+from ..match import Match, Matches
+from ..rebulk import Rebulk
+
+
+def _bulk() -> Rebulk:
+    bulk = Rebulk()
+    bulk.regex(r"\d+", name="number", tags=["digits"], formatter=int)
+    bulk.string("fox", tags=["animal", "word"])
+    bulk.string("dog")
+    return bulk
+
+
+def test_to_columns() -> None:
+    matches = _bulk().matches("dog 12 fox 3")
+    columns = matches.to_columns()
+
+    assert len(columns) == 4
+    assert columns.inputs == 1
+    assert list(columns.input) == [0, 0, 0, 0]
+    assert list(columns.start) == [0, 4, 7, 11]
+    assert list(columns.end) == [3, 6, 10, 12]
+    assert [columns.names[name] for name in columns.name] == [None, "number", None, "number"]
+    assert columns.value == ["dog", 12, "fox", 3]
+    assert [columns.tags_of(row) for row in range(len(columns))] == [[], ["digits"], ["animal", "word"], ["digits"]]
+    assert columns.tag_names == ["digits", "animal", "word"]
+    assert list(columns.tags[0]) == [0, 1, 6, 1]
+
+
+def test_from_matches() -> None:
+    strings = ["fox 1", "nothing", "2 dog fox"]
+    columns = MatchColumns.from_matches(_bulk().matches(string) for string in strings)
+
+    assert columns.inputs == 3
+    assert list(columns.input) == [0, 0, 2, 2, 2]
+    assert list(columns.start) == [0, 4, 0, 2, 6]
+    assert columns.value == ["fox", 1, 2, "dog", "fox"]
+    assert columns.names == [None, "number"]
+
+    assert columns.append(Matches([Match(0, 1, name="other", input_string="x")])) == 3
+    assert columns.inputs == 4
+    assert columns.names == [None, "number", "other"]
+    assert list(columns.name) == [0, 1, 1, 0, 0, 2]
+
+
+def test_tag_words() -> None:
+    tags = [f"tag{i}" for i in range(TAG_WORD_SIZE * 2 + 1)]
+    matches = Matches(
+        [
+            Match(0, 1, tags=tags[:TAG_WORD_SIZE]),
+            Match(1, 2, tags=tags[TAG_WORD_SIZE - 1 : TAG_WORD_SIZE + 2]),
+            Match(2, 3),
+            Match(3, 4, tags=[*tags[TAG_WORD_SIZE + 2 :], tags[0]]),
+        ]
+    )
+    columns = matches.to_columns()
+
+    assert len(columns.tags) == 3
+    assert all(len(word) == 4 for word in columns.tags)
+    assert [columns.tags_of(row) for row in range(len(columns))] == [
+        tags[:TAG_WORD_SIZE],
+        tags[TAG_WORD_SIZE - 1 : TAG_WORD_SIZE + 2],
+        [],
+        [tags[0], *tags[TAG_WORD_SIZE + 2 :]],
+    ]
+    assert list(columns.tags[2]) == [0, 0, 0, 1]
+
+
+def test_to_numpy() -> None:
+    np = pytest.importorskip("numpy")
+
+    columns = MatchColumns.from_matches(_bulk().matches(string) for string in ["fox 1", "2"])
+    arrays = columns.to_numpy()
+
+    assert arrays["input"].tolist() == [0, 0, 1]
+    assert arrays["start"].tolist() == [0, 4, 0]
+    assert arrays["end"].tolist() == [3, 5, 1]
+    assert arrays["name"].tolist() == [0, 1, 1]
+    assert arrays["value"].tolist() == ["fox", 1, 2]
+    assert arrays["tags"].shape == (3, 1)
+    assert arrays["tags"].dtype == np.uint64
+    assert arrays["tags"][:, 0].tolist() == [3, 4, 4]
+
+    columns.append(_bulk().matches("3"))
+    assert arrays["input"].tolist() == [0, 0, 1]
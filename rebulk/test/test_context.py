@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+from typing import Any
+
+from ..context import ConditionsCache, ContextCondition, ensure_condition
+from ..match import Match, Matches
+from ..rebulk import Rebulk
+from ..rules import RemoveMatch, Rule, Rules
+
+
+class CountingCondition(ContextCondition):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+
+    def __call__(self, context: dict[str, Any] | None) -> bool:
+        self.calls += 1
+        return super().__call__(context)
+
+
+def test_context_condition() -> None:
+    condition = ContextCondition("mode", ("fast", "lite"))
+    assert condition.keys == ("mode",)
+    assert condition({"mode": "fast"})
+    assert condition({"mode": "lite", "other": 1})
+    assert not condition({"mode": "full"})
+    assert not condition({})
+    assert not condition(None)
+    assert not condition({"mode": ["fast"]})
+
+    assert (~condition)({"mode": "full"})
+    assert not (~condition)({"mode": "fast"})
+    assert (~condition)({"mode": ["fast"]})
+
+    flag = ContextCondition("flag")
+    assert flag({"flag": True})
+    assert not flag({"flag": False})
+
+    default = ContextCondition("mode", "fast", default="fast")
+    assert default({})
+    assert default(None)
+    assert not default({"mode": "full"})
+
+
+def test_ensure_condition() -> None:
+    assert ensure_condition(True)(None)
+    assert not ensure_condition(False)({"any": True})
+    assert (~ensure_condition(False))(None)  # type: ignore[operator]
+
+    def function(context: dict[str, Any] | None) -> bool:
+        return True
+
+    assert ensure_condition(function) is function
+
+
+def test_conditions_cache() -> None:
+    mode = CountingCondition("mode", "lite")
+    flag = CountingCondition("flag")
+    dynamic_calls: list[dict[str, Any] | None] = []
+
+    def dynamic(context: dict[str, Any] | None) -> bool:
+        dynamic_calls.append(context)
+        return bool(context and context.get("dynamic"))
+
+    conditions = ConditionsCache([mode, dynamic, flag, ensure_condition(True)])
+    assert conditions.keys == ("mode", "flag")
+
+    for _ in range(3):
+        assert conditions({"mode": "lite", "flag": False, "other": 1}) == [True, False, False, True]
+        assert conditions({"mode": "lite", "flag": False, "other": 2}) == [True, False, False, True]
+        assert conditions({"mode": "full", "dynamic": True}) == [False, True, False, True]
+    assert mode.calls == 2
+    assert flag.calls == 2
+    assert len(dynamic_calls) == 9
+
+    assert conditions.cached({"mode": "full"}) == (False, None, False, True)
+    assert conditions({"mode": ["lite"], "flag": True}) == [False, False, True, True]
+    assert conditions({"mode": ["lite"], "flag": True}) == [False, False, True, True]
+    assert mode.calls == 4
+
+
+def test_rebulk_context_conditions() -> None:
+    quick = CountingCondition("nostring")
+    child_condition = CountingCondition("mode", "lite")
+
+    bulk = Rebulk().string("quick", disabled=quick).regex("f.x")
+    bulk.rebulk(Rebulk(disabled=child_condition).string("dog"))
+
+    input_string = "The quick brown fox jumps over the lazy dog"
+    for _ in range(10):
+        assert [match.value for match in bulk.matches(input_string)] == ["quick", "fox", "dog"]
+        assert [match.value for match in bulk.matches(input_string, {"nostring": True})] == ["fox", "dog"]
+        assert [match.value for match in bulk.matches(input_string, {"mode": "lite"})] == ["quick", "fox"]
+    assert quick.calls == 3
+    assert child_condition.calls == 3
+
+    bulk.string("lazy", disabled=ContextCondition("nostring"))
+    assert [match.value for match in bulk.matches(input_string)] == ["quick", "fox", "lazy", "dog"]
+    assert [match.value for match in bulk.matches(input_string, {"nostring": True})] == ["fox", "dog"]
+
+
+class RuleDisabledInLiteMode(Rule):
+    consequence = RemoveMatch
+    _disabled_by_default = CountingCondition("mode", "lite")
+
+    def when(self, matches: Matches, context: dict[str, Any] | None) -> Any:
+        return matches.named("other")
+
+
+class RuleAlwaysDisabled(RuleDisabledInLiteMode):
+    _disabled_by_default = True  # type: ignore[assignment]
+
+
+def test_rules_context_conditions() -> None:
+    condition = RuleDisabledInLiteMode._disabled_by_default
+    assert isinstance(condition, CountingCondition)
+    rules = Rules(RuleDisabledInLiteMode, RuleAlwaysDisabled)
+
+    assert not RuleDisabledInLiteMode().enabled({"mode": "lite"})
+    assert RuleDisabledInLiteMode().enabled({"mode": "full"})
+    assert not RuleAlwaysDisabled().enabled(None)
+    condition.calls = 0
+
+    for _ in range(10):
+        matches = Matches([Match(0, 1, name="other")])
+        assert rules.execute_all_rules(matches, {"mode": "lite"}) == []
+        assert list(matches) == [Match(0, 1, name="other")]
+        assert [rule for rule, _ in rules.execute_all_rules(matches, {"mode": "full"})] == [RuleDisabledInLiteMode()]
+        assert not matches
+    assert condition.calls == 2
+
+
+def test_reassigned_disabled() -> None:
+    bulk = Rebulk().string("fox")
+    child = Rebulk().string("dog")
+    bulk.rebulk(child)
+    assert [match.value for match in bulk.matches("fox dog")] == ["fox", "dog"]
+
+    bulk._patterns[0].disabled = lambda context: True
+    assert [match.value for match in bulk.matches("fox dog")] == ["dog"]
+
+    child._patterns[0].disabled = ContextCondition("nodog")
+    assert [match.value for match in bulk.matches("fox dog")] == ["dog"]
+    assert [match.value for match in bulk.matches("fox dog", {"nodog": True})] == []
+
+    child.disabled = ensure_condition(True)
+    bulk._patterns[0].disabled = ensure_condition(False)
+    assert [match.value for match in bulk.matches("fox dog")] == ["fox"]
+
+
+def test_rules_reassigned_disabled() -> None:
+    rule = RuleAlwaysDisabled()
+    rules = Rules(rule)
+    matches = Matches([Match(0, 1, name="other")])
+    assert rules.execute_all_rules(matches, None) == []
+
+    rule._disabled_by_default = ContextCondition("mode", "lite")  # type: ignore[assignment,misc]
+    assert rules.execute_all_rules(matches, {"mode": "lite"}) == []
+    assert [rule for rule, _ in rules.execute_all_rules(matches, None)] == [rule]
+    assert not matches
+
+
+class RuleWithDisabledMethod(Rule):
+    consequence = RemoveMatch
+
+    def disabled(self) -> bool:
+        return True
+
+    def when(self, matches: Matches, context: dict[str, Any] | None) -> Any:
+        return matches.named("other")
+
+
+def test_rules_disabled_method_is_not_a_condition() -> None:
+    # A disabled attribute defined by a rule for its own use doesn't disable it.
+    rule = RuleWithDisabledMethod()
+    assert rule.enabled(None)
+    matches = Matches([Match(0, 1, name="other")])
+    assert [rule for rule, _ in Rules(rule).execute_all_rules(matches, None)] == [rule]
+    assert not matches
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+from __future__ import annotations
+
+import mmap
+import tracemalloc
+from array import array
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from ..encoded import EncodedInput, decode, encoded_input, input_buffer, input_encoding
+from ..rebulk import Rebulk
+from ..validators import (
+    chars_after,
+    chars_before,
+    chars_surround,
+    filter_chars_surround,
+    span_chars_after,
+    span_chars_before,
+    span_chars_surround,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from ..match import Match
+
+INPUT_STRING = "Café ERROR 42 naïve fox-trot 2024 Straße"
+
+
+def _bulk() -> Rebulk:
+    bulk = Rebulk()
+    bulk.regex(r"ERROR (?P<code>\d+)", children=True, formatter={"code": int})
+    bulk.string("fox", "naïve")
+    bulk.string("TROT", ignore_case=True)
+    bulk.regex(r"\d{4}", name="year")
+    return bulk
+
+
+def _values(matches: Iterable[Match]) -> list[tuple[Any, ...]]:
+    return [(match.name, match.value, match.raw) for match in matches]
+
+
+def test_encoded_input() -> None:
+    assert encoded_input("text") == "text"
+    assert input_encoding("text") is None
+    assert input_buffer("text") == "text"
+
+    for raw in (b"text", bytearray(b"text"), memoryview(b"text")):
+        data = encoded_input(raw)
+        assert isinstance(data, EncodedInput)
+        # the buffer is wrapped, not copied.
+        assert data.data is raw
+        assert input_buffer(data) is raw
+        assert input_encoding(data) == "utf-8"
+        assert len(data) == 4
+        assert bytes(data[1:3]) == b"ex"
+        assert data.find(b"t") == 0
+        assert data.find(b"t", 1) == 3
+        assert data.find(b"t", 1, 3) == -1
+
+    data = encoded_input(bytearray(b"text"), "latin-1")
+    assert input_encoding(data) == "latin-1"
+    assert encoded_input(data) is data
+    assert encoded_input(data, "latin-1") is data
+    cp1252 = encoded_input(data, "cp1252")
+    assert input_encoding(cp1252) == "cp1252"
+    assert cp1252.data is data.data
+
+    words = memoryview(array("H", [1, 2]))
+    assert len(encoded_input(words)) == 4
+
+    assert decode(b"caf\xe9", EncodedInput(b"", "latin-1")) == "café"
+    assert decode(memoryview(b"caf\xc3\xa9"), b"") == "café"
+
+
+def test_encoded_input_mmap(tmp_path: Path) -> None:
+    path = tmp_path / "input.txt"
+    path.write_bytes(INPUT_STRING.encode("latin-1"))
+
+    with EncodedInput.open(path, "latin-1") as data:
+        assert isinstance(data.data, mmap.mmap)
+        assert input_encoding(data) == "latin-1"
+        assert data.find("naïve".encode("latin-1")) == 14
+    assert data.data.closed
+
+    with path.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        data = encoded_input(mapped, "latin-1")
+        assert data.data is mapped
+        assert input_encoding(data) == "latin-1"
+        assert _values(_bulk().matches(mapped, encoding="latin-1")) == _values(_bulk().matches(INPUT_STRING))
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "latin-1"])
+def test_matches_bytes(encoding: str) -> None:
+    expected = _values(_bulk().matches(INPUT_STRING))
+    assert expected == [
+        ("code", 42, "42"),
+        (None, "fox", "fox"),
+        (None, "naïve", "naïve"),
+        (None, "trot", "trot"),
+        ("year", "2024", "2024"),
+    ]
+
+    matches = _bulk().matches(INPUT_STRING.encode(encoding), encoding=encoding)
+    assert _values(matches) == expected
+
+    offset = len("é".encode(encoding)) - 1
+    assert [match.span for match in matches] == [
+        (11 + offset, 13 + offset),
+        (20 + 2 * offset, 23 + 2 * offset),
+        (14 + offset, 19 + 2 * offset),
+        (24 + 2 * offset, 28 + 2 * offset),
+        (29 + 2 * offset, 33 + 2 * offset),
+    ]
+    assert matches[0].parent.raw == "ERROR 42"  # type: ignore[union-attr]
+    holes = _bulk().matches(INPUT_STRING).holes(0, 11, seps=" ")
+    assert [hole.value for hole in matches.holes(0, 11 + offset, seps=" ")] == [hole.value for hole in holes]
+
+
+@pytest.mark.parametrize("buffer_type", [bytearray, memoryview])
+def test_matches_buffers(buffer_type: Any) -> None:
+    data = buffer_type(INPUT_STRING.encode("utf-8"))
+    matches = _bulk().matches(data)
+
+    assert _values(matches) == _values(_bulk().matches(INPUT_STRING))
+    assert all(match.input_string.data is data for match in matches)
+
+
+def test_matches_without_copy() -> None:
+    data = b"x" * 5_000_000 + b" ERROR 42"
+    bulk = Rebulk().regex(r"ERROR (?P<code>\d+)", children=True).string("ERROR")
+
+    tracemalloc.start()
+    try:
+        matches = bulk.matches(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert sorted(match.value for match in matches) == ["42", "ERROR"]
+    assert peak < len(data) // 10
+
+
+def test_matches_mmap(tmp_path: Path) -> None:
+    path = tmp_path / "input.txt"
+    path.write_bytes(INPUT_STRING.encode("latin-1") * 1000)
+
+    with EncodedInput.open(path, "latin-1") as data:
+        matches = _bulk().matches(data)
+        assert len(matches) == 5000
+        first = [match for match in matches if match.end <= len(INPUT_STRING.encode("latin-1"))]
+        assert _values(first) == _values(_bulk().matches(INPUT_STRING))
+        assert matches[-1].span == (len(data) - 11, len(data) - 7)
+        assert matches[-1].input_string.data is data.data  # type: ignore[union-attr]
+        values = _values(match for match in matches if match.start >= len(data) - len(INPUT_STRING))
+        matches = None  # type: ignore[assignment]
+    assert values == _values(_bulk().matches(INPUT_STRING))
+
+
+def test_matches_bytes_chain() -> None:
+    bulk = Rebulk().chain().regex(r"ERROR").regex(r" (?P<code>\d+)").repeater("+").close()
+    expected = [(match.name, match.value, match.span) for match in bulk.matches("ERROR 4 2 ERROR 1")]
+
+    for data in ("ERROR 4 2 ERROR 1", EncodedInput(b"ERROR 4 2 ERROR 1", "latin-1")):
+        assert [(match.name, match.value, match.span) for match in bulk.matches(data)] == expected
+
+
+
+def test_matches_partial_character() -> None:
+    # "." matches a single byte, so the match ends inside the encoding of "é".
+    matches = Rebulk().regex(r"caf.").matches("le café noir".encode())
+
+    assert [(match.span, match.raw, match.value) for match in matches] == [((3, 7), "caf\ufffd", "caf\ufffd")]
+    assert repr(matches) == "[<caf\ufffd:(3, 7)>]"
+
+def test_ignore_case_non_ascii() -> None:
+    assert [match.value for match in Rebulk().string("CAFE", ignore_case=True).matches(b"cafe Cafe")] == [
+        "cafe",
+        "Cafe",
+    ]
+    with pytest.raises(ValueError, match="non-ASCII"):
+        Rebulk().string("CAFÉ", ignore_case=True).matches("Café".encode())
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "latin-1"])
+@pytest.mark.parametrize(
+    ("input_string", "chars"),
+    [
+        ("a 12 b", " "),
+        ("a 12b", " "),
+        ("12 b", " "),
+        ("a\u201312\u2013b", "\u2013"),
+        ("a\u201312 b", ["\u2013", " "]),
+        ("a-12\u2013b", "\u2013"),
+        ("é12é", "é"),
+        ("é12", "-"),
+    ],
+)
+def test_validators_bytes(input_string: str, chars: Any, encoding: str) -> None:
+    if encoding == "latin-1" and "\u2013" in input_string:
+        encoding = "cp1252"
+    for validator in (chars_before, chars_after, chars_surround):
+        bulk = Rebulk().regex(r"\d+", validator=partial(validator, chars))
+        expected = [match.value for match in bulk.matches(input_string)]
+        assert [match.value for match in bulk.matches(input_string.encode(encoding), encoding=encoding)] == expected
+    for span_validator in (span_chars_before, span_chars_after, span_chars_surround):
+        bulk = Rebulk().regex(r"\d+", span_validator=partial(span_validator, chars))
+        expected = [match.value for match in bulk.matches(input_string)]
+        assert [match.value for match in bulk.matches(input_string.encode(encoding), encoding=encoding)] == expected
+    if isinstance(chars, str):
+        expected = [match.value for match in filter_chars_surround(chars, Rebulk().regex(r"\d+").matches(input_string))]
+        matches = Rebulk().regex(r"\d+").matches(input_string.encode(encoding), encoding=encoding)
+        assert [match.value for match in filter_chars_surround(chars, matches)] == expected
+
+
+@pytest.mark.parametrize("buffer_type", [bytearray, memoryview, mmap.mmap])
+def test_filter_chars_buffers(buffer_type: Any) -> None:
+    input_string = "é12–34 56"
+    raw = input_string.encode("utf-8")
+    if buffer_type is mmap.mmap:
+        data: Any = mmap.mmap(-1, len(raw))
+        data.write(raw)
+    else:
+        data = buffer_type(raw)
+    expected = [match.value for match in filter_chars_surround("é– ", Rebulk().regex(r"\d+").matches(input_string))]
+
+    matches = Rebulk().regex(r"\d+").matches(data)
+    assert [match.value for match in filter_chars_surround("é– ", matches)] == expected == ["12", "34", "56"]
+    matches = Rebulk().regex(r"\d+").matches(encoded_input(data))
+    assert [match.value for match in filter_chars_surround("– ", matches)] == ["34", "56"]
+    if isinstance(data, mmap.mmap):
+        data.close()
+
+def test_validators_bytes_issue_example() -> None:
+    bulk = Rebulk().regex(r"\d+", validator=partial(chars_surround, " "))
+    assert [match.span for match in bulk.matches(b"a 12 b", encoding="utf-8")] == [(2, 4)]
+    assert [match.span for match in bulk.matches("a 12 b")] == [(2, 4)]
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
+import threading
 from typing import TYPE_CHECKING, Any
 
 import pytest
 
 from ..formatters import formatters
-from ..match import Match, Matches
+from ..match import Match, Matches, SeparatorTable
 from ..pattern import RePattern, StringPattern
 
 if TYPE_CHECKING:
@@ -213,6 +214,74 @@ class TestMatchesClass:
         assert matches[0] == self.match1
         assert matches[1] == self.match4
 
+    def test_remove_slices_with_indexes(self) -> None:
+        matches = Matches([self.match1, self.match2, self.match3, self.match4])
+        # only the start index is built before removing, the end index is built while removing.
+        assert list(matches.starting(3)) == [self.match3]
+
+        del matches[2:]
+
+        assert list(matches) == [self.match1, self.match2]
+        assert not matches.starting(3)
+        assert not matches.ending(4)
+        assert matches.max_end == 3
+
+        matches = Matches([self.match1, self.match2, self.match3, self.match4])
+        del matches[::-2]
+
+        assert list(matches) == [self.match1, self.match3]
+
+    def test_remove_slices_bulk(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def remove_match(*args: Any) -> None:  # pragma: no cover
+            raise AssertionError("a slice should be removed at once")
+
+        input_string = "a1b2c3d4" * 10
+        all_matches = [
+            Match(i, i + 1 + i % 3, name="letter" if i % 2 else "digit", tags=[str(i % 4)], input_string=input_string)
+            for i in range(len(input_string))
+        ]
+        matches = Matches(all_matches, input_string=input_string)
+        matches.insert(0, Match(70, 72, name="digit", input_string=input_string))
+        # build all lookup structures before removing.
+        assert matches.named("digit") and matches.tagged("0") and matches.at_index(3)
+        assert matches.previous(matches[-1]) and matches.next(matches[1])
+
+        monkeypatch.setattr(Matches, "_remove_match", remove_match)
+        del matches[40:]
+        del matches[10:20:3]
+
+        expected = Matches(list(matches), input_string=input_string)
+        for name in ("digit", "letter"):
+            assert matches.named(name) == expected.named(name)
+        for tag in "0123":
+            assert matches.tagged(tag) == expected.tagged(tag)
+        for i in range(len(input_string) + 1):
+            assert matches.starting(i) == expected.starting(i)
+            assert matches.ending(i) == expected.ending(i)
+            assert matches.at_index(i) == expected.at_index(i)
+        assert matches.max_end == expected.max_end
+        assert matches.previous(matches[-1]) == expected.previous(expected[-1])
+        assert matches.holes() == expected.holes()
+
+        matches = Matches(all_matches[:10], input_string=input_string)
+        del matches[5:]
+        assert matches.max_end == len(input_string)
+        assert matches._max_end == 6
+
+    def test_has_any(self) -> None:
+        matches = Matches([self.match1, self.match2, self.match3])
+
+        assert matches.has_any(names=["end", "start"])
+        assert matches.has_any(tags=["tag2"])
+        assert not matches.has_any(names=["end"], tags=["tag3"])
+        assert not matches.has_any()
+
+        assert not matches.tagged("tag3")
+        matches.remove(self.match1)
+        assert not matches.has_any(names=["start"], tags=["tag3"])
+        matches.append(self.match4)
+        assert matches.has_any(names=["end"])
+
     def test_set_slices(self) -> None:
         matches = Matches()
         matches.append(self.match1)
@@ -576,6 +645,201 @@ class TestMaches:
         assert len(holes) == 4
         assert [hole.value for hole in holes] == ["Test hole ", " with ", " separators ", " included"]
 
+    def test_holes_ignore(self) -> None:
+        input_string = "0123456789" * 3
+
+        matches = Matches(input_string=input_string)
+        matches.append(Match(5, 10, name="kept", input_string=input_string))
+        matches.append(Match(8, 20, name="ignored", input_string=input_string))
+        matches.append(Match(25, 28, name="kept", input_string=input_string))
+
+        holes = matches.holes()
+        assert [hole.span for hole in holes] == [(0, 5), (20, 25), (28, 30)]
+
+        holes = matches.holes(ignore=lambda match: match.name == "ignored")
+        assert [hole.span for hole in holes] == [(0, 5), (10, 25), (28, 30)]
+
+        holes = matches.holes(7, 26, ignore=lambda match: match.name == "ignored")
+        assert [hole.span for hole in holes] == [(10, 25)]
+
+    def test_holes_zero_length(self) -> None:
+        input_string = "abc def ghi"
+
+        matches = Matches(input_string=input_string)
+        matches.append(Match(1, 2, input_string=input_string))
+        matches.append(Match(6, 6, name="marker", input_string=input_string))
+        matches.append(Match(9, 10, input_string=input_string))
+
+        # Zero-length matches don't split holes ...
+        assert [hole.span for hole in matches.holes()] == [(0, 1), (2, 9), (10, 11)]
+        assert [hole.span for hole in matches.holes(seps=" ")] == [(0, 1), (2, 3), (4, 7), (8, 9), (10, 11)]
+        # ... but one starting at the last index of the range ends the last hole there.
+        assert [hole.span for hole in matches.holes(end=7)] == [(0, 1), (2, 6)]
+        assert [hole.span for hole in matches.holes(end=7, ignore=lambda match: match.name == "marker")] == [
+            (0, 1),
+            (2, 7),
+        ]
+        assert [hole.span for hole in matches.holes(end=8)] == [(0, 1), (2, 8)]
+
+    def test_holes_overlapping_and_mutated(self) -> None:
+        input_string = "x" * 1000
+
+        matches = Matches(input_string=input_string)
+        for start in range(0, 1000, 10):
+            matches.append(Match(start, start + 6, input_string=input_string))
+            matches.append(Match(start + 2, start + 4, input_string=input_string))
+
+        holes = matches.holes()
+        assert len(holes) == 100
+        assert all(len(hole) == 4 for hole in holes)
+
+        matches.remove(matches[0])
+        first_hole = matches.holes(index=0)
+        assert first_hole
+        assert first_hole.span == (0, 2)
+        matches.append(Match(0, 1000, input_string=input_string))
+        assert matches.holes() == []
+
+    def test_snapshot(self) -> None:
+        input_string = "abc def"
+        word = Match(0, 3, name="word", input_string=input_string)
+        marker = Match(4, 7, name="marker", marker=True, input_string=input_string)
+        matches = Matches([word], input_string=input_string)
+        matches.markers.append(marker)
+
+        snapshot = matches.snapshot()
+        matches.append(Match(4, 7, name="word", input_string=input_string))
+        matches.remove(word)
+
+        assert list(snapshot) == [word]
+        assert snapshot[0] is word
+        assert snapshot.named("word") == [word]
+        assert list(snapshot.markers) == [marker]
+        assert snapshot.input_string == input_string
+        with pytest.raises(TypeError, match="read-only"):
+            snapshot.append(word)
+        with pytest.raises(TypeError, match="read-only"):
+            snapshot.remove(word)
+        with pytest.raises(TypeError, match="read-only"):
+            snapshot[0] = word
+        with pytest.raises(TypeError, match="read-only"):
+            snapshot.markers.append(marker)
+        assert list(snapshot) == [word]
+
+    def test_snapshot_concurrent_reads(self) -> None:
+        # Reading missing keys of a snapshot doesn't add them to the lookup structures that other threads may be
+        # iterating to build their sorted keys.
+        input_string = "ab" * 2000
+        matches = Matches(
+            [Match(i, i + 1, name="a", input_string=input_string) for i in range(0, 4000, 2)],
+            input_string=input_string,
+        )
+        snapshots = [matches.snapshot()]
+        errors: list[BaseException] = []
+        barrier = threading.Barrier(5)
+        done = threading.Event()
+
+        def build_keys() -> None:
+            barrier.wait()
+            try:
+                for _ in range(50):
+                    snapshot = matches.snapshot()
+                    snapshot.starting(0)
+                    snapshots[0] = snapshot
+                    snapshot.next(snapshot[0])
+                    snapshot.previous(snapshot[-1])
+            except BaseException as error:  # pragma: no cover
+                errors.append(error)
+            finally:
+                done.set()
+
+        def read(offset: int) -> None:
+            barrier.wait()
+            try:
+                index = offset
+                while not done.is_set():
+                    snapshot = snapshots[0]
+                    snapshot.starting(index)
+                    snapshot.ending(index)
+                    snapshot.at_index(index)
+                    snapshot.named(str(index))
+                    snapshot.tagged(str(index))
+                    index += 4
+            except BaseException as error:  # pragma: no cover
+                errors.append(error)
+
+        threads = [threading.Thread(target=build_keys)]
+        threads.extend(threading.Thread(target=read, args=(offset,)) for offset in range(1, 5))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        snapshot = snapshots[0]
+        assert snapshot.starting(1) == []
+        assert 1 not in snapshot._start_dict
+        assert snapshot.starting(0) == [matches[0]]
+
+
+class TestNeighbours:
+    """
+    Micro-benchmarks for ``previous`` / ``next`` on a large, sparse input: each neighbour query is a single
+    sorted-index lookup, whatever the distance to the neighbour.
+    """
+
+    @staticmethod
+    def _sparse_matches(count: int = 2000, gap: int = 500) -> Matches:
+        input_string = "x" * (count * gap)
+        return Matches(
+            [Match(i * gap, i * gap + 1, name=str(i), input_string=input_string) for i in range(count)],
+            input_string=input_string,
+        )
+
+    def test_previous_next_sparse(self) -> None:
+        matches = self._sparse_matches()
+
+        for i, match in enumerate(matches):
+            previous = matches.previous(match, index=0)
+            following = matches.next(match, index=0)
+            assert (previous.name if previous else None) == (str(i - 1) if i > 0 else None)
+            assert (following.name if following else None) == (str(i + 1) if i < len(matches) - 1 else None)
+
+    def test_previous_next_single_lookup(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        matches = self._sparse_matches(count=10, gap=10000)
+        calls: list[int] = []
+        ending = matches.ending
+        starting = matches.starting
+
+        def tracking_ending(end: int, *args: Any) -> Any:
+            calls.append(end)
+            return ending(end, *args)
+
+        def tracking_starting(start: int, *args: Any) -> Any:
+            calls.append(start)
+            return starting(start, *args)
+
+        monkeypatch.setattr(matches, "ending", tracking_ending)
+        monkeypatch.setattr(matches, "starting", tracking_starting)
+
+        assert matches.previous(matches[5], index=0) == matches[4]
+        assert matches.next(matches[5], index=0) == matches[6]
+        assert calls == [40001, 60000]
+
+    def test_previous_next_after_mutation(self) -> None:
+        matches = self._sparse_matches(count=10, gap=10)
+        matches.previous(matches[0])
+        matches.next(matches[0])
+
+        removed = matches[5]
+        matches.remove(removed)
+        assert [match.name for match in matches.next(matches[4])] == ["6"]
+        assert [match.name for match in matches.previous(matches[5])] == ["4"]
+
+        matches.append(removed)
+        assert [match.name for match in matches.next(matches[4])] == ["5"]
+        assert [match.name for match in matches.previous(removed)] == ["4"]
+
 
 class TestNamedMultiple:
     @staticmethod
@@ -636,3 +900,48 @@ if TYPE_CHECKING:
     def _to_dict_reveal_types(matches: Matches) -> None:
         # enforce_list=True -> every value is a list (predictable, typable)
         assert_type(matches.to_dict(enforce_list=True)["x"], list[Any])
+
+
+class TestSeparatorTable:
+    def test_runs_and_jumps(self) -> None:
+        table = SeparatorTable("ab -- cd.e", " -.")
+
+        assert table.runs == [(2, 6), (8, 9)]
+        assert list(table.mask) == [0, 0, 1, 1, 1, 1, 0, 0, 1, 0]
+
+        assert table.next_non_separator(0) == 0
+        assert table.next_non_separator(3) == 6
+        assert table.previous_non_separator(5) == 1
+        assert table.previous_non_separator(7) == 7
+        assert table.next_separator(0) == 2
+        assert table.next_separator(4) == 4
+        assert table.next_separator(9) == 10
+
+    def test_range(self) -> None:
+        table = SeparatorTable("ab -- cd.e", " -.", 3, 8)
+
+        assert table.runs == [(3, 6)]
+        assert table.next_separator(6) == len("ab -- cd.e")
+
+    def test_cached_per_matches_and_seps(self) -> None:
+        input_string = "cached - input"
+        matches = Matches(input_string=input_string)
+        assert matches._separator_table(" -") is matches._separator_table(" -")
+        assert matches._separator_table(" -") is not matches._separator_table(" ")
+        assert matches._separator_table(" -") is not Matches(input_string=input_string)._separator_table(" -")
+
+        matches.input_string = "other - input"
+        assert matches._separator_table(" -").runs == [(5, 8)]
+
+    def test_empty_seps(self) -> None:
+        table = SeparatorTable("no separators", "")
+        assert table.runs == []
+        assert table.next_separator(0) == len("no separators")
+
+    def test_chain_over_long_separator_runs(self) -> None:
+        input_string = "word" + " " * 10000 + "word" + "-" * 10000 + "word" + "#" + "word"
+        matches = Matches(StringPattern("word").matches(input_string), input_string=input_string)
+
+        assert [match.start for match in matches.chain_after(0, " -")] == [0, 10004, 20008]
+        assert [match.start for match in matches.chain_before(len(input_string), " -")] == [20013]
+        assert [match.start for match in matches.chain_before(20012, " -")] == [20008, 10004, 0]
@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+import copy
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, cast
 
 import pytest
 
-from ..match import Match
+from .. import utils
+from ..match import Match, Matches
 from ..pattern import FunctionalPattern, Pattern, RePattern, StringPattern
-from ..remodule import REGEX_ENABLED
+from ..rebulk import Rebulk
+from ..remodule import REGEX_ENABLED, clear_regex_cache, regex_cache_info
 
 
 class TestStringPattern:
@@ -48,6 +53,36 @@ class TestStringPattern:
         assert len(matches) == 1
         assert matches[0].value == "Celtic"
 
+    def test_ignore_case_casefold(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # ß is casefolded to ss, so spans after it are shifted in the casefolded string.
+        input_string = "Große STRASSE in der Straße"
+        casefolded: list[str] = []
+        casefold = utils._casefold
+
+        def counting_casefold(string: str) -> Any:
+            casefolded.append(string)
+            return casefold(string)
+
+        monkeypatch.setattr(utils, "_casefold", counting_casefold)
+
+        pattern = StringPattern("strasse", "große", "der", ignore_case=True)
+        matches = cast("list[Match]", list(pattern.matches(input_string)))
+        assert [(match.span, match.value) for match in matches] == [
+            ((6, 13), "STRASSE"),
+            ((21, 27), "Straße"),
+            ((0, 5), "Große"),
+            ((17, 20), "der"),
+        ]
+
+        matches = cast("list[Match]", list(StringPattern("s", ignore_case=True).matches(input_string)))
+        assert [match.span for match in matches] == [(6, 7), (10, 11), (11, 12), (21, 22)]
+
+        # input string is casefolded once for all patterns of a Rebulk.matches call.
+        casefolded.clear()
+        rebulk = Rebulk().string("strasse", "große", ignore_case=True).string("der", ignore_case=True)
+        assert len(rebulk.matches(input_string)) == 4
+        assert casefolded == [input_string]
+
     def test_private_names(self) -> None:
         pattern = StringPattern("celtic", name="test", private_names=["test"], ignore_case=True)
 
@@ -423,6 +458,22 @@ class TestRePattern:
         assert children[1].name == "second"
         assert children[1].value == "HE"
 
+    def test_compiled_cache(self) -> None:
+        clear_regex_cache()
+
+        pattern1 = RePattern(r"Sa\w+", r"Sa-\w+", abbreviations=[("-", r"[\W_]")])
+        pattern2 = RePattern(r"Sa[\W_]\w+", {"pattern": r"Sa\w+"}, name="other")
+        pattern3 = RePattern((r"Sa\w+", re.IGNORECASE))
+
+        assert pattern2.patterns[0] is pattern1.patterns[1]
+        assert pattern2.patterns[1] is pattern1.patterns[0]
+        assert pattern3.patterns[0] is not pattern1.patterns[0]
+        assert pattern3.patterns[0].flags & re.IGNORECASE
+
+        info = regex_cache_info()
+        assert info.currsize == 3
+        assert info.hits == 2
+
 
 class TestFunctionalPattern:
     """
@@ -884,3 +935,127 @@ class TestValidator:
 
         matches = cast("list[Match]", list(pattern.matches(self.input_string)))
         assert len(matches) == 1
+
+
+class TestMatchConfig:
+    """
+    Benchmarks for the per-name match processing configuration, on a regex with many named groups.
+    """
+
+    group_count = 20
+    regex = "".join(f"(?P<group{i}>[a-z])" for i in range(group_count))
+    input_string = " ".join(["abcdefghijklmnopqrst"] * 500)
+
+    def test_resolved_once_per_name(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        from .. import pattern as pattern_module
+        from ..utils import get_first_defined
+
+        calls: list[Any] = []
+
+        def counting_get_first_defined(*args: Any) -> Any:
+            calls.append(args)
+            return get_first_defined(*args)
+
+        monkeypatch.setattr(pattern_module, "get_first_defined", counting_get_first_defined)
+
+        pattern = RePattern(
+            self.regex,
+            formatter={"group0": str.upper},
+            value={"group1": "one"},
+            validator={"group2": lambda match: match.value == "c"},
+            children=True,
+        )
+        matches = pattern.matches(self.input_string)
+
+        assert len(matches) == 500 * self.group_count
+        assert {match.value for match in matches if match.name == "group0"} == {"A"}
+        assert {match.value for match in matches if match.name == "group1"} == {"one"}
+        # value, formatter and validator resolved once per child name, not once per match. The parent is not
+        # included (children=True), so only its value is resolved.
+        assert len(calls) == 3 * self.group_count + 1
+
+    def test_reset_on_config_change(self) -> None:
+        pattern = RePattern(self.regex, children=True)
+        assert pattern.matches(self.input_string)[0].value == "a"
+
+        pattern.formatters = {"group0": str.upper}
+        assert pattern.matches(self.input_string)[0].value == "A"
+
+        pattern.values = {"group0": "value"}
+        assert pattern.matches(self.input_string)[0].value == "value"
+
+        pattern.validators = {"group0": lambda match: False}
+        assert pattern.matches(self.input_string) == []
+
+
+class TestLazyChildren:
+    """
+    Tests for lazy materialisation of children matches
+    """
+
+    input_string = "season 2 episode 15"
+
+    def test_not_built_until_read(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        pattern = RePattern(
+            r"season (?P<season>\d+) episode (?P<episode>\d+)",
+            formatter={"season": int},
+            value={"episode": "ep"},
+            format_all=True,
+        )
+        built: list[Match] = []
+        build_children = pattern._build_children
+
+        def tracking_build_children(match: Match, *args: Any) -> None:
+            built.append(match)
+            build_children(match, *args)
+
+        monkeypatch.setattr(pattern, "_build_children", tracking_build_children)
+
+        matches = pattern.matches(self.input_string)
+        assert len(matches) == 1
+        assert built == []
+
+        children = matches[0].children
+        assert built == [matches[0]]
+        assert [(child.name, child.span) for child in children] == [("season", (7, 8)), ("episode", (17, 19))]
+        assert [child.value for child in children] == [2, "ep"]
+        assert all(child.parent is matches[0] and child.match_index == 0 for child in children)
+        assert matches[0].names == {"season", "episode"}
+
+    def test_eager_when_children_are_used(self) -> None:
+        for kwargs in ({"children": True}, {"every": True}, {"validate_all": True}, {"private_children": True}):
+            pattern = RePattern(r"season (?P<season>\d+)", **kwargs)
+            match = pattern.matches(self.input_string)[0]
+            assert match._pending_children is None, kwargs
+
+    def test_children_setter_discards_pending(self) -> None:
+        match = RePattern(r"season (?P<season>\d+)").matches(self.input_string)[0]
+        match.children = Matches([Match(0, 6, name="replaced")])
+        assert [child.name for child in match.children] == ["replaced"]
+
+    def test_concurrent_reads(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        pattern = RePattern(r"season (?P<season>\d+) episode (?P<episode>\d+)")
+        built: list[Match] = []
+        build_children = pattern._build_children
+
+        def slow_build_children(match: Match, children: Matches, *args: Any) -> None:
+            built.append(match)
+            build_children(match, children, *args)
+            # children are published only once complete.
+            assert match._children is None
+            time.sleep(0.05)
+
+        monkeypatch.setattr(pattern, "_build_children", slow_build_children)
+        match = pattern.matches(self.input_string)[0]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: [child.span for child in match.children], range(8)))
+
+        assert results == [[(7, 8), (17, 19)]] * 8
+        assert built == [match]
+
+    def test_copy_before_read(self) -> None:
+        match = RePattern(r"season (?P<season>\d+)").matches(self.input_string)[0]
+        copied = copy.deepcopy(match)
+        assert copied.children[0].parent is copied
+        assert match.children[0].parent is match
@@ -1,14 +1,23 @@
 #!/usr/bin/env python
 from __future__ import annotations
 
+import asyncio
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any
 
+import pytest
+
 from ..rebulk import Rebulk
 from ..rules import Rule
+from ..validators import chars_surround, filter_chars_surround
 from . import rebulk_rules_module as rm
 
 if TYPE_CHECKING:
-    from ..match import Matches
+    from collections.abc import AsyncIterator, Iterable
+
+    from ..match import Match, Matches
 
 
 def test_rebulk_simple() -> None:
@@ -490,3 +499,181 @@ class TestImmutable:
 
         assert len(named) == 0
         assert len(matches) == 3
+
+
+class TestStreamMatches:
+    @staticmethod
+    def _bulk() -> Rebulk:
+        bulk = Rebulk()
+        bulk.regex(r"(?P<level>ERROR|WARNING) code=(?P<code>\d+)", children=True, formatter={"code": int})
+        bulk.regex(r"user=(?P<user>\w+)", children=True)
+        bulk.string("timeout", name="reason")
+        bulk.string("time", name="short")
+        return bulk
+
+    @staticmethod
+    def _input_string(lines: int) -> str:
+        levels = ["INFO", "ERROR", "WARNING"]
+        users = ["bob", "alice", "eve"]
+        return "".join(
+            f"2024-01-{i % 28 + 1:02d} {levels[i % 3]} code={i * 7} user={users[i % 5 % 3]}{' timeout' * (i % 2)}\n"
+            for i in range(lines)
+        )
+
+    @staticmethod
+    def _spans(matches: Iterable[Match]) -> list[tuple[tuple[int, int], str | None, Any, str | None]]:
+        return sorted((match.span, match.name, match.value, match.raw) for match in matches)
+
+    def test_stream_matches(self) -> None:
+        bulk = self._bulk()
+        input_string = self._input_string(250)
+        expected = self._spans(bulk.matches(input_string))
+        assert len(expected) > 600
+
+        for chunk_size in (500, 100000):
+            assert self._spans(bulk.stream_matches(io.StringIO(input_string), chunk_size=chunk_size, overlap=40)) == (
+                expected
+            )
+
+        input_string = input_string[:2000]
+        expected = [span for span in expected if span[0][1] <= len(input_string)]
+        for chunk_size in (1, 37):
+            assert self._spans(bulk.stream_matches(io.StringIO(input_string), chunk_size=chunk_size, overlap=40)) == (
+                expected
+            )
+
+        lines = input_string.splitlines(keepends=True)
+        assert self._spans(bulk.stream_matches(lines, chunk_size=500, overlap=40)) == expected
+
+    def test_stream_matches_relocated(self) -> None:
+        bulk = self._bulk()
+        input_string = "x" * 1000 + " ERROR code=42 user=bob"
+
+        matches = list(bulk.stream_matches([input_string[:500], input_string[500:]], chunk_size=100, overlap=30))
+        code = matches[1]
+        assert (code.name, code.span, code.value, code.raw) == ("code", (1012, 1014), 42, "42")
+        assert code.input_string == "ERROR code=42"
+        assert code.input_offset == 1001
+        assert code.parent is not None
+        assert code.parent.span == (1001, 1014)
+        assert code.parent.raw == "ERROR code=42"
+        assert [match.raw for match in code.parent.children] == ["ERROR", "42"]
+
+    def test_stream_matches_split_and_validate(self) -> None:
+        matches = list(
+            Rebulk().regex(r"[\w-]+").stream_matches(io.StringIO("hello big-world foo"), chunk_size=4, overlap=6)
+        )
+        big_world = matches[1]
+        assert (big_world.span, big_world.input_offset) == ((6, 15), 6)
+
+        assert [(match.span, match.raw) for match in big_world.split("-")] == [((6, 9), "big"), ((10, 15), "world")]
+        # streamed matches hold their own text only, so their surroundings are like input bounds.
+        assert chars_surround("x", big_world)
+        assert filter_chars_surround("x", [big_world]) == [big_world]
+
+    def test_stream_matches_bounded_windows(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        bulk = self._bulk()
+        input_string = self._input_string(1000)
+        windows: list[int] = []
+        matches = bulk.matches
+
+        def recording_matches(string: str, context: dict[str, Any] | None = None) -> Matches:
+            windows.append(len(string))
+            return matches(string, context)
+
+        monkeypatch.setattr(bulk, "matches", recording_matches)
+        assert len(list(bulk.stream_matches(io.StringIO(input_string), chunk_size=1000, overlap=50))) > 2000
+        assert len(windows) > 40
+        assert max(windows) <= 1000 + 2 * 50
+
+    def test_stream_matches_invalid(self) -> None:
+        with pytest.raises(ValueError, match="chunk_size"):
+            list(Rebulk().stream_matches(io.StringIO("text"), chunk_size=0))
+        assert list(Rebulk().string("text").stream_matches(io.StringIO(""))) == []
+
+
+class TestAsyncMatches:
+    input_string = "The quick brown fox jumps over the lazy dog"
+
+    @staticmethod
+    def _bulk(events: list[str]) -> Rebulk:
+        def func(input_string: str) -> tuple[int, int] | None:
+            events.append("pattern")
+            i = input_string.find("over")
+            if i > -1:
+                return i, i + len("over")
+            return None
+
+        return Rebulk().string("quick").functional(func).regex("f.x").functional(func)
+
+    def test_amatches(self) -> None:
+        events: list[str] = []
+        bulk = self._bulk(events)
+        expected = bulk.matches(self.input_string)
+        events.clear()
+
+        async def ticker() -> None:
+            for _ in range(5):
+                events.append("tick")
+                await asyncio.sleep(0)
+
+        async def run() -> Matches:
+            matches, _ = await asyncio.gather(bulk.amatches(self.input_string), ticker())
+            return matches
+
+        assert list(asyncio.run(run())) == list(expected)
+        assert events.count("pattern") == 2
+        first, last = events.index("pattern"), len(events) - 1 - events[::-1].index("pattern")
+        assert "tick" in events[first:last]
+
+    def test_amatches_executor(self) -> None:
+        threads: list[int] = []
+
+        def func(input_string: str) -> tuple[int, int]:
+            threads.append(threading.get_ident())
+            return 0, 3
+
+        bulk = Rebulk().functional(func)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            matches = asyncio.run(bulk.amatches("The fox", executor=executor))
+        assert [match.value for match in matches] == ["The"]
+        assert threads
+        assert threads[0] != threading.get_ident()
+
+    @pytest.mark.parametrize("use_executor", [False, True])
+    def test_amatches_many(self, use_executor: bool) -> None:
+        bulk = Rebulk().regex(r"\d+")
+        reads: list[int] = []
+
+        async def strings() -> AsyncIterator[str]:
+            for i in range(20):
+                reads.append(i)
+                await asyncio.sleep(0)
+                yield f"line {i}"
+
+        async def run(executor: ThreadPoolExecutor | None) -> list[str]:
+            values = []
+            async for matches in bulk.amatches_many(strings(), executor=executor, max_pending=3):
+                values.append(matches[0].value)
+                assert len(reads) - len(values) <= 2
+            return values
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            values = asyncio.run(run(executor if use_executor else None))
+        assert values == [str(i) for i in range(20)]
+
+    def test_amatches_many_iterable(self) -> None:
+        bulk = Rebulk().regex(r"\d+")
+
+        async def run() -> list[list[str]]:
+            return [[match.value for match in matches] async for matches in bulk.amatches_many(["1 2", "", "3"])]
+
+        assert asyncio.run(run()) == [["1", "2"], [], ["3"]]
+
+        async def invalid() -> None:
+            async for _ in bulk.amatches_many(["1"], max_pending=0):
+                pass  # pragma: no cover
+
+        with pytest.raises(ValueError, match="max_pending"):
+            asyncio.run(invalid())
@@ -1,4 +1,8 @@
 #!/usr/bin/env python
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
 import pytest
 
 from rebulk.test.default_rules_module import (
@@ -19,7 +23,18 @@ from rebulk.test.default_rules_module import (
 )
 
 from ..match import Match, Matches
-from ..rules import Rules
+from ..rebulk import Rebulk
+from ..rules import (
+    AppendTags,
+    ConflictingRules,
+    Consequence,
+    CustomRule,
+    RemoveMatch,
+    RenameMatch,
+    Rule,
+    Rules,
+    toposort_rules,
+)
 from . import rules_module as rm
 from .rules_module import Rule0, Rule1, Rule1Disabled, Rule2, Rule3
 
@@ -206,3 +221,272 @@ def test_rule_repr() -> None:
     assert str(Rule1()) == "<Rule1>"
     assert str(Rule2()) == "<Rule2>"
     assert str(Rule1Disabled()) == "<Disabled Rule1>"
+
+
+def test_rules_schedule() -> None:
+    rule0, rule1, rule2, rule3 = Rule0(), Rule1(), Rule2(), Rule3()
+    rules = Rules(rule0, rule2, rule1)
+
+    schedule = rules.schedule
+    assert [group for _, group, _ in schedule] == [[rule2], [rule1], [rule0]]
+    assert rules.schedule is schedule
+
+    rules.append(rule3)
+    assert rules.schedule is not schedule
+    assert [group for _, group, _ in rules.schedule] == [[rule3], [rule2], [rule1], [rule0]]
+
+    schedule = rules.schedule
+    rules.remove(rule1)
+    assert rules.schedule is not schedule
+    assert [group for _, group, _ in rules.schedule] == [[rule0, rule3], [rule2]]
+
+    rules.reverse()
+    assert [group for _, group, _ in rules.schedule] == [[rule3, rule0], [rule2]]
+
+    del rules[0]
+    rules += [rule1]
+    assert [group for _, group, _ in rules.schedule] == [[rule2], [rule1], [rule0]]
+
+
+def test_rebulk_reuses_rules_schedule(monkeypatch: pytest.MonkeyPatch) -> None:
+    toposorted: list[list[CustomRule]] = []
+
+    def counting_toposort_rules(rules: list[CustomRule]) -> Any:
+        toposorted.append(rules)
+        return toposort_rules(rules)
+
+    monkeypatch.setattr("rebulk.rules.toposort_rules", counting_toposort_rules)
+
+    def child_disabled(context: dict[str, Any] | None) -> bool:
+        return bool(context and context.get("no_child"))
+
+    child = Rebulk(disabled=child_disabled, default_rules=False).rules(Rule0)
+    bulk = Rebulk(default_rules=False).rules(Rule3).rebulk(child)
+
+    for _ in range(3):
+        bulk.matches("", {"when": True})
+    assert toposorted == [[Rule3(), Rule0()]]
+
+    bulk.matches("", {"when": True, "no_child": True})
+    bulk.matches("", {"when": True, "no_child": True})
+    assert toposorted[1:] == [[Rule3()]]
+
+    child.rules(Rule2)
+    assert [m.span for m in bulk.matches("", {"when": True})] == [(3, 4), (3, 4), (3, 4)]
+    assert toposorted[2:] == [[Rule3(), Rule0(), Rule2()]]
+
+
+class RuleTriggered(Rule):
+    trigger_names = ("episode", "season")
+    trigger_tags = "extra"
+    consequence = RemoveMatch
+
+    def when(self, matches: Matches, context: dict[str, Any] | None) -> Any:
+        return matches.named("episode")
+
+
+def test_rule_triggers() -> None:
+    rules = Rules(RuleTriggered)
+
+    matches = Matches([Match(1, 2, name="title", tags=["other"])])
+    rules.execute_all_rules(matches, {})
+    rules.execute_all_rules(Matches(), {})
+    assert rules.skipped == {RuleTriggered(): 2}
+
+    for match in (
+        Match(1, 2, name="episode"),
+        Match(1, 2, name="season"),
+        Match(1, 2, name="title", tags=["extra"]),
+    ):
+        rules.execute_all_rules(Matches([match]), {})
+    assert rules.skipped == {RuleTriggered(): 2}
+
+    matches = Matches([Match(1, 2, name="episode"), Match(3, 4, name="title")])
+    rules.execute_all_rules(matches, {})
+    assert [match.name for match in matches] == ["title"]
+
+    # Triggers are checked against matches once consequences of previous groups are applied.
+    matches.remove(matches[0])
+    rules.execute_all_rules(matches, {})
+    assert rules.skipped == {RuleTriggered(): 3}
+
+
+def test_rebulk_skipped_rules() -> None:
+    bulk = Rebulk().regex(r"\d+", name="episode").rules(RuleTriggered)
+
+    assert not bulk.matches("abc")
+    assert not bulk.matches("a12")
+    assert not bulk.matches("abc")
+    assert bulk.skipped_rules == {RuleTriggered(): 2}
+
+
+class CountingRemoveMatch(RemoveMatch):
+    instances = 0
+
+    def __init__(self) -> None:
+        CountingRemoveMatch.instances += 1
+
+
+class RuleAlwaysFires(Rule):
+    consequence = (CountingRemoveMatch, RenameMatch("renamed"))
+
+    def when(self, matches: Matches, context: dict[str, Any] | None) -> Any:
+        return [matches.named("digits"), matches.named("letters")]
+
+
+def test_consequence_resolved_once() -> None:
+    """
+    Micro-benchmark of a rule firing on every input: consequences are resolved once for the rule.
+    """
+    bulk = Rebulk().regex(r"\d+", name="digits").regex(r"[a-z]+", name="letters").rules(RuleAlwaysFires)
+    CountingRemoveMatch.instances = 0
+
+    for i in range(2000):
+        matches = bulk.matches(f"abc{i}")
+        assert [(match.name, match.value) for match in matches] == [("renamed", "abc")]
+
+    # consequence classes other than built-in ones may keep state, so they get a new instance for each call.
+    assert CountingRemoveMatch.instances == 2000
+
+    # consequence is resolved again when it's replaced.
+    rule: Any = RuleAlwaysFires()
+    matches = Matches([Match(0, 1, name="digits"), Match(1, 2, name="letters")])
+    rule.then(matches, rule.when(matches, {}), {})
+    assert [match.name for match in matches] == ["renamed"]
+
+    rule.consequence = RemoveMatch
+    rule.then(matches, matches.named("renamed"), {})
+    assert not matches
+
+
+
+class AppendOnce(Consequence):
+    """
+    Stateful consequence, appending each match once per call.
+    """
+
+    def __init__(self) -> None:
+        self.appended: set[tuple[int, int]] = set()
+
+    def then(self, matches: Matches, when_response: Any, context: dict[str, Any] | None) -> Any:
+        for match in when_response:
+            if match.span not in self.appended:
+                self.appended.add(match.span)
+                matches.append(match)
+
+
+class AppendNumber(Rule):
+    consequence = AppendOnce
+
+    def when(self, matches: Matches, context: dict[str, Any] | None) -> Any:
+        return [Match(0, 1, name="number")]
+
+
+class AppendOtherNumber(AppendNumber):
+    pass
+
+
+def test_stateful_consequence_class() -> None:
+    bulk = Rebulk().rules(AppendNumber, AppendOtherNumber)
+
+    # state kept on the consequence instance doesn't leak between calls, nor between rules.
+    for _ in range(2):
+        assert [match.span for match in bulk.matches("1")] == [(0, 1), (0, 1)]
+
+
+when_barrier = threading.Barrier(2, timeout=5)
+
+
+class RemoveDigits(Rule):
+    consequence = RemoveMatch
+
+    def when(self, matches: Matches, context: dict[str, Any] | None) -> Any:
+        when_barrier.wait()
+        return matches.named("digits")
+
+
+class TagLetters(Rule):
+    consequence = AppendTags(["letters"])
+
+    def when(self, matches: Matches, context: dict[str, Any] | None) -> Any:
+        when_barrier.wait()
+        # consequences of other rules of the group are not applied yet.
+        assert matches.named("digits")
+        return matches.named("letters")
+
+
+class TagAll(Rule):
+    consequence = AppendTags(["all"])
+
+    def when(self, matches: Matches, context: dict[str, Any] | None) -> Any:
+        when_barrier.wait()
+        return list(matches)
+
+
+def test_execute_rules_concurrently() -> None:
+    matches = Matches([Match(0, 3, name="letters"), Match(3, 5, name="digits")])
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # when conditions wait each other, so they must run concurrently.
+        ret = Rules(TagLetters, RemoveDigits).execute_all_rules(matches, {}, executor)
+
+    assert [rule for rule, _ in ret] == [TagLetters(), RemoveDigits()]
+    assert [(match.name, match.tags) for match in matches] == [("letters", ["letters"])]
+
+
+def test_execute_rules_concurrently_conflict() -> None:
+    matches = Matches([Match(0, 3, name="letters"), Match(3, 5, name="digits")])
+
+    with ThreadPoolExecutor(max_workers=2) as executor, pytest.raises(ConflictingRules) as excinfo:
+        Rules(TagAll, RemoveDigits).execute_all_rules(matches, {}, executor)
+
+    assert excinfo.value.conflicts == [(TagAll(), matches[1], RemoveDigits(), matches[1])]
+    # consequences are not applied on conflict.
+    assert [(match.name, match.tags) for match in matches] == [("letters", []), ("digits", [])]
+
+
+class TagAround(Rule):
+    consequence = AppendTags(["around"])
+
+    def when(self, matches: Matches, context: dict[str, Any] | None) -> Any:
+        when_barrier.wait()
+        return [Match(match.start - 1, match.end, name="around") for match in matches.named("digits")]
+
+
+def test_execute_rules_concurrently_overlapping_conflict() -> None:
+    matches = Matches([Match(0, 3, name="letters"), Match(3, 5, name="digits")])
+
+    with ThreadPoolExecutor(max_workers=2) as executor, pytest.raises(ConflictingRules) as excinfo:
+        Rules(RemoveDigits, TagAround).execute_all_rules(matches, {}, executor)
+
+    assert [
+        (rule, match.span, other, other_match.span) for rule, match, other, other_match in excinfo.value.conflicts
+    ] == [(RemoveDigits(), (3, 5), TagAround(), (2, 5))]
+    assert [match.name for match in matches] == ["letters", "digits"]
+
+
+class ModifyMatches(Rule):
+    consequence = RemoveMatch
+
+    def when(self, matches: Matches, context: dict[str, Any] | None) -> Any:
+        when_barrier.wait()
+        matches.append(Match(5, 6, name="added"))
+
+
+def test_execute_rules_concurrently_snapshot() -> None:
+    matches = Matches([Match(0, 3, name="letters"), Match(3, 5, name="digits")])
+
+    with ThreadPoolExecutor(max_workers=2) as executor, pytest.raises(TypeError, match="read-only"):
+        Rules(TagLetters, ModifyMatches).execute_all_rules(matches, {}, executor)
+
+    assert [match.name for match in matches] == ["letters", "digits"]
+
+
+def test_rebulk_rules_executor() -> None:
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        bulk = Rebulk(rules_executor=executor).regex(r"\d+", name="digits").regex(r"[a-z]+", name="letters")
+        bulk.rules(RemoveDigits, TagLetters)
+
+        matches = bulk.matches("abc12")
+
+    assert [(match.name, match.tags) for match in matches] == [("letters", ["letters"])]
@@ -13,10 +13,17 @@
 #   - port to pytest
 from __future__ import annotations
 
+import random
+from functools import reduce
+from typing import TYPE_CHECKING, Any
+
 import pytest
 
 from ..toposort import CyclicDependency, toposort, toposort_flatten
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
 class TestCase:
     def test_simple(self) -> None:
@@ -100,6 +107,80 @@ class TestCase:
         assert data == orig
 
 
+def _reference_toposort(data: dict[int, set[int]]) -> list[set[int]]:
+    """
+    Original set-based algorithm, used as reference for the in-degree based implementation.
+    """
+    if len(data) == 0:
+        return []
+    data = {item: dep - {item} for item, dep in data.items()}
+    extra_items_in_deps = reduce(set.union, data.values()) - set(data.keys())
+    data.update({item: set() for item in extra_items_in_deps})
+    results = []
+    while True:
+        ordered = {item for item, dep in data.items() if len(dep) == 0}
+        if not ordered:
+            break
+        results.append(ordered)
+        data = {item: (dep - ordered) for item, dep in data.items() if item not in ordered}
+    if len(data) != 0:
+        raise CyclicDependency(data)
+    return results
+
+
+def _outcome(function: Callable[[], list[set[int]]]) -> tuple[list[set[int]], list[tuple[Any, set[Any]]] | None]:
+    """
+    Layers, or items in cycle with their remaining dependencies, in order.
+    """
+    try:
+        return function(), None
+    except CyclicDependency as error:
+        return [], list(error.cyclic.items())
+
+
+def _random_graph(rnd: random.Random, size: int, acyclic: bool) -> dict[int, set[int]]:
+    items = list(range(size))
+    rnd.shuffle(items)
+    data = {}
+    for i, item in enumerate(items):
+        candidates = items[i:] if acyclic else items
+        data[item] = set(rnd.sample(candidates, rnd.randint(0, min(4, len(candidates)))))
+    # Keep some items as dependencies only.
+    for item in rnd.sample(items, size // 5):
+        if not any(item in deps for key, deps in data.items() if key != item):
+            continue
+        del data[item]
+    return data
+
+
+class TestCaseRandom:
+    @pytest.mark.parametrize("seed", range(200))
+    def test_same_as_reference(self, seed: int) -> None:
+        rnd = random.Random(seed)
+        data = _random_graph(rnd, rnd.randint(1, 40), acyclic=seed % 2 == 0)
+        orig = {item: set(deps) for item, deps in data.items()}
+        assert _outcome(lambda: list(toposort(data))) == _outcome(lambda: _reference_toposort(data))
+        assert data == orig
+
+    def test_large_graph(self) -> None:
+        # Long chain of dependencies with many items in each layer, which used to be quadratic.
+        size, width = 2000, 10
+        data = {
+            item: {item - width - offset for offset in range(3) if item - width - offset >= 0} for item in range(size)
+        }
+        results = list(toposort(data))
+        assert len(results) == size // width
+        assert results == [set(range(i, i + width)) for i in range(0, size, width)]
+
+        data[0] = {size - 1}
+        with pytest.raises(CyclicDependency) as reference_info:
+            _reference_toposort(data)
+        with pytest.raises(CyclicDependency) as exc_info:
+            list(toposort(data))
+        assert 0 in exc_info.value.cyclic
+        assert exc_info.value.cyclic == reference_info.value.cyclic
+
+
 class TestCaseAll:
     def test_sort_flatten(self) -> None:
         data = {
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from ..utils import extend_safe
+from ..utils import _CASEFOLDED, casefold, casefold_scope, extend_safe, find_all, find_all_spans
 
 
 def test_extend_safe_hashable() -> None:
@@ -27,3 +27,32 @@ def test_extend_safe_mixed_falls_back_without_duplicating() -> None:
     target: list[Any] = [1]
     extend_safe(target, [1, 2, ["x"], ["x"], 2])
     assert target == [1, 2, ["x"]]
+
+
+def test_casefold() -> None:
+    assert casefold("Große") == ("grosse", (0, 1, 2, 3, 3, 4, 5))
+    assert casefold("GROSS") == ("gross", None)
+
+
+def test_casefold_scope() -> None:
+    assert casefold("Große") is not casefold("Große")
+    with casefold_scope():
+        folded = casefold("Große")
+        with casefold_scope():
+            assert casefold("Große") is folded
+        assert casefold("Große") is folded
+    # casefolded strings are not kept after the block.
+    assert _CASEFOLDED.get() is None
+
+
+def test_find_all_spans_ignore_case() -> None:
+    string = "ß STRASSE ẞtraße"
+    assert list(find_all_spans(string, "SS", ignore_case=True)) == [(0, 1), (6, 8), (10, 11), (14, 15)]
+    assert list(find_all_spans(string, "SS", 1, 14, ignore_case=True)) == [(6, 8), (10, 11)]
+    assert list(find_all_spans(string, "SS", -6, ignore_case=True)) == [(10, 11), (14, 15)]
+    assert list(find_all_spans(string, "straße", ignore_case=True)) == [(2, 9)]
+    assert list(find_all_spans(string, "sstraße", ignore_case=True)) == [(10, 16)]
+    # matches starting or ending inside the casefolding of a character are ignored.
+    assert list(find_all_spans(string, "straße", 3, ignore_case=True)) == []
+    assert list(find_all(string, "strasse", ignore_case=True)) == [2]
+    assert list(find_all_spans(string, "SS")) == [(6, 8)]
@@ -1,10 +1,29 @@
 #!/usr/bin/env python
 
-from functools import partial
-
-from rebulk.pattern import StringPattern
+from __future__ import annotations
 
-from ..validators import chars_after, chars_before, chars_surround, validators
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from rebulk.match import Match
+from rebulk.pattern import RePattern, StringPattern
+
+from ..validators import (
+    chars_after,
+    chars_before,
+    chars_surround,
+    filter_chars_after,
+    filter_chars_before,
+    filter_chars_surround,
+    span_chars_after,
+    span_chars_before,
+    span_chars_surround,
+    span_validators,
+    validators,
+)
+
+if TYPE_CHECKING:
+    import pytest
 
 chars = " _."
 left = partial(chars_before, chars)
@@ -60,3 +79,84 @@ def test_chain() -> None:
 
     matches = list(StringPattern("word", validator=validators(left, right)).matches("word"))
     assert len(matches) == 1
+
+
+def test_filter_chars() -> None:
+    input_string = "word xwordx word_wordx.word"
+    candidates = list(StringPattern("word").matches(input_string))
+    assert [match.start for match in candidates] == [0, 6, 12, 17, 23]
+
+    assert [match.start for match in filter_chars_before(chars, candidates)] == [0, 12, 17, 23]
+    assert [match.start for match in filter_chars_after(chars, candidates)] == [0, 12, 23]
+    assert [match.start for match in filter_chars_surround(chars, candidates)] == [0, 12, 23]
+
+    assert filter_chars_surround(set(chars), candidates) == filter_chars_surround(chars, candidates)
+    assert filter_chars_surround(chars, []) == []
+
+
+def test_filter_chars_several_inputs() -> None:
+    candidates = list(StringPattern("word").matches("xword")) + list(StringPattern("word").matches(".word"))
+
+    assert [match.input_string for match in filter_chars_before(chars, candidates)] == [".word"]
+
+
+
+
+class CountingStr(str):
+    reads = 0
+
+    def __getitem__(self, index: Any) -> str:
+        CountingStr.reads += 1
+        return super().__getitem__(index)
+
+
+def test_filter_chars_reads_surroundings_only() -> None:
+    # Only characters around candidates are read, whatever the input size, so filtering a few candidates of a large
+    # input is cheap.
+    input_string = CountingStr("x" * 1_000_000 + " word_word.")
+    candidates = [Match(1_000_001, 1_000_005, input_string=input_string), Match(6, 10, input_string=input_string)]
+
+    CountingStr.reads = 0
+    assert filter_chars_surround(chars, candidates) == candidates[:1]
+    assert CountingStr.reads == 3
+
+def test_filter_chars_without_input_string() -> None:
+    candidates = [Match(0, 4), Match(2, 6)]
+
+    assert filter_chars_before(chars, candidates) == candidates
+    assert filter_chars_surround(chars, candidates) == candidates
+
+def test_span_validator() -> None:
+    input_string = "xxxwordxxx xxx_word.xxx word"
+    span_validator = partial(span_chars_surround, chars)
+
+    matches = StringPattern("word", span_validator=span_validator).matches(input_string)
+    assert [match.start for match in matches] == [15, 24]
+    assert all(match.match_index == index for index, match in enumerate(matches))
+
+    matches = RePattern(r"w(?P<rest>ord)", span_validator=span_validator).matches(input_string)
+    assert [match.start for match in matches] == [15, 24]
+
+
+def test_span_validator_skips_match_creation(monkeypatch: pytest.MonkeyPatch) -> None:
+    built: list[Match] = []
+    original_init = Match.__init__
+
+    def tracking_init(self: Match, *args: Any, **kwargs: Any) -> None:
+        original_init(self, *args, **kwargs)
+        built.append(self)
+
+    monkeypatch.setattr(Match, "__init__", tracking_init)
+
+    matches = StringPattern("word", span_validator=lambda input_string, start, end: start == 0).matches("word word")
+    assert len(matches) == 1
+    assert len(built) == 1
+
+
+def test_span_chain() -> None:
+    span_validator = span_validators(partial(span_chars_before, chars), partial(span_chars_after, chars))
+
+    assert not StringPattern("word", span_validator=span_validator).matches("xxxword xxx")
+    assert not StringPattern("word", span_validator=span_validator).matches("xxx.wordxxx")
+    assert StringPattern("word", span_validator=span_validator).matches("xxx word_xxx")
+    assert StringPattern("word", span_validator=span_validator).matches("word")
@@ -4,11 +4,11 @@
 # Version 2.0 (http://www.apache.org/licenses/LICENSE-2.0).
 #
 # Local changes: CyclicDependency error (upstream pull request #2), Python 3
-# only, fully type-annotated.
+# only, fully type-annotated, Kahn's algorithm with in-degree counters instead
+# of rebuilding remaining dependencies for each set.
 
 from __future__ import annotations
 
-from functools import reduce
 from typing import TYPE_CHECKING, Any, TypeVar, cast
 
 if TYPE_CHECKING:
@@ -41,24 +41,38 @@ def toposort(data: dict[_T, set[_T]]) -> Iterator[set[_T]]:
     if len(data) == 0:
         return
 
-    # Copy the input so as to leave it unmodified.
-    data = data.copy()
+    # Dependencies of each item, ignoring self dependencies, without modifying the input.
+    dependencies: dict[_T, set[_T]] = {}
+    # Items depending on each item, and number of dependencies of each item not yielded yet.
+    dependents: dict[_T, list[_T]] = {}
+    pending: dict[_T, int] = {}
+    for item, deps in data.items():
+        deps = set(deps)
+        deps.discard(item)
+        dependencies[item] = deps
+        pending[item] = len(deps)
+        for dep in deps:
+            dependents.setdefault(dep, []).append(item)
+    # Add items that are only dependencies, they don't depend on anything.
+    for dep in dependents:
+        if dep not in pending:
+            dependencies[dep] = set()
+            pending[dep] = 0
 
-    # Ignore self dependencies.
-    for k, v in data.items():
-        v.discard(k)
-    # Find all items that don't depend on anything.
-    extra_items_in_deps = reduce(set.union, data.values()) - set(data.keys())
-    # Add empty dependences where needed.
-    data.update({item: set() for item in extra_items_in_deps})
-    while True:
-        ordered = {item for item, dep in data.items() if len(dep) == 0}
-        if not ordered:
-            break
+    ordered = {item for item, count in pending.items() if count == 0}
+    yielded: set[_T] = set()
+    while ordered:
+        yielded |= ordered
+        next_ordered: set[_T] = set()
+        for item in ordered:
+            for dependent in dependents.get(item, ()):
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    next_ordered.add(dependent)
         yield ordered
-        data = {item: (dep - ordered) for item, dep in data.items() if item not in ordered}
-    if len(data) != 0:
-        raise CyclicDependency(data)
+        ordered = next_ordered
+    if len(yielded) != len(pending):
+        raise CyclicDependency({item: deps - yielded for item, deps in dependencies.items() if item not in yielded})
 
 
 def toposort_flatten(data: dict[_T, set[_T]], sort: bool = True) -> list[_T]:
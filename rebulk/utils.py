@@ -5,10 +5,16 @@ Various utilities functions
 
 from __future__ import annotations
 
+import re
+from bisect import bisect_left
 from collections.abc import Container, Iterable, Iterator, MutableSet
+from contextlib import contextmanager
+from contextvars import ContextVar
 from types import GeneratorType
 from typing import Any, TypeVar
 
+from .encoded import input_buffer
+
 _T = TypeVar("_T")
 
 
@@ -53,8 +59,12 @@ def find_all(
     :rtype: __generator[str]
     """
     if ignore_case:
-        sub = sub.lower()
-        string = string.lower()
+        for span_start, _ in find_all_spans(string, sub, start, end, ignore_case=True):
+            yield span_start
+        return
+    if not isinstance(string, str):
+        # find of mmap doesn't accept None bounds.
+        start, end, _ = slice(start, end).indices(len(string))
     while True:
         start = string.find(sub, start, end)
         if start == -1:
@@ -63,6 +73,122 @@ def find_all(
         start += len(sub)
 
 
+# Casefolded strings of the current casefold_scope, if any.
+_CASEFOLDED: ContextVar[dict[str, tuple[str, tuple[int, ...] | None]] | None] = ContextVar("casefolded", default=None)
+
+
+@contextmanager
+def casefold_scope() -> Iterator[None]:
+    """
+    Keep strings casefolded by casefold until the block exits, so that an input string is casefolded once for all
+    case-insensitive patterns searching it. Nested blocks use the outermost one.
+    """
+    if _CASEFOLDED.get() is not None:
+        yield
+        return
+    token = _CASEFOLDED.set({})
+    try:
+        yield
+    finally:
+        _CASEFOLDED.reset(token)
+
+
+def casefold(string: str) -> tuple[str, tuple[int, ...] | None]:
+    """
+    Casefold a string, with the index in the original string of each character of the casefolded string.
+
+    Inside a casefold_scope block, a string is casefolded once.
+
+    >>> casefold('Straße')
+    ('strasse', (0, 1, 2, 3, 4, 4, 5, 6))
+
+    :param string: the input string
+    :type string: str
+    :return: the casefolded string, and the original index of each character followed by the original length, or
+    None if casefolding doesn't change the length of the string.
+    :rtype: tuple
+    """
+    casefolded = _CASEFOLDED.get()
+    if casefolded is None:
+        return _casefold(string)
+    ret = casefolded.get(string)
+    if ret is None:
+        ret = casefolded[string] = _casefold(string)
+    return ret
+
+
+def _casefold(string: str) -> tuple[str, tuple[int, ...] | None]:
+    folded = string.casefold()
+    if len(folded) == len(string):
+        # casefolding gives at least one character for each character, so they all give a single one.
+        return folded, None
+    offsets: list[int] = []
+    for index, char in enumerate(string):
+        offsets.extend([index] * len(char.casefold()))
+    offsets.append(len(string))
+    return folded, tuple(offsets)
+
+
+def find_all_spans(
+    string: str,
+    sub: str,
+    start: int | None = None,
+    end: int | None = None,
+    ignore_case: bool = False,
+    **kwargs: Any,
+) -> Iterator[tuple[int, int]]:
+    """
+    Return all spans in string s where substring sub is found, such that sub is contained in the slice s[start:end].
+
+    If ignore_case is True, string and sub are casefolded, so a span may be longer or shorter than sub.
+
+    >>> list(find_all_spans('Die Straße', 'STRASSE', ignore_case=True))
+    [(4, 10)]
+
+    :param string: the input string
+    :type string: str
+    :param sub: the substring
+    :type sub: str
+    :return: all (start, end) spans in the input string
+    :rtype: __generator[tuple]
+    """
+    if not ignore_case:
+        for index in find_all(string, sub, start, end):
+            yield index, index + len(sub)
+        return
+    if isinstance(sub, bytes):
+        # bytes-like input can't be casefolded, only ASCII letters are compared without case.
+        if not sub.isascii():
+            raise ValueError(
+                f"ignore_case can't search bytes-like input for non-ASCII {sub!r}. Decode the input to search it."
+            )
+        start, end, _ = slice(start, end).indices(len(string))
+        for match in re.compile(re.escape(sub), re.IGNORECASE).finditer(input_buffer(string), start, end):
+            yield match.span()
+        return
+    folded, offsets = casefold(string)
+    sub = sub.casefold()
+    if offsets is None:
+        for index in find_all(folded, sub, start, end):
+            yield index, index + len(sub)
+        return
+    start, end, _ = slice(start, end).indices(len(string))
+    folded_start = bisect_left(offsets, start)
+    folded_end = bisect_left(offsets, end)
+    while True:
+        folded_start = folded.find(sub, folded_start, folded_end)
+        if folded_start == -1:
+            return
+        folded_stop = folded_start + len(sub)
+        # Ignore matches starting or ending inside the casefolding of a single character.
+        span_start, span_end = offsets[folded_start], offsets[folded_stop]
+        if (not folded_start or offsets[folded_start - 1] != span_start) and offsets[folded_stop - 1] != span_end:
+            yield span_start, span_end
+            folded_start = folded_stop
+        else:
+            folded_start += 1
+
+
 def get_first_defined(
     data: Container[_T],
     keys: Iterable[_T],
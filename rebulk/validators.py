@@ -3,18 +3,46 @@
 Validator functions to use in patterns.
 
 All those function have last argument as match, so it's possible to use functools.partial to bind previous arguments.
+
+``span_*`` functions are span-level equivalents taking ``(input_string, start, end)`` as last arguments, to be used as
+``span_validator`` so that candidates are rejected before any ``Match`` object is built.
+
+``filter_*`` functions are batch equivalents, filtering a whole list of candidate matches in one call.
+
+On bytes-like input, characters are encoded with the encoding of the input, and compared with its bytes.
 """
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
+
+from .encoded import encode_chars, input_encoding
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Container
+    from collections.abc import Callable, Container, Iterable
 
     from .match import Match
 
 
+def _encoded_char_before_in(chars: Container[str], input_string: Any, index: int) -> bool:
+    """
+    Check if the character before index of a bytes-like input is in chars.
+    """
+    return any(
+        len(char) <= index and input_string[index - len(char) : index] == char
+        for char in encode_chars(chars, input_encoding(input_string))
+    )
+
+
+def _encoded_char_after_in(chars: Container[str], input_string: Any, index: int) -> bool:
+    """
+    Check if the character after index of a bytes-like input is in chars.
+    """
+    return any(
+        input_string[index : index + len(char)] == char for char in encode_chars(chars, input_encoding(input_string))
+    )
+
+
 def chars_before(chars: Container[str], match: Match) -> bool:
     """
     Validate the match if left character is in a given sequence.
@@ -26,9 +54,14 @@ def chars_before(chars: Container[str], match: Match) -> bool:
     :return:
     :rtype:
     """
-    if match.start <= 0:
+    # input_string may hold only a part of the input, starting at input_offset.
+    start = match.start - match.input_offset
+    if start <= 0:
         return True
-    return cast("str", match.input_string)[match.start - 1] in chars
+    input_string = match.input_string
+    if isinstance(input_string, str):
+        return input_string[start - 1] in chars
+    return _encoded_char_before_in(chars, input_string, start)
 
 
 def chars_after(chars: Container[str], match: Match) -> bool:
@@ -43,9 +76,12 @@ def chars_after(chars: Container[str], match: Match) -> bool:
     :rtype:
     """
     input_string = cast("str", match.input_string)
-    if match.end >= len(input_string):
+    end = match.end - match.input_offset
+    if end >= len(input_string):
         return True
-    return input_string[match.end] in chars
+    if isinstance(input_string, str):
+        return input_string[end] in chars
+    return _encoded_char_after_in(chars, input_string, end)
 
 
 def chars_surround(chars: Container[str], match: Match) -> bool:
@@ -62,6 +98,176 @@ def chars_surround(chars: Container[str], match: Match) -> bool:
     return chars_before(chars, match) and chars_after(chars, match)
 
 
+def span_chars_before(chars: Container[str], input_string: str, start: int, end: int) -> bool:
+    """
+    Validate the span if left character is in a given sequence.
+
+    :param chars:
+    :type chars:
+    :param input_string:
+    :type input_string: str
+    :param start:
+    :type start: int
+    :param end:
+    :type end: int
+    :return:
+    :rtype:
+    """
+    if start <= 0:
+        return True
+    if isinstance(input_string, str):
+        return input_string[start - 1] in chars
+    return _encoded_char_before_in(chars, input_string, start)
+
+
+def span_chars_after(chars: Container[str], input_string: str, start: int, end: int) -> bool:
+    """
+    Validate the span if right character is in a given sequence.
+
+    :param chars:
+    :type chars:
+    :param input_string:
+    :type input_string: str
+    :param start:
+    :type start: int
+    :param end:
+    :type end: int
+    :return:
+    :rtype:
+    """
+    if end >= len(input_string):
+        return True
+    if isinstance(input_string, str):
+        return input_string[end] in chars
+    return _encoded_char_after_in(chars, input_string, end)
+
+
+def span_chars_surround(chars: Container[str], input_string: str, start: int, end: int) -> bool:
+    """
+    Validate the span if surrounding characters are in a given sequence.
+
+    :param chars:
+    :type chars:
+    :param input_string:
+    :type input_string: str
+    :param start:
+    :type start: int
+    :param end:
+    :type end: int
+    :return:
+    :rtype:
+    """
+    return span_chars_before(chars, input_string, start, end) and span_chars_after(chars, input_string, start, end)
+
+
+def span_validators(*chained_validators: Callable[[str, int, int], bool]) -> Callable[[str, int, int], bool]:
+    """
+    Creates a span validator chain from several span validator functions.
+
+    :param chained_validators:
+    :type chained_validators:
+    :return:
+    :rtype:
+    """
+
+    def span_validator_chain(input_string: str, start: int, end: int) -> bool:
+        return all(chained_validator(input_string, start, end) for chained_validator in chained_validators)
+
+    return span_validator_chain
+
+
+def _filter_chars(
+    chars: Container[str],
+    matches: Iterable[Match],
+    before: bool,
+    after: bool,
+    validator: Callable[[Container[str], Match], bool],
+) -> list[Match]:
+    """
+    Filter matches on surrounding characters, testing the characters around each match in a set of chars built once
+    for all matches.
+
+    :param chars:
+    :type chars:
+    :param matches:
+    :type matches:
+    :param before: check the left character
+    :type before: bool
+    :param after: check the right character
+    :type after: bool
+    :param validator: single match validator to use when chars is not a string
+    :type validator:
+    :return:
+    :rtype:
+    """
+    if not isinstance(chars, str):
+        return [match for match in matches if validator(chars, match)]
+    chars_set = frozenset(chars)
+    ret = []
+    for match in matches:
+        input_string: Any = match.input_string
+        if input_string is None:
+            # Surrounding characters are unknown, like at input boundaries.
+            ret.append(match)
+            continue
+        # input_string may hold only a part of the input, starting at input_offset.
+        start, end = match.start - match.input_offset, match.end - match.input_offset
+        if isinstance(input_string, str):
+            if before and start > 0 and input_string[start - 1] not in chars_set:
+                continue
+            if after and end < len(input_string) and input_string[end] not in chars_set:
+                continue
+        else:
+            if before and start > 0 and not _encoded_char_before_in(chars, input_string, start):
+                continue
+            if after and end < len(input_string) and not _encoded_char_after_in(chars, input_string, end):
+                continue
+        ret.append(match)
+    return ret
+
+
+def filter_chars_before(chars: Container[str], matches: Iterable[Match]) -> list[Match]:
+    """
+    Filter matches whose left character is in a given sequence (batch equivalent of chars_before).
+
+    :param chars:
+    :type chars:
+    :param matches:
+    :type matches:
+    :return:
+    :rtype:
+    """
+    return _filter_chars(chars, matches, True, False, chars_before)
+
+
+def filter_chars_after(chars: Container[str], matches: Iterable[Match]) -> list[Match]:
+    """
+    Filter matches whose right character is in a given sequence (batch equivalent of chars_after).
+
+    :param chars:
+    :type chars:
+    :param matches:
+    :type matches:
+    :return:
+    :rtype:
+    """
+    return _filter_chars(chars, matches, False, True, chars_after)
+
+
+def filter_chars_surround(chars: Container[str], matches: Iterable[Match]) -> list[Match]:
+    """
+    Filter matches whose surrounding characters are in a given sequence (batch equivalent of chars_surround).
+
+    :param chars:
+    :type chars:
+    :param matches:
+    :type matches:
+    :return:
+    :rtype:
+    """
+    return _filter_chars(chars, matches, True, True, chars_surround)
+
+
 def validators(*chained_validators: Callable[[Match], bool]) -> Callable[[Match], bool]:
     """
     Creates a validator chain from several validator functions.